@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Measure the latency impact of online backups on live traffic.
+
+Runs reader threads (GET /posts pages) and a writer thread (new comments)
+against a seeded database for a fixed time, once without a backup, once
+while stepped backups run back to back, and once with single-step
+(whole-database) backups. Reports p50/p99 per operation. Usage:
+
+    python benchmarks/bench_backup.py [--posts 6000] [--seconds 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=6000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+
+    from src.core.database import SessionLocal, create_tables
+    from src.models.db_models import Post
+    from src.models.pydantic_models import CommentCreate
+    from src.repositories.repository import CommentRepository, PostRepository
+    from src.utils.backup import BackupResult, backup_database
+
+    create_tables()
+    db = SessionLocal()
+    db.add_all(Post(title=f"Post {i}", content="x" * 4000, author="bench") for i in range(args.posts))
+    db.commit()
+    db.close()
+    posts, comments = PostRepository(), CommentRepository()
+    print(f"database: {os.path.getsize(f'{tmp}/bench.db') / 1024 / 1024:.1f} MiB")
+
+    def scenario(name, backup_kwargs):
+        stop = threading.Event()
+        reads, writes, backups = [], [], []
+
+        def reader():
+            while not stop.is_set():
+                start = time.perf_counter()
+                posts.get_post_list(skip=0, limit=20)
+                reads.append((time.perf_counter() - start) * 1000)
+
+        def writer():
+            while not stop.is_set():
+                start = time.perf_counter()
+                comments.create_comment(CommentCreate(content="hi", author="bench"), post_id=1)
+                writes.append((time.perf_counter() - start) * 1000)
+                time.sleep(0.005)
+
+        def backer():
+            while not stop.is_set():
+                result = backup_database(Path(tmp) / "backup.db", BackupResult(id=0), **backup_kwargs)
+                backups.append(result)
+
+        threads = [threading.Thread(target=reader) for _ in range(2)] + [threading.Thread(target=writer)]
+        if backup_kwargs is not None:
+            threads.append(threading.Thread(target=backer))
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        backup_note = ""
+        if backups:
+            backup_note = (
+                f"  backups {len(backups)} (median {statistics.median(b.duration_seconds for b in backups):.2f}s, "
+                f"restarts {sum(b.restarts for b in backups)})"
+            )
+        print(
+            f"{name:<22} read p50 {percentile(reads, .5):6.2f} p99 {percentile(reads, .99):7.2f} ms | "
+            f"write p50 {percentile(writes, .5):6.2f} p99 {percentile(writes, .99):7.2f} ms{backup_note}"
+        )
+
+    scenario("no backup", None)
+    scenario("stepped (64p, 10ms)", {"pages": 64, "pause": 0.01})
+    scenario("single step", {"pages": -1, "pause": 0})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Measure database size and list-query speed with post content compression.
+
+Seeds the same corpus (mostly short posts plus some long-form posts of
+hundreds of KB) under each codec, then times GET /posts pages, which
+return and therefore decompress content. Usage:
+
+    python benchmarks/bench_compression.py [--posts 2000] [--long-every 20]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+CODECS = ("none", "zlib", "zstd")
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+        for _ in range(3000)
+    ]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def run_codec(posts: int, long_every: int) -> dict:
+    from src.core.database import SessionLocal, create_tables, get_engine
+    from src.models.db_models import Post
+    from src.repositories.factory import post_repository
+
+    rng = random.Random(42)
+    long_text = make_text(rng, 40000)  # ~240 KB
+    create_tables()
+    db = SessionLocal()
+    try:
+        db.add_all(
+            Post(
+                title=f"Post {i}",
+                content=long_text if i % long_every == 0 else make_text(rng, 150),
+                author="bench"
+            )
+            for i in range(posts)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    with get_engine().connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+
+    timings = []
+    for skip in range(0, posts, 100):
+        start = time.perf_counter()
+        post_repository.get_post_list(skip=skip, limit=100)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "size_kib": os.path.getsize(get_engine().url.database) / 1024,
+        "page_ms_median": statistics.median(timings),
+        "page_ms_max": max(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--long-every", type=int, default=20, help="Every Nth post is long-form")
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_codec(args.posts, args.long_every)))
+        return
+
+    print(f"{'codec':<8}{'db size KiB':>14}{'page ms (median)':>18}{'page ms (max)':>15}")
+    for codec in CODECS:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/bench.db", CONTENT_COMPRESSION=codec)
+            completed = subprocess.run(
+                [sys.executable, __file__, "--run", "--posts", str(args.posts), "--long-every", str(args.long_every)],
+                cwd=ROOT, env=env, capture_output=True, text=True, check=True
+            )
+            if "instead" in completed.stderr:
+                print(f"{codec:<8}{'(zstandard not installed, skipped)':>47}")
+                continue
+            stats = json.loads(completed.stdout)
+            print(f"{codec:<8}{stats['size_kib']:>14.0f}{stats['page_ms_median']:>18.1f}{stats['page_ms_max']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Compare ORM and row-based read paths for the list endpoints.
+
+Measures wall time, tracemalloc peak and allocated blocks, and peak RSS
+for a 100-item GET /posts page and for a post with 10k comments. Each
+variant runs in a fresh interpreter so peak RSS is not shared. Usage:
+
+    python benchmarks/bench_read_models.py [--comments 10000] [--page 100]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+VARIANTS = ("posts_orm", "posts_rows", "comments_orm", "comments_rows")
+
+
+def seed(posts: int, comments: int) -> None:
+    from src.core.database import SessionLocal, create_tables
+    from src.models.db_models import Comment, Post
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        db.add_all(Post(title=f"Post {i}", content="Lorem ipsum " * 200, author=f"author{i % 10}") for i in range(posts))
+        db.flush()
+        db.add_all(Comment(content="Nice post! " * 10, author="reader", post_id=1) for _ in range(comments))
+        db.add_all(Comment(content="Me too", author="reader", post_id=i) for i in range(2, posts + 1))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_variant(variant: str, page: int) -> dict:
+    from src.core.database import SessionLocal
+    from src.models.db_models import Comment, Post
+    from src.models.pydantic_models import CommentResponse, PostListItem
+    from src.repositories.factory import comment_repository, post_repository
+
+    def posts_orm():
+        # The previous GET /posts path: ORM page plus one count query per post
+        db = SessionLocal()
+        try:
+            posts = db.query(Post).offset(0).limit(page).all()
+        finally:
+            db.close()
+        return [
+            PostListItem(
+                id=post.id, title=post.title, content=post.content, author=post.author,
+                created_at=post.created_at, updated_at=post.updated_at,
+                comment_count=comment_repository.get_comments_count_for_post(post.id)
+            )
+            for post in posts
+        ]
+
+    def posts_rows():
+        return [PostListItem.model_validate(row) for row in post_repository.get_post_list(skip=0, limit=page)]
+
+    def comments_orm():
+        db = SessionLocal()
+        try:
+            comments = db.query(Comment).filter(Comment.post_id == 1).all()
+        finally:
+            db.close()
+        return [CommentResponse.model_validate(comment) for comment in comments]
+
+    def comments_rows():
+        return [CommentResponse.model_validate(row) for row in comment_repository.get_comments_for_post(1)]
+
+    fn = locals()[variant]
+    fn()  # warm up caches and compiled statements
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    del result
+
+    return {
+        "ms": elapsed * 1000,
+        "peak_kib": peak / 1024,
+        "live_blocks": blocks,
+        "max_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--comments", type=int, default=10000)
+    parser.add_argument("--page", type=int, default=100)
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.page)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/bench.db")
+        subprocess.run(
+            [sys.executable, "-c", f"import sys; sys.path.insert(0, {str(ROOT)!r}); "
+             f"from benchmarks.bench_read_models import seed; seed({max(args.page, 1000)}, {args.comments})"],
+            cwd=ROOT, env=env, check=True
+        )
+        print(f"{'variant':<15}{'time ms':>10}{'peak KiB':>12}{'live blocks':>13}{'max RSS MiB':>13}")
+        for variant in VARIANTS:
+            output = subprocess.run(
+                [sys.executable, __file__, "--variant", variant, "--page", str(args.page)],
+                cwd=ROOT, env=env, check=True, capture_output=True, text=True
+            ).stdout
+            stats = json.loads(output)
+            print(
+                f"{variant:<15}{stats['ms']:>10.1f}{stats['peak_kib']:>12.0f}"
+                f"{stats['live_blocks']:>13}{stats['max_rss_mib']:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
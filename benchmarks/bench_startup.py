@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start cost: import time of src.main and time to first request.
+
+Each sample runs in a fresh interpreter against an already-initialized
+database, comparing SCHEMA_STARTUP_MODE=version with the old create_all
+path. Usage:
+
+    python benchmarks/bench_startup.py [--runs 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+import src.main
+print(time.perf_counter() - start)
+"""
+
+SCHEMA_PROBE = """
+import os, time
+import src.main
+from src.core.database import create_tables, init_schema
+start = time.perf_counter()
+create_tables() if os.environ["SCHEMA_STARTUP_MODE"] == "create_all" else init_schema()
+print(time.perf_counter() - start)
+"""
+
+FIRST_REQUEST_PROBE = """
+import time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+from src.main import app
+with TestClient(app) as client:
+    assert client.get("/posts").status_code == 200
+print(time.perf_counter() - start)
+"""
+
+
+def sample(probe: str, env: dict, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", probe], cwd=ROOT, env=env, check=True,
+            capture_output=True, text=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]) * 1000)
+    return timings
+
+
+def describe(timings: list) -> str:
+    return f"median {statistics.median(timings):7.1f} ms   min {min(timings):7.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, PYTHONPATH=str(ROOT), DATABASE_URL=f"sqlite:///{tmp}/bench.db")
+        # Initialize once so every measured boot sees an existing database
+        sample(FIRST_REQUEST_PROBE, env, 1)
+
+        print(f"import src.main ({args.runs} runs):        {describe(sample(IMPORT_PROBE, env, args.runs))}")
+        for mode in ("create_all", "version"):
+            mode_env = dict(env, SCHEMA_STARTUP_MODE=mode)
+            print(f"schema check          [{mode:>10}]: {describe(sample(SCHEMA_PROBE, mode_env, args.runs))}")
+            print(f"time to first request [{mode:>10}]: {describe(sample(FIRST_REQUEST_PROBE, mode_env, args.runs))}")
+
+
+if __name__ == "__main__":
+    main()
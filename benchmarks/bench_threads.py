@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Compare ways of reading a comment thread.
+
+Builds a deep thread (one chain of replies) and a wide one (a root with
+many replies, each with a few replies of its own), then times fetching
+each whole thread with the materialized-path range query used by
+GET /comments/{id}/thread, with a recursive CTE over parent_id, and with
+one query per level (parent_id IN the previous level), all as raw rows.
+"repository" is the range query as the endpoint runs it, rows included.
+Usage:
+
+    python benchmarks/bench_threads.py [--depth 500] [--width 2000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def seed(depth: int, width: int):
+    from src.core.database import SessionLocal, create_tables, get_engine
+    from src.models.db_models import Comment, Post
+    from src.repositories.base import comment_path
+
+    create_tables()
+    # A parent_id index gives the per-level and CTE variants a fair chance
+    with get_engine().begin() as connection:
+        connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_bench_parent_id ON comments (parent_id)")
+
+    db = SessionLocal()
+    try:
+        post = Post(title="Threads", content="Body", author="bench")
+        db.add(post)
+        db.flush()
+        next_id = 1
+
+        def add(parent):
+            nonlocal next_id
+            comment = Comment(
+                id=next_id, post_id=post.id, content="Reply", author="bench",
+                parent_id=parent.id if parent else None,
+                path=comment_path(next_id, parent.path if parent else ""),
+                depth=parent.depth + 1 if parent else 0
+            )
+            next_id += 1
+            db.add(comment)
+            return comment
+
+        deep_root = parent = add(None)
+        for _ in range(depth):
+            parent = add(parent)
+        wide_root = add(None)
+        for _ in range(width):
+            child = add(wide_root)
+            for _ in range(3):
+                add(child)
+        db.commit()
+        return deep_root.id, wide_root.id
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--depth", type=int, default=500)
+    parser.add_argument("--width", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    from src.core.database import get_engine
+    from src.repositories.repository import CommentRepository
+
+    deep, wide = seed(args.depth, args.width)
+    repository = CommentRepository()
+
+    def path_range(root_id):
+        with get_engine().connect() as connection:
+            return len(connection.exec_driver_sql(
+                "SELECT c.* FROM comments c JOIN comments r ON r.id = ? "
+                "WHERE c.post_id = r.post_id AND c.path >= r.path "
+                "AND c.path < substr(r.path, 1, length(r.path) - 1) || '0' ORDER BY c.path", (root_id,)
+            ).all())
+
+    def repository_rows(root_id):
+        # The endpoint's path, including building CommentRow tuples with parsed datetimes
+        return len(repository.get_comment_thread(root_id))
+
+    def recursive_cte(root_id):
+        with get_engine().connect() as connection:
+            return len(connection.exec_driver_sql(
+                "WITH RECURSIVE thread(id) AS (SELECT id FROM comments WHERE id = ? "
+                "UNION ALL SELECT c.id FROM comments c JOIN thread t ON c.parent_id = t.id) "
+                "SELECT c.* FROM comments c JOIN thread USING (id)", (root_id,)
+            ).all())
+
+    def per_level(root_id):
+        with get_engine().connect() as connection:
+            rows = connection.exec_driver_sql("SELECT * FROM comments WHERE id = ?", (root_id,)).all()
+            found, frontier = len(rows), [root_id]
+            while frontier:
+                marks = ",".join("?" * len(frontier))
+                level = connection.exec_driver_sql(
+                    f"SELECT * FROM comments WHERE parent_id IN ({marks})", tuple(frontier)
+                ).all()
+                found += len(level)
+                frontier = [row.id for row in level]
+            return found
+
+    print(f"{'thread':<24}{'variant':<16}{'comments':>9}{'ms/read':>10}")
+    for label, root_id in ((f"deep ({args.depth} levels)", deep), (f"wide ({args.width}x3)", wide)):
+        for name, fetch in (
+            ("path range", path_range), ("recursive CTE", recursive_cte),
+            ("per level", per_level), ("repository", repository_rows)
+        ):
+            count = fetch(root_id)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                fetch(root_id)
+            elapsed = (time.perf_counter() - start) / args.repeat * 1000
+            print(f"{label:<24}{name:<16}{count:>9}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.core.database import create_tables, reset_database
-from src.repositories.repository import post_repository, comment_repository
+from src.repositories.factory import post_repository, comment_repository
 from src.models.pydantic_models import PostCreate, CommentCreate
 
 def create_sample_data():
@@ -0,0 +1,188 @@
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, List
+
+from src.core.admission import admission_controller
+from src.core.config import settings
+from src.core.idempotency import idempotency_store
+from src.core.query_budget import query_budgets
+from src.core.rendering import markdown_cache
+from src.core.runtime import runtime_monitor
+from src.core.singleflight import read_coalescer
+from src.core.snapshots import post_snapshots
+from src.core.view_counts import view_counter
+from src.models.pydantic_models import (
+    AdmissionRouteStats,
+    BackupRequest,
+    BackupResponse,
+    CoalescingStats,
+    DatabaseStatsResponse,
+    JobRequest,
+    JobResponse,
+    MaintenanceResponse,
+    MarkdownStats,
+    QueryBudgetRouteStats,
+    ReadinessResponse,
+    RuntimeStats,
+)
+from src.utils.backup import backup_manager
+from src.utils.jobs import job_runner
+from src.utils.maintenance import database_maintainer
+
+router = APIRouter()
+
+
+def _require_sqlite(detail: str) -> None:
+    if settings.storage_backend != "sqlite":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail
+        )
+
+
+@router.get("/health/ready", response_model=ReadinessResponse, tags=["health"])
+async def get_readiness(response: Response):
+    """Report whether this worker should get traffic; 503 once loop lag or pool saturation is too high."""
+    readiness = runtime_monitor.readiness()
+    if not readiness["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
+
+
+@router.get("/debug/runtime", response_model=RuntimeStats, tags=["debug"])
+async def get_runtime_stats():
+    """Get event loop lag, connection pool use, in-flight requests and recent slow requests."""
+    return runtime_monitor.stats()
+
+
+@router.get("/debug/coalescing", response_model=CoalescingStats, tags=["debug"])
+async def get_coalescing_stats():
+    """Get how many hot reads were collapsed into a shared database call."""
+    return read_coalescer.stats()
+
+
+@router.get("/debug/admission", response_model=Dict[str, AdmissionRouteStats], tags=["debug"])
+async def get_admission_stats():
+    """Get per-route admission control counters."""
+    return admission_controller.stats()
+
+
+@router.get("/debug/query-budgets", response_model=Dict[str, QueryBudgetRouteStats], tags=["debug"])
+async def get_query_budget_stats():
+    """Get per-route statement budgets and how many statements were aborted."""
+    return query_budgets.stats()
+
+
+@router.get("/debug/idempotency", response_model=Dict[str, int], tags=["debug"])
+async def get_idempotency_stats():
+    """Get Idempotency-Key cache size and replay counters."""
+    return idempotency_store.stats()
+
+
+@router.get("/debug/views", response_model=Dict[str, int], tags=["debug"])
+async def get_view_counter_stats():
+    """Get buffered and flushed view counts."""
+    return view_counter.stats()
+
+
+@router.get("/debug/snapshots", response_model=Dict[str, int], tags=["debug"])
+async def get_snapshot_stats():
+    """Get pre-serialized post body counters."""
+    return post_snapshots.stats()
+
+
+@router.get("/debug/markdown", response_model=MarkdownStats, tags=["debug"])
+async def get_markdown_stats():
+    """Get rendered Markdown cache counters and render timings."""
+    return markdown_cache.stats()
+
+
+@router.get("/debug/database", response_model=DatabaseStatsResponse, tags=["debug"])
+async def get_database_stats():
+    """Get the database file size, free pages and WAL size."""
+    _require_sqlite("Database stats require the sqlite storage backend")
+    return await run_in_threadpool(database_maintainer.stats)
+
+
+@router.post("/admin/maintenance", response_model=MaintenanceResponse, tags=["admin"])
+async def run_maintenance():
+    """Run ANALYZE, incremental vacuum and a WAL checkpoint now, regardless of traffic."""
+    _require_sqlite("Maintenance requires the sqlite storage backend")
+    result = await run_in_threadpool(database_maintainer.run)
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Maintenance is already running"
+        )
+
+    return result
+
+
+@router.get("/admin/maintenance", response_model=List[MaintenanceResponse], tags=["admin"])
+async def get_maintenance_runs():
+    """Get recent maintenance passes, newest first."""
+    return database_maintainer.list()
+
+
+@router.post(
+    "/admin/backups",
+    response_model=BackupResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["admin"]
+)
+async def start_backup(backup: BackupRequest = BackupRequest()):
+    """Start an online backup of the database in the background."""
+    _require_sqlite("Backups require the sqlite storage backend")
+    result = backup_manager.start(compress=backup.compress, pages=backup.pages, pause=backup.pause_seconds)
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A backup is already running"
+        )
+
+    return result
+
+
+@router.get("/admin/backups", response_model=List[BackupResponse], tags=["admin"])
+async def get_backups():
+    """Get recent backups, newest first."""
+    return backup_manager.list()
+
+
+@router.get("/admin/backups/{backup_id}", response_model=BackupResponse, tags=["admin"])
+async def get_backup(backup_id: int):
+    """Get the status of a backup."""
+    result = backup_manager.get(backup_id)
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backup not found"
+        )
+
+    return result
+
+
+@router.post("/admin/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED, tags=["admin"])
+async def start_job(job: JobRequest):
+    """Start a bulk delete in the background; it runs in short chunked transactions."""
+    params = job.model_dump(mode="json", exclude={"kind"}, exclude_none=True)
+    return await run_in_threadpool(job_runner.submit, job.kind, params)
+
+
+@router.get("/admin/jobs", response_model=List[JobResponse], tags=["admin"])
+async def get_jobs():
+    """Get recent jobs, newest first."""
+    return await run_in_threadpool(job_runner.list)
+
+
+@router.get("/admin/jobs/{job_id}", response_model=JobResponse, tags=["admin"])
+async def get_job(job_id: int):
+    """Get the status, progress and throughput of a job."""
+    job = await run_in_threadpool(job_runner.get, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job
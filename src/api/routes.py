@@ -1,23 +1,122 @@
-from fastapi import APIRouter, HTTPException, status, Query
-from typing import List
+import asyncio
+from fastapi import APIRouter, Header, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from typing import Any, AsyncIterator, Callable, List, Optional, Type
+
+from src.core.config import settings
+from src.core.events import post_events
+from src.core.idempotency import IN_PROGRESS, MISMATCH, REPLAY, idempotency_store, request_fingerprint
+from src.core.rendering import markdown_cache
+from src.core.snapshots import post_snapshots
+from src.core.trending import trending_posts
+from src.core.view_counts import view_counter
 
 from src.models.pydantic_models import (
     PostResponse,
     PostCreate,
+    PostExcerptItem,
     PostListItem,
+    PostLookupRequest,
+    PostLookupResponse,
     PostUpdate,
+    TrendingPostItem,
     CommentResponse,
     CommentCreate,
-    CommentUpdate
+    CommentTreeNode,
+    CommentUpdate,
+    AuthorPostsPage,
+    AuthorStatsResponse,
+    ChangeFeed,
+    CommentCountsResponse
 )
-from src.repositories.repository import comment_repository, post_repository
+from src.repositories.factory import author_repository, comment_repository, post_repository
 
 router = APIRouter()
 
+IDEMPOTENCY_KEY_HEADER = Header(
+    None,
+    alias="Idempotency-Key",
+    max_length=255,
+    description="Retries with the same key replay the first response instead of writing again"
+)
+
+# Most post ids GET /posts/comment-counts accepts at once
+MAX_COUNT_IDS = 1000
+
+CONTENT_FORMAT = Query(
+    "markdown",
+    alias="format",
+    pattern="^(markdown|html)$",
+    description="markdown returns content as written; html renders it server-side"
+)
+
+
+def _content_html(post) -> str:
+    """Rendered content of a post: the persisted HTML if there is any, else from the render cache."""
+    return getattr(post, "content_html", None) or markdown_cache.render(post.content)
+
+
+def _encode_post(post_id: int) -> Optional[bytes]:
+    """The GET /posts/{post_id} body of a post, encoded as the response model would be; None if missing."""
+    # A coalesced load may have started before the snapshot token was taken, and could be stored as current
+    db_post = post_repository.get_post(post_id=post_id, coalesce=False)
+    if not db_post:
+        return None
+    return PostResponse.model_validate(db_post).model_dump_json().encode("utf-8")
+
+
+def _idempotent(
+    key: str,
+    fingerprint: str,
+    response_model: Type[BaseModel],
+    status_code: int,
+    create: Callable[[], Any]
+) -> Response:
+    """Run create() once per idempotency key and replay its serialized response for retries."""
+    outcome, stored = idempotency_store.begin(key, fingerprint)
+    if outcome == REPLAY:
+        return Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"}
+        )
+    if outcome == IN_PROGRESS:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed",
+            headers={"Retry-After": "1"}
+        )
+    if outcome == MISMATCH:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different request"
+        )
+
+    try:
+        body = response_model.model_validate(create(), from_attributes=True).model_dump_json()
+    except BaseException:
+        # Failed requests are not recorded, so the client can retry them
+        idempotency_store.abandon(key)
+        raise
+    idempotency_store.complete(key, status_code, body)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
 
 @router.post("/posts", response_model=PostResponse, status_code=status.HTTP_201_CREATED, tags=["posts"])
-async def create_post(post: PostCreate):
+async def create_post(post: PostCreate, idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER):
     """Create a new post."""
+    if idempotency_key:
+        return _idempotent(
+            idempotency_key,
+            request_fingerprint("POST", "/posts", post.model_dump_json()),
+            PostResponse,
+            status.HTTP_201_CREATED,
+            lambda: post_repository.create_post(post=post)
+        )
+
     db_post = post_repository.create_post(post=post)
     return db_post
 
@@ -25,38 +124,106 @@ async def create_post(post: PostCreate):
 @router.get("/posts", response_model=List[PostListItem], tags=["posts"])
 async def get_posts(
     skip: int = Query(0, ge=0, description="Number of posts to skip"),
-    limit: int = Query(10, ge=1, le=100, description="Number of posts to return")
+    limit: int = Query(10, ge=1, le=100, description="Number of posts to return"),
+    content_format: str = CONTENT_FORMAT
 ):
     """Get all posts with content and pagination."""
-    posts = post_repository.get_posts(skip=skip, limit=limit)
+    # One query returning plain rows; comment counts come from a correlated subquery
+    rows = post_repository.get_post_list(skip=skip, limit=limit)
+    if content_format == "html":
+        rows = [row._replace(content=_content_html(row)) for row in rows]
+    return rows
 
-    posts_list = []
-    for post in posts:
-        comment_count = comment_repository.get_comments_count_for_post(post.id)
-        post_item = PostListItem(
-            id=post.id,
-            title=post.title,
-            content=post.content,
-            author=post.author,
-            created_at=post.created_at,
-            updated_at=post.updated_at,
-            comment_count=comment_count
+
+@router.get("/posts/excerpts", response_model=List[PostExcerptItem], tags=["posts"])
+async def get_post_excerpts(
+    skip: int = Query(0, ge=0, description="Number of posts to skip"),
+    limit: int = Query(10, ge=1, le=100, description="Number of posts to return")
+):
+    """Get posts with excerpts, word counts and reading times, without their content."""
+    # Precomputed on write, so the page never loads or decompresses content
+    return await run_in_threadpool(post_repository.get_post_excerpts, skip=skip, limit=limit)
+
+
+@router.get("/posts/trending", response_model=List[TrendingPostItem], tags=["posts"])
+async def get_trending_posts(
+    limit: int = Query(10, ge=1, le=100, description="Number of posts to return")
+):
+    """Get the posts with the most recent comment activity, hottest first."""
+    # The ranking is kept in memory; only the posts themselves are read, in one IN query
+    ranked = trending_posts.top(limit)
+    rows = await run_in_threadpool(post_repository.get_posts_by_ids, post_ids=[post_id for post_id, _ in ranked])
+    posts = {row.id: row for row in rows}
+    return [
+        TrendingPostItem.model_validate({**posts[post_id]._asdict(), "score": score})
+        for post_id, score in ranked if post_id in posts
+    ]
+
+
+@router.post("/posts/lookup", response_model=PostLookupResponse, tags=["posts"])
+async def lookup_posts(lookup: PostLookupRequest):
+    """Get several posts by id in one round trip, in the requested order."""
+    rows = await run_in_threadpool(
+        post_repository.get_posts_by_ids, post_ids=lookup.ids, include_comments=lookup.include_comments
+    )
+    found = {row.id for row in rows}
+    missing = [post_id for post_id in dict.fromkeys(lookup.ids) if post_id not in found]
+    return PostLookupResponse(items=rows, missing=missing)
+
+
+@router.get("/posts/comment-counts", response_model=CommentCountsResponse, tags=["posts"])
+async def get_comment_counts(
+    ids: Optional[List[str]] = Query(None, description="Post ids, comma-separated or repeated (at most 1000)")
+):
+    """Get the comment counts of many posts in one round trip and one query."""
+    try:
+        post_ids = list(dict.fromkeys(int(value) for item in ids or () for value in item.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be integers"
+        )
+    if not post_ids or len(post_ids) > MAX_COUNT_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Give between 1 and {MAX_COUNT_IDS} ids"
         )
-        posts_list.append(post_item)
 
-    return posts_list
+    counts = await run_in_threadpool(comment_repository.get_comment_counts, post_ids=post_ids)
+    return CommentCountsResponse(
+        counts={post_id: counts[post_id] for post_id in post_ids if post_id in counts},
+        missing=[post_id for post_id in post_ids if post_id not in counts]
+    )
 
 
 @router.get("/posts/{post_id}", response_model=PostResponse, tags=["posts"])
-async def get_post(post_id: int):
+async def get_post(post_id: int, content_format: str = CONTENT_FORMAT):
     """Get a specific post by ID with all its comments."""
-    db_post = post_repository.get_post(post_id=post_id)
+    if content_format == "markdown" and post_snapshots.enabled:
+        # Hot posts are served from their stored body without a query or re-encoding
+        body = post_snapshots.get(post_id) or await run_in_threadpool(
+            post_snapshots.get_or_build, post_id, _encode_post
+        )
+        if body is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Post not found"
+            )
+        view_counter.increment(post_id)
+        return Response(content=body, media_type="application/json")
+
+    # Off the event loop so concurrent requests overlap and share one load
+    db_post = await run_in_threadpool(post_repository.get_post, post_id=post_id)
     if not db_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
 
+    # Counted in memory; written in batches by the view counter's flush task
+    view_counter.increment(post_id)
+    if content_format == "html":
+        return PostResponse.model_validate(db_post).model_copy(update={"content": _content_html(db_post)})
     return db_post
 
 
@@ -90,34 +257,138 @@ async def delete_post(post_id: int):
     status_code=status.HTTP_201_CREATED,
     tags=["comments"]
 )
-async def create_comment(post_id: int, comment: CommentCreate):
+async def create_comment(
+    post_id: int,
+    comment: CommentCreate,
+    idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER
+):
     """Create a new comment for a post."""
-    db_post = post_repository.get_post(post_id=post_id)
+    if idempotency_key:
+        return _idempotent(
+            idempotency_key,
+            request_fingerprint("POST", f"/posts/{post_id}/comments", comment.model_dump_json()),
+            CommentResponse,
+            status.HTTP_201_CREATED,
+            lambda: _create_comment(post_id, comment)
+        )
+
+    return _create_comment(post_id, comment)
+
+
+def _create_comment(post_id: int, comment: CommentCreate):
+    # Archived posts are read-only
+    db_post = post_repository.get_post(post_id=post_id, include_archived=False)
     if not db_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
 
-    db_comment = comment_repository.create_comment(comment=comment, post_id=post_id)
+    try:
+        db_comment = comment_repository.create_comment(comment=comment, post_id=post_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parent comment not found on this post"
+        )
     return db_comment
 
 
+def _nest_comments(rows) -> List[CommentTreeNode]:
+    """Turn comments in thread (path) order into nested nodes; rows whose parent is absent become roots."""
+    nodes = {}
+    roots = []
+    for row in rows:
+        node = nodes[row.id] = CommentTreeNode.model_validate(row, from_attributes=True)
+        parent = nodes.get(row.parent_id)
+        (parent.replies if parent is not None else roots).append(node)
+    return roots
+
+
 @router.get("/posts/{post_id}/comments", response_model=List[CommentResponse], tags=["comments"])
 async def get_comments_for_post(post_id: int):
     """Get all comments for a specific post."""
     # Check if post exists
-    db_post = post_repository.get_post(post_id=post_id)
+    db_post = await run_in_threadpool(post_repository.get_post, post_id=post_id)
     if not db_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
 
-    comments = comment_repository.get_comments_for_post(post_id=post_id)
+    comments = await run_in_threadpool(comment_repository.get_comments_for_post, post_id=post_id)
     return comments
 
 
+async def _comment_stream(post_id: int) -> AsyncIterator[str]:
+    """Relay a post's events as Server-Sent Events, with keep-alive comments while idle."""
+    # Subscribe lazily so a client that disconnects before streaming starts never registers
+    subscription = post_events.subscribe(post_id)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(subscription.queue.get(), timeout=settings.stream_keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if frame is None:
+                break
+            yield frame
+    finally:
+        post_events.unsubscribe(subscription)
+
+
+@router.get("/posts/{post_id}/comments/stream", tags=["comments"])
+async def stream_comments_for_post(post_id: int):
+    """Stream comment created/updated/deleted events for a post as Server-Sent Events."""
+    # Only the post's existence matters; loading it with its comments would cost every subscriber a full read
+    if not await run_in_threadpool(post_repository.post_exists, post_id=post_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+
+    return StreamingResponse(
+        _comment_stream(post_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/posts/{post_id}/comments/tree", response_model=List[CommentTreeNode], tags=["comments"])
+async def get_comment_tree_for_post(
+    post_id: int,
+    max_depth: Optional[int] = Query(None, ge=0, description="Deepest reply level to include (0 = top level only)")
+):
+    """Get a post's comments as nested reply threads."""
+    db_post = await run_in_threadpool(post_repository.get_post, post_id=post_id)
+    if not db_post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+
+    rows = await run_in_threadpool(comment_repository.get_comment_tree, post_id=post_id, max_depth=max_depth)
+    return _nest_comments(rows)
+
+
+@router.get("/comments/{comment_id}/thread", response_model=CommentTreeNode, tags=["comments"])
+async def get_comment_thread(
+    comment_id: int,
+    max_depth: Optional[int] = Query(None, ge=0, description="Reply levels below the comment to include")
+):
+    """Get a comment with its nested replies."""
+    rows = await run_in_threadpool(comment_repository.get_comment_thread, comment_id=comment_id, max_depth=max_depth)
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Comment not found"
+        )
+
+    return _nest_comments(rows)[0]
+
+
 @router.get("/comments/{comment_id}", response_model=CommentResponse, tags=["comments"])
 async def get_comment(comment_id: int):
     """Get a specific comment by ID."""
@@ -153,3 +424,68 @@ async def delete_comment(comment_id: int):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Comment not found"
         )
+
+
+@router.get("/authors/{author}/posts", response_model=AuthorPostsPage, tags=["authors"])
+async def get_author_posts(
+    author: str,
+    limit: int = Query(10, ge=1, le=100, description="Number of posts to return"),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page")
+):
+    """Get an author's posts, newest first, with keyset pagination."""
+    try:
+        rows, next_cursor = author_repository.get_posts_by_author(author=author, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    items = [
+        PostListItem(
+            id=post.id,
+            title=post.title,
+            content=post.content,
+            author=post.author,
+            created_at=post.created_at,
+            updated_at=post.updated_at,
+            comment_count=comment_count,
+            view_count=post.view_count
+        )
+        for post, comment_count in rows
+    ]
+    return AuthorPostsPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/authors/{author}/stats", response_model=AuthorStatsResponse, tags=["authors"])
+async def get_author_stats(author: str):
+    """Get post count, comment count and last activity for an author."""
+    stats = author_repository.get_author_stats(author=author)
+    if not stats:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Author not found"
+        )
+
+    return stats
+
+
+@router.get("/changes", response_model=ChangeFeed, tags=["changes"])
+async def get_changes(
+    since: int = Query(0, ge=0, description="Last sequence number already seen (0 = from the start)"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of changes to return")
+):
+    """
+    Get post and comment changes after a sequence number, oldest first.
+
+    The log is compacted to the latest change per post or comment, so fetch the
+    current state of each one listed. Deletes appear as "deleted" tombstones,
+    which are kept for CHANGES_TOMBSTONE_RETENTION_SECONDS; clients that have
+    not synced for longer should start over from since=0.
+    """
+    rows = await run_in_threadpool(post_repository.get_changes, since=since, limit=limit + 1)
+    return ChangeFeed(
+        changes=rows[:limit],
+        next_since=rows[:limit][-1].seq if rows else since,
+        has_more=len(rows) > limit
+    )
@@ -0,0 +1,171 @@
+"""
+Non-blocking logging and sampled JSON access logs.
+
+Handlers that write to stderr block the thread that logs, and for the
+request path that is the event loop. configure_logging() routes records
+through a bounded queue instead: the caller only enqueues, and a
+QueueListener thread formats and writes them. When the queue is full,
+records are dropped and counted rather than making requests wait.
+
+Every request gets a request id, taken from its X-Request-ID header or
+generated, and echoed back in the response. App log lines written while
+serving the request carry the id, and so does its access log line, a
+JSON object with the request's DB time and statement count
+(src/core/runtime.py). Failed and slow requests are always logged;
+other requests are logged at ACCESS_LOG_SAMPLE_RATE.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from src.core.config import settings
+
+ACCESS_LOGGER = "blog.access"
+
+TEXT_FORMAT = "%(levelname)s:%(name)s:%(request_id)s:%(message)s"
+
+
+class RequestIdFilter(logging.Filter):
+    """Tag records with the id of the request being served ("-" outside requests)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            # Imported here because src.core.runtime imports this module
+            from src.core.runtime import current_trace
+            trace = current_trace()
+            record.request_id = trace.request_id if trace is not None else "-"
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of blocking or raising."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AccessLogFormatter(logging.Formatter):
+    """Format access records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+        }
+        line.update(getattr(record, "access", {}))
+        return json.dumps(line, separators=(",", ":"))
+
+
+class AccessLogger:
+    """Decide which requests to log and write their access records."""
+
+    def __init__(self, sample_rate: float = 1.0, slow_ms: float = 1000.0, name: str = ACCESS_LOGGER):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.logger = logging.getLogger(name)
+
+    def reason(self, status: Optional[int], duration_ms: float, failed: bool = False) -> Optional[str]:
+        """Get why a request should be logged ("error", "slow" or "sampled"), or None to skip it."""
+        if failed or status is None or status >= 500:
+            return "error"
+        if duration_ms >= self.slow_ms:
+            return "slow"
+        if self.sample_rate >= 1 or (self.sample_rate > 0 and random.random() < self.sample_rate):
+            return "sampled"
+        return None
+
+    def log(self, trace) -> bool:
+        """Write a finished request's RequestTrace if it is selected; returns whether it was."""
+        reason = self.reason(trace.status, trace.duration_ms, failed=trace.error is not None)
+        if reason is None:
+            return False
+        access: Dict[str, Any] = {
+            "request_id": trace.request_id,
+            "method": trace.method,
+            "path": trace.path,
+            "route": trace.route,
+            "status": trace.status,
+            "duration_ms": round(trace.duration_ms, 3),
+            "db_ms": round(trace.db_ms, 3),
+            "statements": trace.statements,
+            "loop_db_ms": round(trace.loop_db_ms, 3),
+            "error": trace.error,
+            "reason": reason,
+            # Lets log consumers weight sampled lines back up to request counts
+            "sample_rate": 1.0 if reason != "sampled" else self.sample_rate,
+        }
+        level = logging.ERROR if reason == "error" else logging.WARNING if reason == "slow" else logging.INFO
+        self.logger.log(
+            level, "%s %s", trace.method, trace.path, extra={"access": access, "request_id": trace.request_id}
+        )
+        return True
+
+
+_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: str = "INFO", queue_size: int = 10000) -> DroppingQueueHandler:
+    """
+    Send app logs (unless the root logger is already configured) and
+    access logs through a queue written by a background thread.
+    Safe to call more than once.
+    """
+    global _handler, _listener
+    if _handler is not None:
+        return _handler
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _handler = DroppingQueueHandler(log_queue)
+    _handler.addFilter(RequestIdFilter())
+
+    text_handler = logging.StreamHandler(sys.stderr)
+    text_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    text_handler.addFilter(lambda record: record.name != ACCESS_LOGGER)
+    access_handler = logging.StreamHandler(sys.stderr)
+    access_handler.setFormatter(AccessLogFormatter())
+    access_handler.addFilter(lambda record: record.name == ACCESS_LOGGER)
+
+    _listener = QueueListener(log_queue, text_handler, access_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    root = logging.getLogger()
+    # Like basicConfig: leave a root logger someone else configured alone
+    if not root.handlers:
+        root.setLevel(level)
+        root.addHandler(_handler)
+    access = logging.getLogger(ACCESS_LOGGER)
+    access.setLevel(logging.INFO)
+    access.addHandler(_handler)
+    access.propagate = False
+    return _handler
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    """Get the number of log records dropped because the queue was full."""
+    return _handler.dropped if _handler is not None else 0
+
+
+access_logger = AccessLogger(sample_rate=settings.access_log_sample_rate, slow_ms=settings.slow_request_ms)
@@ -0,0 +1,207 @@
+"""
+Admission control and load shedding for the HTTP API.
+
+Every request is matched to its route and must take a slot from that
+route's limiter before it runs. Reads and writes get separate budgets:
+a concurrency limit plus a bounded wait queue. When both are full, or a
+queued request waits longer than the queue timeout, the request is
+rejected immediately with 503 and Retry-After rather than piling up
+behind a slow database.
+"""
+import asyncio
+import json
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.config import settings
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RouteLimiter:
+    """Concurrency limit with a bounded FIFO wait queue. Used from one event loop only."""
+
+    __slots__ = ("limit", "max_queue", "active", "admitted", "rejected", "_waiters")
+
+    def __init__(self, limit: int, max_queue: int):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot, waiting at most timeout seconds in the queue. Returns False when shed."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self.rejected += 1
+            return False
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the client went away
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+        # release() handed its slot over, so active already counts this request
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        """Give the slot to the oldest waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class AdmissionController:
+    """Per-route limiters with separate read and write budgets."""
+
+    def __init__(
+        self,
+        read_limit: int,
+        read_queue: int,
+        write_limit: int,
+        write_queue: int,
+        queue_timeout: float,
+        retry_after: int = 1,
+        route_limits: Optional[Dict[str, int]] = None,
+        exempt_routes: Iterable[str] = (),
+        exempt_prefixes: Iterable[str] = (),
+    ):
+        self.read_budget = (read_limit, read_queue)
+        self.write_budget = (write_limit, write_queue)
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.route_limits = route_limits or {}
+        self.exempt_routes = frozenset(exempt_routes)
+        self.exempt_prefixes = tuple(exempt_prefixes)
+        self._limiters: Dict[str, RouteLimiter] = {}
+
+    def limiter_for(self, method: str, route_path: str) -> RouteLimiter:
+        """Get (creating on first use) the limiter of a route, e.g. "GET /posts/{post_id}"."""
+        key = f"{method} {route_path}"
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limit, max_queue = self.read_budget if method in READ_METHODS else self.write_budget
+            limiter = self._limiters[key] = RouteLimiter(self.route_limits.get(key, limit), max_queue)
+        return limiter
+
+    def in_flight(self) -> int:
+        """Get the number of admitted requests currently running."""
+        return sum(limiter.active for limiter in self._limiters.values())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get per-route admission counters."""
+        return {
+            key: {
+                "limit": limiter.limit,
+                "active": limiter.active,
+                "waiting": limiter.waiting,
+                "admitted": limiter.admitted,
+                "rejected": limiter.rejected,
+            }
+            for key, limiter in sorted(self._limiters.items())
+        }
+
+
+def resolve_route_path(scope: Scope) -> Optional[str]:
+    """Get the template of the route a request will hit, e.g. "/posts/{post_id}"."""
+    app = scope.get("app")
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return None
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware that sheds load with 503 + Retry-After once a route's budget is exhausted."""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.controller.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        route_path = resolve_route_path(scope)
+        if route_path is None or route_path in self.controller.exempt_routes:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.controller.limiter_for(scope["method"], route_path)
+        if not await limiter.acquire(self.controller.queue_timeout):
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps({"detail": "Server is overloaded, retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.controller.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def parse_route_limits(value: str) -> Dict[str, int]:
+    """Parse "GET /posts/{post_id}=64,POST /posts=2" into a route limit mapping."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        route, _, limit = item.rpartition("=")
+        limits[route.strip()] = int(limit)
+    return limits
+
+
+admission_controller = AdmissionController(
+    read_limit=settings.admission_read_concurrency,
+    read_queue=settings.admission_read_queue,
+    write_limit=settings.admission_write_concurrency,
+    write_queue=settings.admission_write_queue,
+    queue_timeout=settings.admission_queue_timeout,
+    retry_after=settings.admission_retry_after,
+    route_limits=parse_route_limits(settings.admission_route_limits),
+    # Long-lived streams would otherwise hold a slot for their whole lifetime
+    exempt_routes={"/posts/{post_id}/comments/stream"},
+    exempt_prefixes=("/docs", "/redoc", "/openapi.json", "/debug", "/health"),
+)
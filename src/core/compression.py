@@ -0,0 +1,64 @@
+"""
+Compression codecs for large text values stored in SQLite.
+
+Compressed values are stored as BLOBs prefixed with a two-byte header
+(NUL + codec id), which cannot collide with text since text columns are
+bound as str. Values under the size threshold, or that do not shrink,
+stay plain text so small rows pay nothing.
+"""
+import logging
+import zlib
+from typing import Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ZLIB_HEADER = b"\x00z"
+ZSTD_HEADER = b"\x00s"
+
+
+class TextCompressor:
+    """Compress text above a threshold with zlib or zstd; decompress either transparently."""
+
+    def __init__(self, codec: str = "none", threshold: int = 4096, level: Optional[int] = None):
+        if codec == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed; compressing content with zlib instead")
+            codec = "zlib"
+        if codec not in ("none", "zlib", "zstd"):
+            raise ValueError(f"Unknown compression codec: {codec}")
+        self.codec = codec
+        self.threshold = threshold
+        self.level = level
+        self._zstd_compressor = zstandard.ZstdCompressor(level=level or 3) if codec == "zstd" else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    def compress(self, text: str, force: bool = False) -> Union[str, bytes]:
+        """Return the stored form of text: compressed bytes, or the text itself."""
+        if self.codec == "none" and not force:
+            return text
+        raw = text.encode("utf-8")
+        if len(raw) < self.threshold and not force:
+            return text
+
+        if self.codec == "zstd":
+            packed = ZSTD_HEADER + self._zstd_compressor.compress(raw)
+        else:
+            packed = ZLIB_HEADER + zlib.compress(raw, 6 if self.level is None else self.level)
+        return packed if len(packed) < len(raw) else text
+
+    def decompress(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """Return the text for a stored value, whichever codec wrote it."""
+        if not isinstance(value, bytes):
+            return value
+        header, payload = value[:2], value[2:]
+        if header == ZLIB_HEADER:
+            return zlib.decompress(payload).decode("utf-8")
+        if header == ZSTD_HEADER:
+            if self._zstd_decompressor is None:
+                raise RuntimeError("Content is zstd-compressed but zstandard is not installed")
+            return self._zstd_decompressor.decompress(payload).decode("utf-8")
+        return value.decode("utf-8")
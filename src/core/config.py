@@ -0,0 +1,134 @@
+"""
+Application settings read from environment variables.
+"""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting, falling back to the default when unset."""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting, falling back to the default when unset."""
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean setting ("1", "true", "yes", "on" are true)."""
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    """Runtime settings with defaults suitable for local development."""
+
+    def __init__(self):
+        # Storage backend: "sqlite" or "memory" (ephemeral, for previews, benchmarks and tests)
+        self.storage_backend = os.getenv("STORAGE_BACKEND", "sqlite")
+
+        # Database
+        self.database_url = os.getenv("DATABASE_URL", "sqlite:///./blog.db")
+        # "version" checks PRAGMA user_version and skips create_all when current;
+        # "create_all" runs the full create_all on every boot
+        self.schema_startup_mode = os.getenv("SCHEMA_STARTUP_MODE", "version")
+        # Journal mode set on every connection ("" keeps the file's own); WAL lets reads run during writes
+        self.sqlite_journal_mode = os.getenv("SQLITE_JOURNAL_MODE", "wal")
+
+        # Cold storage for old posts, attached to every connection as the "archive" schema ("" = off)
+        self.archive_database_path = os.getenv("ARCHIVE_DATABASE_PATH", "")
+        self.archive_after_days = _env_int("ARCHIVE_AFTER_DAYS", 365)
+
+        # Post content compression: "none", "zlib" or "zstd" (needs the zstandard package)
+        self.content_compression = os.getenv("CONTENT_COMPRESSION", "none")
+        self.content_compression_threshold = _env_int("CONTENT_COMPRESSION_THRESHOLD", 4096)
+
+        # Online backups
+        self.backup_dir = os.getenv("BACKUP_DIR", "./backups")
+
+        # Idempotency-Key replay store: "memory" (per process) or "sqlite" (shared, survives restarts)
+        self.idempotency_store = os.getenv("IDEMPOTENCY_STORE", "memory")
+        self.idempotency_cache_size = _env_int("IDEMPOTENCY_CACHE_SIZE", 10000)
+        self.idempotency_ttl_seconds = _env_float("IDEMPOTENCY_TTL_SECONDS", 86400.0)
+
+        # Trending posts: comment activity halves in weight every half-life
+        self.trending_half_life_seconds = _env_float("TRENDING_HALF_LIFE_SECONDS", 21600.0)
+
+        # Post view counters are kept in memory and written in one batch per interval
+        self.view_flush_interval_seconds = _env_float("VIEW_FLUSH_INTERVAL_SECONDS", 5.0)
+
+        # List-view fields stored with each post (GET /posts/excerpts)
+        self.excerpt_length = _env_int("EXCERPT_LENGTH", 200)
+        self.reading_words_per_minute = _env_int("READING_WORDS_PER_MINUTE", 200)
+
+        # Background jobs (POST /admin/jobs): worker threads, rows per transaction, pause between chunks
+        self.job_workers = _env_int("JOB_WORKERS", 1)
+        self.job_chunk_size = _env_int("JOB_CHUNK_SIZE", 200)
+        self.job_chunk_pause_seconds = _env_float("JOB_CHUNK_PAUSE_SECONDS", 0.05)
+
+        # Database maintenance (ANALYZE, incremental vacuum, WAL checkpoints); interval 0 = off.
+        # A scheduled pass only works while at most MAINTENANCE_QUIET_REQUESTS requests are in flight
+        self.maintenance_interval_seconds = _env_float("MAINTENANCE_INTERVAL_SECONDS", 3600.0)
+        self.maintenance_quiet_requests = _env_int("MAINTENANCE_QUIET_REQUESTS", 2)
+        self.maintenance_vacuum_step_pages = _env_int("MAINTENANCE_VACUUM_STEP_PAGES", 256)
+        self.maintenance_pause_seconds = _env_float("MAINTENANCE_PAUSE_SECONDS", 0.05)
+        self.maintenance_analysis_limit = _env_int("MAINTENANCE_ANALYSIS_LIMIT", 1000)
+
+        # Encoded GET /posts/{post_id} bodies, dropped when the post or its comments change
+        # (0 = off); persist=true also shares them through the post_snapshots table
+        self.snapshot_cache_size = _env_int("SNAPSHOT_CACHE_SIZE", 0)
+        self.snapshot_ttl_seconds = _env_float("SNAPSHOT_TTL_SECONDS", 60.0)
+        self.snapshot_persist = _env_bool("SNAPSHOT_PERSIST", False)
+
+        # Markdown rendering (format=html): LRU of rendered HTML, optionally persisted per post
+        self.markdown_cache_size = _env_int("MARKDOWN_CACHE_SIZE", 2048)
+        self.markdown_persist_html = _env_bool("MARKDOWN_PERSIST_HTML", False)
+
+        # Change log (GET /changes): compacted periodically; tombstones are kept for the retention
+        self.changes_compact_interval_seconds = _env_float("CHANGES_COMPACT_INTERVAL_SECONDS", 3600.0)
+        self.changes_tombstone_retention_seconds = _env_float("CHANGES_TOMBSTONE_RETENTION_SECONDS", 7 * 86400.0)
+
+        # Live comment streams
+        self.stream_queue_size = _env_int("STREAM_QUEUE_SIZE", 64)
+        self.stream_keepalive_seconds = _env_float("STREAM_KEEPALIVE_SECONDS", 15.0)
+
+        # Admission control: per-route concurrency limit and wait queue, by reads and writes
+        self.admission_enabled = _env_bool("ADMISSION_ENABLED", True)
+        self.admission_read_concurrency = _env_int("ADMISSION_READ_CONCURRENCY", 32)
+        self.admission_read_queue = _env_int("ADMISSION_READ_QUEUE", 64)
+        self.admission_write_concurrency = _env_int("ADMISSION_WRITE_CONCURRENCY", 4)
+        self.admission_write_queue = _env_int("ADMISSION_WRITE_QUEUE", 16)
+        self.admission_queue_timeout = _env_float("ADMISSION_QUEUE_TIMEOUT", 0.5)
+        self.admission_retry_after = _env_int("ADMISSION_RETRY_AFTER", 1)
+        # e.g. "GET /posts/{post_id}=64,POST /posts=2"
+        self.admission_route_limits = os.getenv("ADMISSION_ROUTE_LIMITS", "")
+
+        # Statement time budgets in ms (0 = none): a statement running longer is interrupted
+        # and the request answered with 504. Per-route overrides: "GET /posts=250,GET /posts/{post_id}=500"
+        self.query_budget_read_ms = _env_int("QUERY_BUDGET_READ_MS", 1000)
+        self.query_budget_write_ms = _env_int("QUERY_BUDGET_WRITE_MS", 2000)
+        self.query_budget_route_limits = os.getenv("QUERY_BUDGET_ROUTE_LIMITS", "")
+
+        # Runtime health: event loop lag is sampled every interval and judged over the last
+        # window of samples; requests slower than SLOW_REQUEST_MS are kept for /debug/runtime
+        self.runtime_lag_interval_seconds = _env_float("RUNTIME_LAG_INTERVAL_SECONDS", 0.5)
+        self.runtime_lag_window = _env_int("RUNTIME_LAG_WINDOW", 10)
+        self.slow_request_ms = _env_float("SLOW_REQUEST_MS", 1000.0)
+        self.slow_request_traces = _env_int("SLOW_REQUEST_TRACES", 50)
+        # /health/ready fails past these (0 = check off); saturation is checked-out / pool capacity
+        self.ready_max_loop_lag_ms = _env_float("READY_MAX_LOOP_LAG_MS", 500.0)
+        self.ready_max_pool_saturation = _env_float("READY_MAX_POOL_SATURATION", 0.9)
+
+        # Logging: records wait in a bounded queue for a writer thread and are dropped when it is full.
+        # Access logs are JSON; failed and slow (SLOW_REQUEST_MS) requests are always logged,
+        # other requests at ACCESS_LOG_SAMPLE_RATE (1 = all, 0 = none)
+        self.log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+        self.log_queue_size = _env_int("LOG_QUEUE_SIZE", 10000)
+        self.access_log_sample_rate = _env_float("ACCESS_LOG_SAMPLE_RATE", 0.01)
+
+
+settings = Settings()
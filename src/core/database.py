@@ -1,35 +1,140 @@
 """
 Database configuration and session management for SQLite with SQLAlchemy.
+
+Nothing touches the filesystem or builds an engine at import time: the
+engine is created on first use, so importing models or repositories (and
+forking workers) stays cheap.
+
+With ARCHIVE_DATABASE_PATH set, every connection also attaches that file
+as the "archive" schema, which holds posts (and their comments) moved out
+of the hot database by src/utils/archive_posts.py.
+
+Every connection also sets the configured journal mode (WAL by default)
+and asks for auto_vacuum=INCREMENTAL, so src/utils/maintenance.py can
+hand pages freed by deletes back to the filesystem a few at a time, and
+statements run for a request are held to its route's time budget
+(src/core/query_budget.py) and timed against it (src/core/runtime.py).
 """
+import threading
 from pathlib import Path
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Connection, Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateColumn
+
+from src.core.compression import TextCompressor
+from src.core.config import settings
+from src.core.query_budget import install_query_budget, query_budgets
+from src.core.runtime import runtime_monitor
 
 # Database configuration
-DATABASE_URL = "sqlite:///./blog.db"
+DATABASE_URL = settings.database_url
+ARCHIVE_DATABASE_PATH = settings.archive_database_path
+
+# Schema name the archive file is attached under, and the tables it mirrors
+ARCHIVE_SCHEMA = "archive"
+ARCHIVED_TABLES = ("posts", "comments")
+
+# Archived content is always compressed, as hard as zlib goes
+_archive_compressor = TextCompressor(codec="zlib", threshold=0, level=9)
+
+# Journal modes SQLITE_JOURNAL_MODE may name
+_JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+
+# Bump whenever the models change; stored in SQLite's PRAGMA user_version
+SCHEMA_VERSION = 9
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
 
 
 # Ensure the database directory exists
 def ensure_db_directory():
     """Ensure the database directory exists."""
-    db_path = Path("blog.db")
-    db_dir = db_path.parent
-    db_dir.mkdir(exist_ok=True)
+    database = make_url(DATABASE_URL).database
+    if database and database != ":memory:":
+        Path(database).parent.mkdir(parents=True, exist_ok=True)
 
 
-ensure_db_directory()
+def get_engine() -> Engine:
+    """Get the SQLAlchemy engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                ensure_db_directory()
+                _engine = create_engine(
+                    DATABASE_URL,
+                    connect_args={"check_same_thread": False},  # Needed for SQLite
+                    echo=False  # Set to True for SQL query logging
+                )
+                configure_sqlite(_engine, settings.sqlite_journal_mode)
+                if query_budgets.enabled:
+                    install_query_budget(_engine, query_budgets)
+                runtime_monitor.instrument_engine(_engine)
+                if ARCHIVE_DATABASE_PATH:
+                    attach_archive(_engine, ARCHIVE_DATABASE_PATH)
+                    ArchiveSessionLocal.configure(bind=archive_bind(_engine))
+                SessionLocal.configure(bind=_engine)
+    return _engine
 
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Needed for SQLite
-    echo=False  # Set to True for SQL query logging
-)
+def configure_sqlite(engine: Engine, journal_mode: str = "") -> None:
+    """Set the journal mode and incremental auto-vacuum on every connection the engine opens."""
+    if journal_mode and journal_mode.lower() not in _JOURNAL_MODES:
+        raise ValueError(f"Unknown SQLite journal mode: {journal_mode}")
+
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection, connection_record):
+        # Applies to new files right away; existing ones switch on their next VACUUM
+        dbapi_connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        if journal_mode:
+            dbapi_connection.execute(f"PRAGMA journal_mode = {journal_mode}")
+
+
+def _archive_compress(value):
+    # SQL function used when copying rows into the archive; stored blobs pass through
+    return _archive_compressor.compress(value, force=True) if isinstance(value, str) else value
+
+
+def attach_archive(engine: Engine, path: str) -> None:
+    """Attach the archive database to every connection the engine opens."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    @event.listens_for(engine, "connect")
+    def _attach(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+        dbapi_connection.create_function("archive_compress", 1, _archive_compress, deterministic=True)
+
+
+def archive_bind(engine: Engine) -> Engine:
+    """Engine view whose ORM queries read the archived copies of the tables."""
+    return engine.execution_options(schema_translate_map={None: ARCHIVE_SCHEMA})
+
+
+def __getattr__(name):
+    # Keep `from src.core.database import engine` working without an import-time engine
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that creates the engine the first time a session is opened."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None and "bind" not in local_kw:
+            get_engine()
+        return super().__call__(**local_kw)
+
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+
+# Sessions reading the archive schema; None when no archive is configured
+ArchiveSessionLocal = _LazySessionmaker(autocommit=False, autoflush=False) if ARCHIVE_DATABASE_PATH else None
 
 # Create Base class for models
 Base = declarative_base()
@@ -47,12 +152,80 @@ def get_db():
         db.close()
 
 
+# Idempotent data fixes for columns added to existing tables, run after they are added
+_BACKFILLS = (
+    # Comments written before reply threads become top-level comments
+    "UPDATE comments SET path = printf('%010d/', id), depth = 0 WHERE path = ''",
+)
+
+
+def _add_missing_columns(connection: Connection) -> None:
+    """Add model columns that existing tables were created without."""
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+
+
+def _create_schema(connection: Connection) -> None:
+    """Create missing tables, columns and indexes, then stamp the schema version."""
+    Base.metadata.create_all(bind=connection)
+    _add_missing_columns(connection)
+    for statement in _BACKFILLS:
+        connection.exec_driver_sql(statement)
+    # create_all only builds indexes together with new tables, so add any
+    # index introduced after the table itself was created.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=connection, checkfirst=True)
+    connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def get_schema_version(bind: Optional[Engine] = None) -> int:
+    """Get the schema version stored in the database (0 for a new or unversioned file)."""
+    with (bind or get_engine()).connect() as connection:
+        return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def init_schema(bind: Optional[Engine] = None) -> bool:
+    """
+    Bring the schema up to SCHEMA_VERSION.
+
+    When the stored version matches this costs a single PRAGMA query and no
+    table reflection. Otherwise the first worker to take the write lock
+    builds the schema; the others wait, re-check and skip.
+    Returns True if the schema was changed.
+    """
+    with (bind or get_engine()).connect() as connection:
+        if connection.exec_driver_sql("PRAGMA user_version").scalar() == SCHEMA_VERSION:
+            return False
+
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+        if connection.exec_driver_sql("PRAGMA user_version").scalar() == SCHEMA_VERSION:
+            connection.rollback()
+            return False
+        _create_schema(connection)
+        connection.commit()
+        return True
+
+
+def create_archive_tables(bind: Optional[Engine] = None) -> None:
+    """Create the archived tables in the attached archive database if they are missing."""
+    tables = [Base.metadata.tables[name] for name in ARCHIVED_TABLES]
+    with archive_bind(bind or get_engine()).begin() as connection:
+        Base.metadata.create_all(bind=connection, tables=tables)
+
+
 def create_tables():
     """
     Create all database tables.
     This should be called when the application starts.
     """
-    Base.metadata.create_all(bind=engine)
+    with get_engine().begin() as connection:
+        _create_schema(connection)
 
 
 def drop_tables():
@@ -60,7 +233,7 @@ def drop_tables():
     Drop all database tables.
     Useful for testing or resetting the database.
     """
-    Base.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=get_engine())
 
 
 def reset_database():
@@ -0,0 +1,157 @@
+"""
+In-process publish/subscribe of per-post events for live streams.
+
+Publishers are the (synchronous) repositories; subscribers are asyncio
+consumers such as the Server-Sent Events route. Each event is encoded once
+per publish and the same frame is shared by every subscriber, so an idle
+subscriber costs one small bounded queue. In-process listeners (such as
+the trending leaderboard) see every event, synchronously, before it is
+encoded.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[int, str, Dict[str, Any]], None]
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Subscription:
+    """A subscriber's bounded queue of encoded frames for one post."""
+
+    __slots__ = ("bus", "post_id", "loop", "queue", "dropped")
+
+    def __init__(self, bus: "EventBus", post_id: int, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.bus = bus
+        self.post_id = post_id
+        self.loop = loop
+        self.queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    def offer(self, frame: Optional[str]) -> None:
+        """Enqueue a frame (None ends the stream). Must run on the subscriber's loop."""
+        if self.dropped:
+            return
+        if frame is None:
+            self._close()
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Slow consumer: discard its backlog and end its stream so it
+            # reconnects and refetches instead of holding memory.
+            self.bus._drop(self)
+            self._close()
+
+    def _close(self) -> None:
+        self.dropped = True
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class EventBus:
+    """Fan-out of per-post events to bounded subscriber queues."""
+
+    def __init__(self, queue_size: int = 64):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, post_id: int) -> Subscription:
+        """Register a subscriber for a post. Must be called from a running event loop."""
+        subscription = Subscription(self, post_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(post_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber; safe to call more than once."""
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.post_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.post_id]
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call listener(post_id, event, data) in the publishing thread for every event."""
+        self._listeners.append(listener)
+
+    def has_subscribers(self, post_id: int) -> bool:
+        """Check whether any stream follows a post."""
+        return post_id in self._subscribers
+
+    def observed(self, post_id: int) -> bool:
+        """Check whether an event for a post would reach anyone, so publishers can skip building it."""
+        return bool(self._listeners) or post_id in self._subscribers
+
+    def subscriber_count(self) -> int:
+        """Get the number of live subscribers across all posts."""
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, post_id: int, event: str, data: Dict[str, Any]) -> None:
+        """Pass an event to the listeners, then encode it once for every subscriber of the post."""
+        self.notify(post_id, event, data)
+
+        with self._lock:
+            subscribers = tuple(self._subscribers.get(post_id, ()))
+        if not subscribers:
+            return
+
+        self.published += 1
+        payload = json.dumps(data, default=_json_default, separators=(",", ":"))
+        self._deliver(subscribers, f"id: {next(self._sequence)}\nevent: {event}\ndata: {payload}\n\n")
+
+    def notify(self, post_id: int, event: str, data: Dict[str, Any]) -> None:
+        """Pass an event to the in-process listeners only, not to live streams."""
+        for listener in self._listeners:
+            try:
+                listener(post_id, event, data)
+            except Exception:
+                # A broken listener must not fail the write that published the event
+                logger.exception("Event listener failed for %s on post %s", event, post_id)
+
+    def close(self, post_id: int) -> None:
+        """End every stream of a post, e.g. after the post was deleted."""
+        with self._lock:
+            subscribers = tuple(self._subscribers.pop(post_id, ()))
+        self._deliver(subscribers, None)
+
+    def _deliver(self, subscribers, frame: Optional[str]) -> None:
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for subscription in subscribers:
+            if subscription.loop is current_loop:
+                subscription.offer(frame)
+            elif not subscription.loop.is_closed():
+                subscription.loop.call_soon_threadsafe(subscription.offer, frame)
+
+    def _drop(self, subscription: Subscription) -> None:
+        self.dropped += 1
+        self.unsubscribe(subscription)
+
+
+post_events = EventBus(queue_size=settings.stream_queue_size)
@@ -0,0 +1,208 @@
+"""
+Idempotency keys for POST endpoints.
+
+A client that sends an Idempotency-Key header gets the same response for
+every retry of a request: the first request runs and its response body is
+stored, later ones are replayed from the store without touching the
+repositories. Keys are bound to a fingerprint of the request, so reusing
+a key for a different request is rejected instead of replaying the wrong
+response.
+
+Completed responses live in a bounded in-memory LRU. With
+IDEMPOTENCY_STORE=sqlite they are also written to the idempotency_keys
+table, which makes keys survive restarts and hold across worker
+processes: the row is claimed with an INSERT before the request runs, so
+only one of several concurrent duplicates can win it.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from src.core.config import settings
+from src.core.database import get_engine
+from src.models.db_models import IdempotencyKey
+
+# Outcomes of IdempotencyStore.begin
+PROCEED = "proceed"
+REPLAY = "replay"
+IN_PROGRESS = "in_progress"
+MISMATCH = "mismatch"
+
+
+class StoredResponse(NamedTuple):
+    fingerprint: str
+    status_code: int
+    body: str
+    stored_at: float
+
+
+def request_fingerprint(method: str, path: str, payload: str) -> str:
+    """Hash what identifies a request: method, concrete path and the validated body."""
+    return hashlib.sha256(f"{method} {path}\n{payload}".encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """Claims, completes and replays idempotency keys."""
+
+    def __init__(
+        self,
+        capacity: int = 10000,
+        ttl: float = 86400.0,
+        lock_timeout: float = 60.0,
+        persist: bool = False,
+        bind: Optional[Engine] = None
+    ):
+        self.capacity = capacity
+        self.ttl = ttl
+        # A claimed key whose request never finished (crashed worker) is freed after this long
+        self.lock_timeout = lock_timeout
+        self.persist = persist
+        self.bind = bind
+        self._lock = threading.Lock()
+        self._completed: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        # Keys whose first request is still running; never evicted by the LRU
+        self._pending: Dict[str, str] = {}
+        self._completions = 0
+        self.replayed = 0
+        self.conflicts = 0
+        self.mismatches = 0
+
+    def begin(self, key: str, fingerprint: str) -> Tuple[str, Optional[StoredResponse]]:
+        """
+        Claim key for a request. Returns (PROCEED, None) when the caller should
+        run the request and then complete() or abandon() the key, (REPLAY, stored)
+        for a finished duplicate, and IN_PROGRESS or MISMATCH otherwise.
+        """
+        now = time.time()
+        with self._lock:
+            outcome = self._begin_cached(key, fingerprint, now)
+            if outcome is None and not self.persist:
+                self._pending[key] = fingerprint
+                outcome = (PROCEED, None)
+
+        if outcome is None:
+            outcome = self._begin_persisted(key, fingerprint, now)
+            with self._lock:
+                if outcome[0] == PROCEED:
+                    self._pending[key] = fingerprint
+                elif outcome[0] == REPLAY:
+                    self._remember(key, outcome[1])
+
+        with self._lock:
+            if outcome[0] == REPLAY:
+                self.replayed += 1
+            elif outcome[0] == IN_PROGRESS:
+                self.conflicts += 1
+            elif outcome[0] == MISMATCH:
+                self.mismatches += 1
+        return outcome
+
+    def _begin_cached(self, key: str, fingerprint: str, now: float) -> Optional[Tuple[str, Optional[StoredResponse]]]:
+        # Caller holds the lock
+        pending = self._pending.get(key)
+        if pending is not None:
+            return (IN_PROGRESS, None) if pending == fingerprint else (MISMATCH, None)
+
+        stored = self._completed.get(key)
+        if stored is None:
+            return None
+        if now - stored.stored_at > self.ttl:
+            del self._completed[key]
+            return None
+        self._completed.move_to_end(key)
+        return (REPLAY, stored) if stored.fingerprint == fingerprint else (MISMATCH, None)
+
+    def _begin_persisted(self, key: str, fingerprint: str, now: float) -> Tuple[str, Optional[StoredResponse]]:
+        table = IdempotencyKey.__table__
+        with (self.bind or get_engine()).begin() as connection:
+            claimed = connection.execute(
+                sqlite_insert(table)
+                .values(key=key, fingerprint=fingerprint, created_at=now)
+                .on_conflict_do_nothing(index_elements=[table.c.key])
+            ).rowcount
+            if claimed:
+                return PROCEED, None
+
+            row = connection.execute(select(table).where(table.c.key == key)).one()
+            expired = now - row.created_at > self.ttl
+            stale_claim = row.status_code is None and now - row.created_at > self.lock_timeout
+            if expired or stale_claim:
+                # Take the key over; the WHERE makes only one worker succeed
+                taken = connection.execute(
+                    update(table)
+                    .where(table.c.key == key, table.c.created_at == row.created_at)
+                    .values(fingerprint=fingerprint, status_code=None, response_body=None, created_at=now)
+                ).rowcount
+                return (PROCEED, None) if taken else (IN_PROGRESS, None)
+
+        if row.fingerprint != fingerprint:
+            return MISMATCH, None
+        if row.status_code is None:
+            return IN_PROGRESS, None
+        return REPLAY, StoredResponse(row.fingerprint, row.status_code, row.response_body, row.created_at)
+
+    def complete(self, key: str, status_code: int, body: str) -> None:
+        """Store the response of a request that was allowed to proceed."""
+        now = time.time()
+        with self._lock:
+            fingerprint = self._pending.pop(key)
+            self._remember(key, StoredResponse(fingerprint, status_code, body, now))
+            self._completions += 1
+            purge = self.persist and self._completions % 1000 == 0
+
+        if self.persist:
+            table = IdempotencyKey.__table__
+            with (self.bind or get_engine()).begin() as connection:
+                connection.execute(
+                    update(table)
+                    .where(table.c.key == key)
+                    .values(status_code=status_code, response_body=body, created_at=now)
+                )
+                if purge:
+                    connection.execute(delete(table).where(table.c.created_at < now - self.ttl))
+
+    def abandon(self, key: str) -> None:
+        """Release a key whose request failed, so a retry runs it again."""
+        with self._lock:
+            self._pending.pop(key, None)
+        if self.persist:
+            table = IdempotencyKey.__table__
+            with (self.bind or get_engine()).begin() as connection:
+                connection.execute(delete(table).where(table.c.key == key, table.c.status_code.is_(None)))
+
+    def _remember(self, key: str, stored: StoredResponse) -> None:
+        # Caller holds the lock
+        self._completed[key] = stored
+        self._completed.move_to_end(key)
+        while len(self._completed) > self.capacity:
+            self._completed.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget all cached and pending keys (the SQLite table is left alone)."""
+        with self._lock:
+            self._completed.clear()
+            self._pending.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache size and replay counters."""
+        with self._lock:
+            return {
+                "cached": len(self._completed),
+                "in_flight": len(self._pending),
+                "replayed": self.replayed,
+                "conflicts": self.conflicts,
+                "mismatches": self.mismatches,
+            }
+
+
+idempotency_store = IdempotencyStore(
+    capacity=settings.idempotency_cache_size,
+    ttl=settings.idempotency_ttl_seconds,
+    persist=settings.idempotency_store == "sqlite" and settings.storage_backend == "sqlite"
+)
@@ -0,0 +1,162 @@
+"""
+Per-route time budgets for SQL statements.
+
+A pathological query (a deep skip, a post with a huge comment list) can
+keep a worker busy for seconds and drag up latency for every other
+request. QueryBudgetMiddleware looks up the budget of the route a request
+hits and keeps it in a context variable, which follows the request into
+the threadpool. Each statement the request runs gets a deadline of
+now + budget. SQLite's progress handler, called every few thousand
+virtual machine instructions, interrupts a statement that runs past its
+deadline. The interrupt surfaces as QueryBudgetExceeded, which the app
+answers with 504, and is counted against the route.
+
+Work outside requests (view flushes, jobs, maintenance) has no budget.
+"""
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.admission import READ_METHODS, parse_route_limits, resolve_route_path
+from src.core.config import settings
+
+# Virtual machine instructions between deadline checks
+CHECK_INSTRUCTIONS = 1000
+
+# (route key, budget in seconds) of the request being served
+_route_budget: ContextVar[Optional[Tuple[str, float]]] = ContextVar("route_budget", default=None)
+# Monotonic deadline of the statement being run
+_deadline: ContextVar[Optional[float]] = ContextVar("statement_deadline", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """A statement ran past the time budget of the route it was run for."""
+
+    def __init__(self, route: str, budget: float):
+        super().__init__(f"Statement exceeded the {budget * 1000:g} ms budget of {route}")
+        self.route = route
+        self.budget = budget
+
+
+class QueryBudgets:
+    """Statement time budgets per route, with request and abort counters."""
+
+    def __init__(
+        self,
+        read_ms: float,
+        write_ms: float,
+        route_budgets: Optional[Dict[str, int]] = None,
+        exempt_prefixes: Iterable[str] = (),
+    ):
+        self.read_ms = read_ms
+        self.write_ms = write_ms
+        self.route_budgets = route_budgets or {}
+        self.exempt_prefixes = tuple(exempt_prefixes)
+        self._lock = threading.Lock()
+        self._requests: Dict[str, int] = {}
+        self._aborted: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.read_ms > 0 or self.write_ms > 0 or any(self.route_budgets.values())
+
+    def budget_for(self, method: str, route_path: str) -> float:
+        """Get the budget of a route in milliseconds (0 = unlimited)."""
+        default = self.read_ms if method in READ_METHODS else self.write_ms
+        return self.route_budgets.get(f"{method} {route_path}", default)
+
+    def record_request(self, route: str) -> None:
+        # Only called from the event loop
+        self._requests[route] = self._requests.get(route, 0) + 1
+
+    def record_abort(self, route: str) -> None:
+        with self._lock:
+            self._aborted[route] = self._aborted.get(route, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get the budget, budgeted requests and aborted statements of every route seen so far."""
+        with self._lock:
+            aborted = dict(self._aborted)
+        routes = sorted(set(self._requests) | set(aborted))
+        return {
+            route: {
+                "budget_ms": self.budget_for(*route.split(" ", 1)),
+                "requests": self._requests.get(route, 0),
+                "aborted": aborted.get(route, 0),
+            }
+            for route in routes
+        }
+
+
+def _past_deadline() -> int:
+    # Progress handler: a non-zero return interrupts the running statement
+    deadline = _deadline.get()
+    return 1 if deadline is not None and time.monotonic() > deadline else 0
+
+
+def install_query_budget(engine: Engine, budgets: QueryBudgets) -> None:
+    """Enforce the current request's budget on every statement the engine runs."""
+
+    @event.listens_for(engine, "connect")
+    def _install_handler(dbapi_connection, connection_record):
+        dbapi_connection.set_progress_handler(_past_deadline, CHECK_INSTRUCTIONS)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_clock(conn, cursor, statement, parameters, context, executemany):
+        route_budget = _route_budget.get()
+        _deadline.set(time.monotonic() + route_budget[1] if route_budget else None)
+
+    @event.listens_for(engine, "handle_error")
+    def _translate_interrupt(context):
+        route_budget = _route_budget.get()
+        error = context.original_exception
+        if (
+            route_budget
+            and isinstance(error, sqlite3.OperationalError)
+            and str(error) == "interrupted"
+            and _past_deadline()
+        ):
+            budgets.record_abort(route_budget[0])
+            raise QueryBudgetExceeded(*route_budget) from error
+
+
+class QueryBudgetMiddleware:
+    """ASGI middleware that attaches the matched route's statement budget to the request."""
+
+    def __init__(self, app: ASGIApp, budgets: QueryBudgets):
+        self.app = app
+        self.budgets = budgets
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.budgets.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        route_path = resolve_route_path(scope)
+        budget_ms = self.budgets.budget_for(scope["method"], route_path) if route_path else 0
+        if not budget_ms:
+            await self.app(scope, receive, send)
+            return
+
+        route = f"{scope['method']} {route_path}"
+        self.budgets.record_request(route)
+        token = _route_budget.set((route, budget_ms / 1000))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _route_budget.reset(token)
+
+
+query_budgets = QueryBudgets(
+    read_ms=settings.query_budget_read_ms,
+    write_ms=settings.query_budget_write_ms,
+    route_budgets=parse_route_limits(settings.query_budget_route_limits),
+    # Maintenance, backups and debug counters are expected to run long or touch no rows
+    exempt_prefixes=("/docs", "/redoc", "/openapi.json", "/debug", "/health", "/admin"),
+)
@@ -0,0 +1,218 @@
+"""
+Server-side Markdown rendering for GET /posts?format=html.
+
+Uses the `markdown` package when it is installed, otherwise a small built-in
+renderer covering headings, paragraphs, lists, block quotes, fenced code,
+emphasis, inline code and links. Either way raw HTML in posts is escaped
+and links or images whose URL has a scheme other than http(s) or mailto
+are dropped.
+Rendered HTML is cached in an LRU keyed by a hash of the source, and posts
+are rendered when they are written, so reads almost never pay for rendering.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from html import escape, unescape
+from typing import Callable, Dict, List, Union
+
+from src.core.config import settings
+
+try:
+    import markdown
+    from markdown.treeprocessors import Treeprocessor
+except ImportError:  # optional dependency
+    markdown = None
+
+_CODE_SPAN = re.compile(r"`([^`\n]+)`")
+# The URL may contain balanced parentheses, e.g. Wikipedia links
+_LINK = re.compile(r"\[([^\]\n]+)\]\(((?:[^()\s]|\([^()\s]*\))+)\)")
+_STRONG = re.compile(r"\*\*(.+?)\*\*|(?<!\w)__(.+?)__(?!\w)")
+_EMPHASIS = re.compile(r"\*([^*\n]+)\*|(?<!\w)_([^_\n]+)_(?!\w)")
+_HEADING = re.compile(r"(#{1,6})\s+(.*?)\s*#*$")
+_BULLET = re.compile(r"\s*[-*+]\s+(.*)")
+_NUMBERED = re.compile(r"\s*\d+[.)]\s+(.*)")
+_QUOTE = re.compile(r">\s?(.*)")
+_SAFE_URL = re.compile(r"(https?:|mailto:|/|#|\.|[^:]*$)", re.IGNORECASE)
+# Browsers ignore these inside a URL's scheme, so "java\tscript:" still runs script
+_IGNORED_URL_CHARS = re.compile(r"[\x00-\x20\x7f]")
+
+
+def _is_safe_url(url: str) -> bool:
+    """Check a URL is relative or uses http(s) or mailto, as a browser would read it."""
+    return bool(_SAFE_URL.match(_IGNORED_URL_CHARS.sub("", unescape(url))))
+
+
+def _link(match: re.Match) -> str:
+    text, url = match.group(1), match.group(2)
+    if not _is_safe_url(url):
+        return text
+    return f'<a href="{url}">{text}</a>'
+
+
+def _inline(text: str) -> str:
+    """Render inline markup; code spans are escaped but otherwise left alone."""
+    parts = _CODE_SPAN.split(text)
+    for index, part in enumerate(parts):
+        if index % 2:
+            parts[index] = f"<code>{escape(part)}</code>"
+            continue
+        part = _LINK.sub(_link, escape(part))
+        part = _STRONG.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", part)
+        parts[index] = _EMPHASIS.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", part)
+    return "".join(parts)
+
+
+def _render_builtin(text: str) -> str:
+    html: List[str] = []
+    paragraph: List[str] = []
+    items: List[str] = []
+    quote: List[str] = []
+    list_tag = None
+
+    def flush():
+        nonlocal list_tag
+        if paragraph:
+            html.append(f"<p>{_inline(chr(10).join(paragraph))}</p>")
+            paragraph.clear()
+        if items:
+            html.append(f"<{list_tag}>" + "".join(f"<li>{_inline(item)}</li>" for item in items) + f"</{list_tag}>")
+            items.clear()
+            list_tag = None
+        if quote:
+            html.append(f"<blockquote><p>{_inline(chr(10).join(quote))}</p></blockquote>")
+            quote.clear()
+
+    lines = iter(text.replace("\r\n", "\n").split("\n"))
+    for line in lines:
+        if line.startswith("```"):
+            flush()
+            code = []
+            for code_line in lines:
+                if code_line.startswith("```"):
+                    break
+                code.append(code_line)
+            html.append(f"<pre><code>{escape(chr(10).join(code))}</code></pre>")
+            continue
+        if not line.strip():
+            flush()
+            continue
+
+        heading = _HEADING.match(line)
+        bullet, numbered = _BULLET.match(line), _NUMBERED.match(line)
+        quoted = _QUOTE.match(line)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            html.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif bullet or numbered:
+            tag = "ul" if bullet else "ol"
+            if paragraph or quote or list_tag != tag:
+                flush()
+            list_tag = tag
+            items.append((bullet or numbered).group(1))
+        elif quoted:
+            if paragraph or items:
+                flush()
+            quote.append(quoted.group(1))
+        elif items:
+            # Lazy continuation of the previous list item
+            items[-1] += "\n" + line.strip()
+        elif quote:
+            quote.append(line)
+        else:
+            paragraph.append(line)
+    flush()
+    return "\n".join(html)
+
+
+if markdown is not None:
+    class _SafeUrls(Treeprocessor):
+        """Drop href and src values with an unsafe scheme from the rendered tree."""
+
+        def run(self, root):
+            for element in root.iter():
+                for attribute in ("href", "src"):
+                    url = element.get(attribute)
+                    if url is not None and not _is_safe_url(url):
+                        del element.attrib[attribute]
+
+
+def _render_with_library(text: str) -> str:
+    renderer = markdown.Markdown(extensions=["fenced_code"], output_format="html")
+    # Escape raw HTML instead of passing it through
+    renderer.preprocessors.deregister("html_block")
+    renderer.inlinePatterns.deregister("html")
+    # Lowest priority: runs after the inline patterns have built the links
+    renderer.treeprocessors.register(_SafeUrls(renderer), "safe_urls", 0)
+    return renderer.convert(text)
+
+
+render_markdown: Callable[[str], str] = _render_with_library if markdown is not None else _render_builtin
+RENDERER = "markdown" if markdown is not None else "builtin"
+
+
+class MarkdownCache:
+    """LRU of rendered HTML keyed by a hash of the Markdown source, with render timings."""
+
+    def __init__(self, capacity: int = 2048, renderer: Callable[[str], str] = render_markdown):
+        self.capacity = capacity
+        self._renderer = renderer
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.render_seconds = 0.0
+        self.max_render_seconds = 0.0
+
+    @staticmethod
+    def key(content: str) -> bytes:
+        """Cache key for Markdown source."""
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+    def render(self, content: str) -> str:
+        """Get the HTML for Markdown content, rendering it only if it is not cached."""
+        key = self.key(content)
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        started = time.perf_counter()
+        html = self._renderer(content)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+            self.render_seconds += elapsed
+            self.max_render_seconds = max(self.max_render_seconds, elapsed)
+        return html
+
+    def clear(self) -> None:
+        """Forget all rendered HTML."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Union[str, int, float]]:
+        """Get cache size, hit counters and render timings."""
+        with self._lock:
+            return {
+                "renderer": RENDERER,
+                "cached": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "render_ms_total": round(self.render_seconds * 1000, 3),
+                "render_ms_avg": round(self.render_seconds * 1000 / self.misses, 3) if self.misses else 0.0,
+                "render_ms_max": round(self.max_render_seconds * 1000, 3),
+            }
+
+
+markdown_cache = MarkdownCache(capacity=settings.markdown_cache_size)
@@ -0,0 +1,308 @@
+"""
+Runtime health of a worker: event loop lag, connection pool use,
+in-flight requests and recent slow requests.
+
+Slowness has three usual causes here, and each leaves its own trace:
+
+- a blocked event loop (sync database calls inside ``async def`` routes)
+  shows up as loop lag, measured by a background task that sleeps for a
+  fixed interval and records how late it woke up; statements run on the
+  loop's own thread are also counted per request;
+- pool exhaustion shows up as checked-out connections close to the
+  pool's capacity;
+- SQLite lock waits show up as slow requests whose time went to the
+  database (``db_ms``) rather than elsewhere.
+
+RuntimeMiddleware tracks every request in a context variable, which
+follows it into the threadpool, so the engine events can add each
+statement's time to the request that ran it. Requests slower than
+SLOW_REQUEST_MS are kept in a short ring buffer for /debug/runtime.
+/health/ready fails once lag or pool saturation passes its threshold,
+so a load balancer can route around the worker. Finished requests are
+handed to the access logger (src/core/access_log.py).
+"""
+import asyncio
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.access_log import AccessLogger, dropped_records
+from src.core.admission import resolve_route_path
+from src.core.config import settings
+
+
+@dataclass
+class RequestTrace:
+    """Timings of one request."""
+    request_id: str
+    method: str
+    path: str
+    route: Optional[str]
+    started_at: float
+    status: Optional[int] = None
+    duration_ms: float = 0.0
+    db_ms: float = 0.0
+    statements: int = 0
+    # Time spent in statements run on the event loop thread, blocking every other request
+    loop_db_ms: float = 0.0
+    # Exception type when the request failed without a response
+    error: Optional[str] = None
+
+
+# Longest X-Request-ID accepted from clients; longer (or missing) ids are replaced
+MAX_REQUEST_ID_LENGTH = 128
+
+# Trace of the request being served
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """Get the trace of the request being served, if any."""
+    return _current_trace.get()
+
+
+class RuntimeMonitor:
+    """Loop lag sampler, pool and request counters, and readiness thresholds."""
+
+    def __init__(
+        self,
+        lag_interval: float = 0.5,
+        lag_window: int = 10,
+        slow_request_ms: float = 1000.0,
+        max_traces: int = 50,
+        max_loop_lag_ms: float = 500.0,
+        max_pool_saturation: float = 0.9,
+        exempt_routes: Iterable[str] = (),
+    ):
+        self.lag_interval = lag_interval
+        self.slow_request_ms = slow_request_ms
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.max_pool_saturation = max_pool_saturation
+        self.exempt_routes = frozenset(exempt_routes)
+        self._lags: Deque[float] = deque(maxlen=lag_window)
+        self._traces: Deque[RequestTrace] = deque(maxlen=max_traces)
+        self._task: Optional[asyncio.Task] = None
+        self._loop_thread: Optional[int] = None
+        self._pool = None
+        self._lock = threading.Lock()
+        # Written from pool threads, so updated under the lock
+        self._checked_out = 0
+        self._peak_checked_out = 0
+        self._checkouts = 0
+        self._loop_statements = 0
+        # Only touched from the event loop
+        self.in_flight = 0
+        self.requests = 0
+        self.slow_requests = 0
+
+    def start(self) -> None:
+        """Start sampling loop lag; call from the event loop."""
+        if self._task is None:
+            self._loop_thread = threading.get_ident()
+            self._task = asyncio.get_running_loop().create_task(self._sample_lag())
+
+    async def stop(self) -> None:
+        """Stop the lag sampler."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sample_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            # Anything beyond the interval is time the loop spent unable to run ready callbacks
+            self._lags.append(max(0.0, loop.time() - started - self.lag_interval) * 1000)
+
+    def instrument_engine(self, engine: Engine) -> None:
+        """Count pool checkouts and time every statement against the request that ran it."""
+        self._pool = engine.pool
+
+        @event.listens_for(engine, "checkout")
+        def _checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self._checked_out += 1
+                self._checkouts += 1
+                self._peak_checked_out = max(self._peak_checked_out, self._checked_out)
+
+        @event.listens_for(engine, "checkin")
+        def _checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self._checked_out -= 1
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _start_statement(conn, cursor, statement, parameters, context, executemany):
+            conn.info["runtime_statement_started"] = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _end_statement(conn, cursor, statement, parameters, context, executemany):
+            elapsed = (time.perf_counter() - conn.info.pop("runtime_statement_started")) * 1000
+            on_loop = threading.get_ident() == self._loop_thread
+            if on_loop:
+                with self._lock:
+                    self._loop_statements += 1
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.db_ms += elapsed
+                trace.statements += 1
+                if on_loop:
+                    trace.loop_db_ms += elapsed
+
+    def begin_request(
+        self, method: str, path: str, route: Optional[str], request_id: Optional[str] = None
+    ) -> Tuple[RequestTrace, Any]:
+        """Start tracking a request; returns its trace and a token for end_request()."""
+        trace = RequestTrace(
+            request_id=request_id or uuid.uuid4().hex, method=method, path=path, route=route, started_at=time.time()
+        )
+        self.in_flight += 1
+        self.requests += 1
+        return trace, _current_trace.set(trace)
+
+    def end_request(self, trace: RequestTrace, token: Any, started: float) -> None:
+        """Finish a request started with begin_request() at perf_counter() == started."""
+        _current_trace.reset(token)
+        self.in_flight -= 1
+        trace.duration_ms = (time.perf_counter() - started) * 1000
+        if trace.duration_ms >= self.slow_request_ms:
+            self.slow_requests += 1
+            self._traces.append(trace)
+
+    def loop_lag(self) -> Dict[str, Any]:
+        """Get the latest, worst and average loop lag over the sampling window, in ms."""
+        lags = list(self._lags)
+        return {
+            "current_ms": round(lags[-1], 3) if lags else 0.0,
+            "max_ms": round(max(lags), 3) if lags else 0.0,
+            "avg_ms": round(sum(lags) / len(lags), 3) if lags else 0.0,
+            "samples": len(lags),
+            "sampling": self._task is not None,
+        }
+
+    def pool(self) -> Dict[str, Any]:
+        """Get checked-out connections against the pool's capacity (None when unbounded or unknown)."""
+        capacity = None
+        if self._pool is not None and hasattr(self._pool, "size"):
+            # QueuePool keeps max_overflow private; negative means no limit
+            overflow = getattr(self._pool, "_max_overflow", -1)
+            capacity = self._pool.size() + overflow if overflow >= 0 else None
+        with self._lock:
+            checked_out, peak, checkouts = self._checked_out, self._peak_checked_out, self._checkouts
+        return {
+            "checked_out": checked_out,
+            "peak_checked_out": peak,
+            "capacity": capacity,
+            "saturation": round(checked_out / capacity, 3) if capacity else None,
+            "checkouts": checkouts,
+        }
+
+    def readiness(self) -> Dict[str, Any]:
+        """Check loop lag and pool saturation against their thresholds."""
+        lag_ms = self.loop_lag()["max_ms"]
+        saturation = self.pool()["saturation"]
+        failures = []
+        if self.max_loop_lag_ms > 0 and lag_ms > self.max_loop_lag_ms:
+            failures.append(f"event loop lag {lag_ms:g} ms exceeds {self.max_loop_lag_ms:g} ms")
+        if saturation is not None and self.max_pool_saturation > 0 and saturation >= self.max_pool_saturation:
+            failures.append(f"connection pool saturation {saturation:g} reaches {self.max_pool_saturation:g}")
+        return {
+            "ready": not failures,
+            "loop_lag_ms": lag_ms,
+            "pool_saturation": saturation,
+            "in_flight": self.in_flight,
+            "failures": failures,
+        }
+
+    def slow_traces(self) -> List[Dict[str, Any]]:
+        """Get the most recent slow requests, newest first."""
+        return [asdict(trace) for trace in reversed(self._traces)]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get everything /debug/runtime reports."""
+        with self._lock:
+            loop_statements = self._loop_statements
+        return {
+            "loop_lag": self.loop_lag(),
+            "pool": self.pool(),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "slow_requests": self.slow_requests,
+            "slow_request_ms": self.slow_request_ms,
+            "loop_statements": loop_statements,
+            "dropped_log_records": dropped_records(),
+            "recent_slow_requests": self.slow_traces(),
+        }
+
+
+def _request_id(scope: Scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            request_id = value.decode("latin-1").strip()
+            if 0 < len(request_id) <= MAX_REQUEST_ID_LENGTH and request_id.isprintable():
+                return request_id
+            return None
+    return None
+
+
+class RuntimeMiddleware:
+    """ASGI middleware that assigns request ids, counts in-flight requests, records slow ones and logs access."""
+
+    def __init__(self, app: ASGIApp, monitor: RuntimeMonitor, access: Optional[AccessLogger] = None):
+        self.app = app
+        self.monitor = monitor
+        self.access = access
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_path = resolve_route_path(scope)
+        if route_path in self.monitor.exempt_routes:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        trace, token = self.monitor.begin_request(scope["method"], scope["path"], route_path, _request_id(scope))
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+                request_id = (b"x-request-id", trace.request_id.encode("latin-1"))
+                message["headers"] = [*message.get("headers", ()), request_id]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException as exc:
+            trace.error = type(exc).__name__
+            raise
+        finally:
+            self.monitor.end_request(trace, token, started)
+            if self.access is not None:
+                self.access.log(trace)
+
+
+runtime_monitor = RuntimeMonitor(
+    lag_interval=settings.runtime_lag_interval_seconds,
+    lag_window=settings.runtime_lag_window,
+    slow_request_ms=settings.slow_request_ms,
+    max_traces=settings.slow_request_traces,
+    max_loop_lag_ms=settings.ready_max_loop_lag_ms,
+    max_pool_saturation=settings.ready_max_pool_saturation,
+    # Long-lived streams would count as in flight, and slow, for their whole lifetime
+    exempt_routes={"/posts/{post_id}/comments/stream"},
+)
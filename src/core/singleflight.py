@@ -0,0 +1,84 @@
+"""
+Single-flight coalescing of concurrent identical reads.
+
+When many threads ask for the same key at once, only the first (the leader)
+runs the underlying call; the others wait for it and share its result or
+exception. Nothing is cached: once the call finishes the next request for
+the key starts a fresh one.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.requests = 0
+        self.executions = 0
+        self.collapsed = 0
+        self.max_waiters = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) unless a call for key is already in flight, then share its outcome."""
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.collapsed += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Get the number of keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """Get counters describing how many requests were collapsed."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "collapsed": self.collapsed,
+                "max_waiters": self.max_waiters,
+                "in_flight": len(self._calls),
+            }
+
+
+read_coalescer = SingleFlight()
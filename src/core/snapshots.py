@@ -0,0 +1,208 @@
+"""
+Pre-serialized JSON bodies for GET /posts/{post_id}.
+
+A hot post is read far more often than it changes, yet every read loads
+the post and its comments, validates PostResponse and encodes JSON. The
+snapshot store keeps the encoded body per post in a bounded LRU, and the
+route sends those bytes as they are. An event bus listener drops a
+post's snapshot whenever the post or one of its comments changes, and
+the view counter drops it when it flushes new views, so a snapshot shows
+what a fresh query would.
+
+Events only reach listeners in the process that made the change, so with
+several workers a snapshot can trail another worker's write by up to
+SNAPSHOT_TTL_SECONDS. With SNAPSHOT_PERSIST=true the bodies are also kept
+in the post_snapshots table, where restarted and sibling workers find
+them instead of building their own.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+from src.core.config import settings
+from src.core.database import get_engine
+from src.core.events import post_events
+from src.models.db_models import PostSnapshot
+
+# Events after which a post's stored body no longer matches the database
+_INVALIDATING_EVENTS = ("post.updated", "post.deleted", "comment.created", "comment.updated", "comment.deleted")
+
+# Invalidation marks kept before they are folded into a single floor
+_MAX_MARKS = 10000
+
+
+class SnapshotStore:
+    """LRU of encoded post bodies, optionally backed by the post_snapshots table."""
+
+    def __init__(self, capacity: int = 0, ttl: float = 60.0, persist: bool = False, bind: Optional[Engine] = None):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.persist = persist
+        self.bind = bind
+        self._entries: "OrderedDict[int, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # A body built from a read that started before its post's last
+        # invalidation may be stale and is not stored; see put()
+        self._clock = 0
+        self._marks: Dict[int, int] = {}
+        self._floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.builds = 0
+        self.invalidations = 0
+        self.discarded = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def get(self, post_id: int) -> Optional[bytes]:
+        """Get a post's body from memory; None on a miss."""
+        with self._lock:
+            entry = self._entries.get(post_id)
+            if entry is not None and time.time() - entry[1] <= self.ttl:
+                self._entries.move_to_end(post_id)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[post_id]
+            self.misses += 1
+            return None
+
+    def get_or_build(self, post_id: int, build: Callable[[int], Optional[bytes]]) -> Optional[bytes]:
+        """
+        Get a post's body from the table, or build it with build(post_id)
+        and store it. Returns None if build does (the post does not exist).
+        build must start its own read rather than share one already in
+        flight, which could predate the token taken here.
+        """
+        token = self.begin()
+        if self.persist:
+            body = self._load(post_id)
+            if body is not None:
+                self.put(post_id, body, token, write_through=False)
+                return body
+
+        body = build(post_id)
+        if body is not None:
+            with self._lock:
+                self.builds += 1
+            self.put(post_id, body, token)
+        return body
+
+    def begin(self) -> int:
+        """Get a token to pass to put() for a body about to be read from the database."""
+        with self._lock:
+            return self._clock
+
+    def put(self, post_id: int, body: bytes, token: int, write_through: bool = True) -> bool:
+        """Store a body unless the post changed since begin() returned token; returns whether it was kept."""
+        now = time.time()
+        with self._lock:
+            if not self._is_current(post_id, token):
+                self.discarded += 1
+                return False
+            self._entries[post_id] = (body, now)
+            self._entries.move_to_end(post_id)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+        if self.persist and write_through:
+            table = PostSnapshot.__table__
+            row = {"body": body.decode("utf-8"), "created_at": now}
+            with (self.bind or get_engine()).begin() as connection:
+                connection.execute(
+                    sqlite_insert(table)
+                    .values(post_id=post_id, **row)
+                    .on_conflict_do_update(index_elements=[table.c.post_id], set_=row)
+                )
+            with self._lock:
+                current = self._is_current(post_id, token)
+            if not current:
+                # Invalidated while the row was being written
+                self._delete_rows([post_id])
+        return True
+
+    def invalidate(self, post_id: int) -> None:
+        """Drop a post's body; reads already in progress will not store theirs."""
+        self.invalidate_many([post_id])
+
+    def invalidate_many(self, post_ids: Iterable[int]) -> None:
+        """Drop the bodies of several posts."""
+        post_ids = list(post_ids)
+        if not post_ids or not self.enabled:
+            return
+        with self._lock:
+            self._clock += 1
+            for post_id in post_ids:
+                self._entries.pop(post_id, None)
+                self._marks[post_id] = self._clock
+            self.invalidations += len(post_ids)
+            if len(self._marks) > _MAX_MARKS:
+                # Forget the individual marks; every read begun until now is treated as stale
+                self._marks.clear()
+                self._floor = self._clock
+        if self.persist:
+            self._delete_rows(post_ids)
+
+    def on_event(self, post_id: int, event: str, data: Dict[str, Any]) -> None:
+        """Event bus listener."""
+        if event in _INVALIDATING_EVENTS:
+            self.invalidate(post_id)
+
+    def clear(self) -> None:
+        """Forget all bodies held in memory (the SQLite table is left alone)."""
+        with self._lock:
+            self._entries.clear()
+            self._clock += 1
+            self._marks.clear()
+            self._floor = self._clock
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache size and hit counters."""
+        with self._lock:
+            return {
+                "cached": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loaded": self.loads,
+                "built": self.builds,
+                "invalidated": self.invalidations,
+                "discarded": self.discarded,
+            }
+
+    def _is_current(self, post_id: int, token: int) -> bool:
+        # Caller holds the lock
+        return token >= self._floor and self._marks.get(post_id, -1) <= token
+
+    def _load(self, post_id: int) -> Optional[bytes]:
+        table = PostSnapshot.__table__
+        with (self.bind or get_engine()).connect() as connection:
+            body = connection.execute(
+                select(table.c.body).where(table.c.post_id == post_id, table.c.created_at >= time.time() - self.ttl)
+            ).scalar()
+        if body is None:
+            return None
+        with self._lock:
+            self.loads += 1
+        return body.encode("utf-8")
+
+    def _delete_rows(self, post_ids: Iterable[int]) -> None:
+        table = PostSnapshot.__table__
+        with (self.bind or get_engine()).begin() as connection:
+            connection.execute(delete(table).where(table.c.post_id.in_(list(post_ids))))
+
+
+post_snapshots = SnapshotStore(
+    capacity=settings.snapshot_cache_size,
+    ttl=settings.snapshot_ttl_seconds,
+    persist=settings.snapshot_persist and settings.storage_backend == "sqlite"
+)
+post_events.add_listener(post_snapshots.on_event)
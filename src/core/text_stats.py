@@ -0,0 +1,65 @@
+"""
+Excerpt, word count and reading time of post content.
+
+Computed once when a post is written and stored next to it, so list views
+can show them without loading (or decompressing) the content itself.
+"""
+import math
+import re
+from typing import NamedTuple
+
+from src.core.config import settings
+
+_FENCE = re.compile(r"^```.*$", re.MULTILINE)
+_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_LINK = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_LINE_MARKUP = re.compile(r"^\s{0,3}(?:#{1,6}\s+|>\s?|[-*+]\s+|\d+[.)]\s+)", re.MULTILINE)
+_INLINE_MARKUP = re.compile(r"[*_`~]+")
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+(?:['’-]\w+)*")
+
+
+class PostStats(NamedTuple):
+    """Precomputed list-view fields of a post."""
+    excerpt: str
+    word_count: int
+    reading_time_minutes: int
+
+
+def plain_text(content: str) -> str:
+    """Strip Markdown syntax and collapse whitespace."""
+    text = _FENCE.sub("", content)
+    text = _IMAGE.sub(r"\1", text)
+    text = _LINK.sub(r"\1", text)
+    text = _LINE_MARKUP.sub("", text)
+    text = _INLINE_MARKUP.sub("", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def excerpt(text: str, length: int) -> str:
+    """Cut plain text to at most length characters on a word boundary."""
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if not text[length - 1].isspace() and " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:.") + "…"
+
+
+def post_stats(
+    content: str,
+    excerpt_length: int = settings.excerpt_length,
+    words_per_minute: int = settings.reading_words_per_minute
+) -> PostStats:
+    """
+    Compute the excerpt, word count and reading time of content. Reading
+    time is in whole minutes, at least 1 for any words and 0 for content
+    without words (empty, or nothing but markup).
+    """
+    text = plain_text(content)
+    words = len(_WORD.findall(text))
+    return PostStats(
+        excerpt=excerpt(text, excerpt_length),
+        word_count=words,
+        reading_time_minutes=math.ceil(words / words_per_minute)
+    )
@@ -0,0 +1,125 @@
+"""
+Trending posts ranked by time-decayed comment activity.
+
+Each comment adds exp(rate * (t - landmark)) to its post's score, where t
+is when it was written and rate = ln 2 / half-life ("forward decay").
+Scores of different posts shrink at the same rate as time passes, so
+their order never changes between events and nothing needs re-scoring:
+a comment only moves its own post, one bisect in a sorted ranking, and
+the top K is a slice of that ranking. Scores are rebased onto a new
+landmark before the exponent grows large enough to overflow.
+
+The leaderboard follows comment created/deleted and post deleted events
+from the event bus and is rebuilt from the stored comments on startup.
+"""
+import math
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.core.config import settings
+from src.core.events import post_events
+
+# Rebase once weights reach e**50; floats overflow past e**709
+_MAX_EXPONENT = 50.0
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    """Unix time of a stored timestamp (naive values are UTC, as SQLite writes them)."""
+    if value is None:
+        return time.time()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class TrendingPosts:
+    """Leaderboard of posts by exponentially decayed comment count."""
+
+    def __init__(self, half_life: float = 21600.0):
+        self.half_life = half_life
+        self.rate = math.log(2) / half_life
+        self._lock = threading.Lock()
+        self._landmark = time.time()
+        self._scores: Dict[int, float] = {}
+        # (-score, post_id), so the hottest post comes first
+        self._ranking: List[Tuple[float, int]] = []
+
+    def record(self, post_id: int, created_at: Optional[datetime] = None, delta: int = 1) -> None:
+        """Count a comment written at created_at (delta=-1 takes a deleted one back out)."""
+        timestamp = _timestamp(created_at)
+        with self._lock:
+            if self.rate * (timestamp - self._landmark) > _MAX_EXPONENT:
+                self._rebase(timestamp)
+            weight = math.exp(self.rate * (timestamp - self._landmark))
+            old = self._scores.get(post_id, 0.0)
+            new = old + delta * weight
+            if old:
+                self._unrank(post_id, old)
+            # Adding then removing the same weight can leave float residue
+            if new > weight * 1e-9:
+                self._scores[post_id] = new
+                insort(self._ranking, (-new, post_id))
+            else:
+                self._scores.pop(post_id, None)
+
+    def remove(self, post_id: int) -> None:
+        """Drop a post from the leaderboard."""
+        with self._lock:
+            score = self._scores.pop(post_id, None)
+            if score is not None:
+                self._unrank(post_id, score)
+
+    def top(self, limit: int = 10) -> List[Tuple[int, float]]:
+        """Get the hottest posts as (post_id, score), where score is the decayed comment count as of now."""
+        with self._lock:
+            scale = math.exp(-self.rate * (time.time() - self._landmark))
+            return [(post_id, -negative * scale) for negative, post_id in self._ranking[:limit]]
+
+    def rebuild(self, activity: Iterable[Tuple[int, datetime]]) -> int:
+        """Replace all scores with ones computed from (post_id, created_at) pairs; returns the number of posts."""
+        landmark = time.time()
+        scores: Dict[int, float] = {}
+        for post_id, created_at in activity:
+            scores[post_id] = scores.get(post_id, 0.0) + math.exp(self.rate * (_timestamp(created_at) - landmark))
+        ranking = sorted((-score, post_id) for post_id, score in scores.items())
+        with self._lock:
+            self._landmark = landmark
+            self._scores = scores
+            self._ranking = ranking
+        return len(scores)
+
+    def window_start(self) -> datetime:
+        """Oldest comment time worth loading on rebuild (its weight is below one millionth)."""
+        return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=20 * self.half_life)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def on_event(self, post_id: int, event: str, data: Dict[str, Any]) -> None:
+        """Event bus listener."""
+        if event == "comment.created":
+            self.record(post_id, data.get("created_at"))
+        elif event == "comment.deleted":
+            self.record(post_id, data.get("created_at"), delta=-1)
+        elif event == "post.deleted":
+            self.remove(post_id)
+
+    def _unrank(self, post_id: int, score: float) -> None:
+        # Caller holds the lock
+        position = bisect_left(self._ranking, (-score, post_id))
+        if position < len(self._ranking) and self._ranking[position][1] == post_id:
+            del self._ranking[position]
+
+    def _rebase(self, landmark: float) -> None:
+        # Caller holds the lock; scaling every score by the same factor keeps the order
+        scale = math.exp(-self.rate * (landmark - self._landmark))
+        self._landmark = landmark
+        self._scores = {post_id: score * scale for post_id, score in self._scores.items() if score * scale > 1e-12}
+        self._ranking = sorted((-score, post_id) for post_id, score in self._scores.items())
+
+
+trending_posts = TrendingPosts(half_life=settings.trending_half_life_seconds)
+post_events.add_listener(trending_posts.on_event)
@@ -0,0 +1,100 @@
+"""
+Buffered per-post view counters.
+
+GET /posts/{post_id} only bumps an in-memory counter; a background task
+drains the counters every VIEW_FLUSH_INTERVAL_SECONDS and writes the
+aggregated deltas with one batched UPDATE, and once more on shutdown.
+Reads never touch the database for counting, and a crash loses at most
+one interval's worth of views. Stored totals lag by up to one interval.
+"""
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Sink = Callable[[Dict[int, int]], None]
+
+
+class ViewCounter:
+    """Counts views in memory and hands the accumulated deltas to a sink in batches."""
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending: Dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.flushed_views = 0
+        self.failures = 0
+
+    def increment(self, post_id: int, count: int = 1) -> None:
+        """Count a view of a post."""
+        with self._lock:
+            self._pending[post_id] = self._pending.get(post_id, 0) + count
+
+    def flush(self, sink: Sink) -> int:
+        """Write the pending deltas through sink; returns the number of views written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        try:
+            sink(pending)
+        except Exception:
+            # Put the deltas back so the next flush retries them
+            with self._lock:
+                for post_id, count in pending.items():
+                    self._pending[post_id] = self._pending.get(post_id, 0) + count
+                self.failures += 1
+            raise
+
+        views = sum(pending.values())
+        with self._lock:
+            self.flushes += 1
+            self.flushed_views += views
+        return views
+
+    def start(self, sink: Sink) -> None:
+        """Start flushing in the background. Must be called from a running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(sink))
+
+    async def stop(self, sink: Sink) -> None:
+        """Stop the background task and flush whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await run_in_threadpool(self.flush, sink)
+
+    async def _run(self, sink: Sink) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await run_in_threadpool(self.flush, sink)
+            except Exception:
+                logger.exception("Flushing view counts failed; retrying next interval")
+
+    def stats(self) -> Dict[str, int]:
+        """Get pending and flushed counters."""
+        with self._lock:
+            return {
+                "pending_posts": len(self._pending),
+                "pending_views": sum(self._pending.values()),
+                "flushes": self.flushes,
+                "flushed_views": self.flushed_views,
+                "failures": self.failures,
+            }
+
+
+view_counter = ViewCounter(interval=settings.view_flush_interval_seconds)
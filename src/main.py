@@ -1,29 +1,166 @@
-from fastapi import FastAPI
-import logging
-from src.api.routes import router
-from src.core.database import create_tables
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-app = FastAPI(
-    title="Blogging API",
-    description="A FastAPI application for managing blog posts with SQLite database",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database tables on startup."""
-    create_tables()
-    logger.info("Database tables created successfully")
-
-app.include_router(router)
-
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+import asyncio
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+import logging
+from src.api.routes import router
+from src.api.admin_routes import router as admin_router
+from src.core.access_log import access_logger, configure_logging
+from src.core.admission import AdmissionControlMiddleware, admission_controller
+from src.core.config import settings
+from src.core.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware, query_budgets
+from src.core.runtime import RuntimeMiddleware, runtime_monitor
+from src.core.snapshots import post_snapshots
+from src.core.database import create_archive_tables, create_tables, init_schema
+from src.core.trending import trending_posts
+from src.core.view_counts import view_counter
+from src.repositories.factory import author_repository, comment_repository, post_repository
+from src.utils.jobs import job_runner
+from src.utils.maintenance import database_maintainer
+
+# Log records are written by a background thread, never from the request path
+configure_logging(settings.log_level, settings.log_queue_size)
+logger = logging.getLogger(__name__)
+
+app = FastAPI(
+    title="Blogging API",
+    description="A FastAPI application for managing blog posts with SQLite database",
+    version="1.0.0",
+    docs_url="/docs",
+    redoc_url="/redoc"
+)
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Initialize database tables and in-memory rankings on startup."""
+    if settings.storage_backend == "sqlite":
+        init_database()
+    else:
+        logger.info("Using the %s storage backend", settings.storage_backend)
+
+    activity = comment_repository.get_comment_activity(since=trending_posts.window_start())
+    logger.info("Trending leaderboard rebuilt for %d posts", trending_posts.rebuild(activity))
+
+    view_counter.start(_write_views)
+
+    global _compaction_task, _maintenance_task
+    _compaction_task = asyncio.create_task(_compact_changes_periodically())
+    if settings.storage_backend == "sqlite" and settings.maintenance_interval_seconds > 0:
+        _maintenance_task = asyncio.create_task(_maintain_database_periodically())
+
+    resumed = await run_in_threadpool(job_runner.resume)
+    if resumed:
+        logger.info("Resumed %d unfinished background jobs", resumed)
+
+    # Started last so the blocking schema setup above is not reported as loop lag
+    runtime_monitor.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Write out buffered view counts and stop background tasks."""
+    for task in (_compaction_task, _maintenance_task):
+        if task is not None:
+            task.cancel()
+    # Running jobs stop after their current chunk and resume on the next start
+    await run_in_threadpool(job_runner.stop)
+    await view_counter.stop(_write_views)
+    await runtime_monitor.stop()
+
+
+_compaction_task = None
+_maintenance_task = None
+
+
+def _write_views(views):
+    """Store flushed view counts; snapshots of those posts show the old counts, so drop them."""
+    post_repository.add_post_views(views)
+    post_snapshots.invalidate_many(views)
+
+
+async def _compact_changes_periodically():
+    """Keep the change log bounded: latest entry per entity, expired tombstones dropped."""
+    while True:
+        await asyncio.sleep(settings.changes_compact_interval_seconds)
+        try:
+            removed = await run_in_threadpool(
+                post_repository.compact_changes, settings.changes_tombstone_retention_seconds
+            )
+            logger.info("Change log compacted, %d entries removed", removed)
+        except Exception:
+            logger.exception("Change log compaction failed")
+
+
+def _is_quiet() -> bool:
+    # The runtime monitor counts requests whether or not admission control is enabled
+    return runtime_monitor.in_flight <= settings.maintenance_quiet_requests
+
+
+async def _maintain_database_periodically():
+    """Refresh planner statistics, free dead pages and checkpoint the WAL while traffic is low."""
+    delay = settings.maintenance_interval_seconds
+    while True:
+        await asyncio.sleep(delay)
+        delay = settings.maintenance_interval_seconds
+        # None means a pass started from /admin/maintenance is still running
+        result = await run_in_threadpool(database_maintainer.run, _is_quiet)
+        if result is None:
+            continue
+        if result.status == "deferred":
+            # Traffic picked up; finish at the next lull rather than a full interval later
+            delay = min(delay, 60.0)
+        elif result.status == "failed":
+            logger.error("Database maintenance failed: %s", result.error)
+        else:
+            logger.info(
+                "Database maintenance: %d pages freed, %d WAL pages checkpointed, %d free pages left",
+                result.vacuumed_pages, result.checkpointed_pages, result.after.freelist_count
+            )
+
+
+def init_database():
+    """Create or upgrade the schema and run the backfills that depend on it."""
+    if settings.schema_startup_mode == "create_all":
+        create_tables()
+        upgraded = True
+    else:
+        upgraded = init_schema()
+
+    if upgraded:
+        logger.info("Database schema created or upgraded")
+        # Backfills only need to run when the schema has just changed
+        author_repository.ensure_author_stats()
+    else:
+        logger.info("Database schema is up to date")
+
+    if settings.archive_database_path:
+        create_archive_tables()
+        logger.info("Archive database attached from %s", settings.archive_database_path)
+
+
+@app.exception_handler(QueryBudgetExceeded)
+async def query_budget_exceeded_handler(request: Request, exc: QueryBudgetExceeded):
+    """Answer a request whose statement was interrupted for running past its route's budget."""
+    logger.warning("%s", exc)
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "The request took too long and was cancelled"}
+    )
+
+
+app.include_router(router)
+app.include_router(admin_router)
+
+if query_budgets.enabled:
+    app.add_middleware(QueryBudgetMiddleware, budgets=query_budgets)
+if settings.admission_enabled:
+    app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+# Outermost, so request durations include time spent queued for admission
+app.add_middleware(RuntimeMiddleware, monitor=runtime_monitor, access=access_logger)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    # Access lines come from src/core/access_log.py; uvicorn's own are written synchronously
+    uvicorn.run(app, host="0.0.0.0", port=8000, access_log=False)
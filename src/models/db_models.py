@@ -1,21 +1,67 @@
 """
 SQLAlchemy database models for the blog API.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
+from src.core.compression import TextCompressor
+from src.core.config import settings
 from src.core.database import Base
 
+content_compressor = TextCompressor(
+    codec=settings.content_compression,
+    threshold=settings.content_compression_threshold
+)
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text column that is compressed on write once it exceeds the configured
+    threshold and decompressed on read. Rows written before compression was
+    enabled (or under the threshold) are plain text and read back unchanged.
+    """
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        return content_compressor.compress(value)
+
+    def process_result_value(self, value, dialect):
+        return content_compressor.decompress(value)
+
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # Serves keyset pagination of per-author feeds (newest first)
+        Index("ix_posts_author_created_at_id", "author", "created_at", "id"),
+        # Covers GET /posts/excerpts: columns after a large content sit behind its
+        # overflow pages, so reading them from the table would still load the content
+        Index(
+            "ix_posts_excerpt_list",
+            "id", "title", "author", "created_at", "updated_at",
+            "view_count", "word_count", "reading_time_minutes", "excerpt"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False, index=True)
-    content = Column(Text, nullable=False)
+    content = Column(CompressedText, nullable=False)
     author = Column(String(100), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Flushed in batches from the in-memory counters in src.core.view_counts
+    view_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Rendered Markdown, written with the content when MARKDOWN_PERSIST_HTML is on (else NULL)
+    content_html = Column(CompressedText, nullable=True)
+    # List-view fields computed from the content on write (src.core.text_stats);
+    # NULL until src/utils/backfill_post_stats.py has run on older posts
+    excerpt = Column(Text, nullable=True)
+    word_count = Column(Integer, nullable=True)
+    reading_time_minutes = Column(Integer, nullable=True)
 
     # Relationship to comments
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
@@ -26,6 +72,10 @@ class Post(Base):
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # A subtree is one range of paths within a post, already in thread order
+        Index("ix_comments_post_id_path", "post_id", "path"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
@@ -34,10 +84,102 @@ class Comment(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Foreign key to post
-    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False, index=True)
+
+    # Reply threads: the comment replied to (NULL for top-level comments), the
+    # materialized path of zero-padded ancestor ids ending with this comment's
+    # own id, e.g. "0000000003/0000000007/", and the nesting depth (0 at the top)
+    parent_id = Column(Integer, ForeignKey("comments.id"), nullable=True)
+    path = Column(Text, nullable=False, default="", server_default="")
+    depth = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationship to post
     post = relationship("Post", back_populates="comments")
 
     def __repr__(self):
         return f"<Comment(id={self.id}, author='{self.author}', post_id={self.post_id})>"
+
+
+class AuthorStats(Base):
+    """Per-author rollup maintained by the repositories on every write."""
+    __tablename__ = "author_stats"
+
+    author = Column(String(100), primary_key=True)
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_activity_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return (
+            f"<AuthorStats(author='{self.author}', posts={self.post_count}, "
+            f"comments={self.comment_count})>"
+        )
+
+
+class Change(Base):
+    """Change log entry written with every post and comment mutation (GET /changes)."""
+    __tablename__ = "changes"
+    __table_args__ = (
+        # Compaction finds the latest entry per entity
+        Index("ix_changes_entity_entity_id", "entity", "entity_id"),
+        # AUTOINCREMENT: sequence numbers are never reused after compaction
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = Column(Integer, primary_key=True)
+    entity = Column(String(16), nullable=False)  # "post" or "comment"
+    entity_id = Column(Integer, nullable=False)
+    post_id = Column(Integer, nullable=False)
+    op = Column(String(16), nullable=False)  # "created", "updated" or "deleted"
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<Change(seq={self.seq}, {self.entity} {self.entity_id} {self.op})>"
+
+
+class Job(Base):
+    """Background job (POST /admin/jobs); progress is saved after every chunk so jobs survive restarts."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(32), nullable=False)
+    params = Column(Text, nullable=False)  # JSON
+    status = Column(String(16), nullable=False, index=True)  # queued, running, completed or failed
+    processed = Column(Integer, nullable=False, default=0, server_default="0")
+    chunks = Column(Integer, nullable=False, default=0, server_default="0")
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind='{self.kind}', status='{self.status}')>"
+
+
+class IdempotencyKey(Base):
+    """Stored response for an Idempotency-Key (used when IDEMPOTENCY_STORE=sqlite)."""
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    # NULL while the first request with this key is still running
+    status_code = Column(Integer)
+    response_body = Column(Text)
+    # Unix time; compared against the TTL and lock timeout
+    created_at = Column(Float, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key='{self.key}', status_code={self.status_code})>"
+
+
+class PostSnapshot(Base):
+    """Encoded GET /posts/{post_id} body (used when SNAPSHOT_PERSIST=true); deleted whenever the post changes."""
+    __tablename__ = "post_snapshots"
+
+    post_id = Column(Integer, primary_key=True)
+    body = Column(Text, nullable=False)
+    # Unix time; compared against SNAPSHOT_TTL_SECONDS
+    created_at = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<PostSnapshot(post_id={self.post_id}, bytes={len(self.body)})>"
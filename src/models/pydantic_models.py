@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
 
 
@@ -11,7 +11,7 @@ class CommentBase(BaseModel):
 
 class CommentCreate(CommentBase):
     """Schema for creating a new comment."""
-    pass
+    parent_id: Optional[int] = Field(None, ge=1, description="Comment on the same post this one replies to")
 
 
 class CommentUpdate(BaseModel):
@@ -24,6 +24,8 @@ class CommentResponse(CommentBase):
     """Schema for comment response."""
     id: int
     post_id: int
+    parent_id: Optional[int] = Field(None, description="Comment this one replies to, null at the top level")
+    depth: int = Field(0, description="Nesting depth, 0 for top-level comments")
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -31,6 +33,11 @@ class CommentResponse(CommentBase):
         from_attributes = True
 
 
+class CommentTreeNode(CommentResponse):
+    """Schema for a comment with its nested replies."""
+    replies: List["CommentTreeNode"] = Field(default_factory=list, description="Direct replies, oldest first")
+
+
 class PostBase(BaseModel):
     """Base schema for posts."""
     title: str = Field(..., min_length=1, max_length=200, description="Post title")
@@ -55,6 +62,7 @@ class PostResponse(PostBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    view_count: int = Field(0, description="Views of this post, updated every few seconds")
     comments: List[CommentResponse] = Field(default_factory=list, description="Comments associated with this post")
 
     class Config:
@@ -74,6 +82,14 @@ class PostSummary(BaseModel):
         from_attributes = True
 
 
+class PostExcerptItem(PostSummary):
+    """Schema for a post list item with an excerpt and reading stats instead of the content."""
+    view_count: int = Field(0, description="Views of this post, updated every few seconds")
+    excerpt: Optional[str] = Field(None, description="Start of the content as plain text")
+    word_count: Optional[int] = None
+    reading_time_minutes: Optional[int] = None
+
+
 class PostListItem(BaseModel):
     """Schema for blog post list item (includes content but not comments)."""
     id: int
@@ -83,6 +99,255 @@ class PostListItem(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
     comment_count: int = Field(default=0, description="Number of comments on this post")
+    view_count: int = Field(0, description="Views of this post, updated every few seconds")
+
+    class Config:
+        from_attributes = True
+
+
+class TrendingPostItem(PostListItem):
+    """Schema for a post on the trending leaderboard."""
+    score: float = Field(..., description="Comment count with each comment's weight halving every half-life")
+
+
+class PostLookupRequest(BaseModel):
+    """Schema for fetching several posts by id in one request."""
+    ids: List[int] = Field(..., min_length=1, max_length=100, description="Post ids, in the order to return them")
+    include_comments: bool = Field(False, description="Also return each post's comments")
+
+
+class PostLookupItem(PostListItem):
+    """Schema for a post returned by a lookup; comments are null unless requested."""
+    comments: Optional[List[CommentResponse]] = None
+
+
+class PostLookupResponse(BaseModel):
+    """Schema for the result of a post lookup."""
+    items: List[PostLookupItem] = Field(..., description="Found posts, in the requested order")
+    missing: List[int] = Field(default_factory=list, description="Requested ids that do not exist")
+
+
+class CommentCountsResponse(BaseModel):
+    """Schema for the comment counts of several posts."""
+    counts: Dict[int, int] = Field(..., description="Post id -> number of comments, in the requested order")
+    missing: List[int] = Field(default_factory=list, description="Requested ids that do not exist")
+
+
+class ChangeItem(BaseModel):
+    """Schema for a change log entry."""
+    seq: int = Field(..., description="Position in the change log; pass the last one seen as since")
+    entity: str = Field(..., description="post or comment")
+    entity_id: int
+    post_id: int = Field(..., description="The post itself, or the post a comment belongs to")
+    op: str = Field(..., description="created, updated or deleted (a tombstone)")
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ChangeFeed(BaseModel):
+    """Schema for a page of the change log."""
+    changes: List[ChangeItem]
+    next_since: int = Field(..., description="Value of since for the next request")
+    has_more: bool = Field(..., description="Whether more changes are already available")
+
+
+class AuthorPostsPage(BaseModel):
+    """Schema for a keyset-paginated page of an author's posts."""
+    items: List[PostListItem]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class AuthorStatsResponse(BaseModel):
+    """Schema for author activity statistics."""
+    author: str
+    post_count: int = Field(default=0, description="Number of posts written by the author")
+    comment_count: int = Field(default=0, description="Number of comments written by the author")
+    last_activity_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CoalescingStats(BaseModel):
+    """Schema for single-flight read coalescing counters."""
+    requests: int = Field(..., description="Reads that went through the coalescer")
+    executions: int = Field(..., description="Reads that actually queried the database")
+    collapsed: int = Field(..., description="Reads that shared another request's in-flight query")
+    max_waiters: int = Field(..., description="Largest number of reads collapsed onto one query")
+    in_flight: int = Field(..., description="Queries currently in flight")
+
+
+class MarkdownStats(BaseModel):
+    """Schema for the rendered Markdown cache and render timings."""
+    renderer: str = Field(..., description="markdown (the package) or builtin")
+    cached: int = Field(..., description="Rendered posts held in memory")
+    capacity: int
+    hits: int = Field(..., description="Renders served from the cache")
+    misses: int = Field(..., description="Renders that ran the Markdown renderer")
+    render_ms_total: float
+    render_ms_avg: float
+    render_ms_max: float
+
+
+class AdmissionRouteStats(BaseModel):
+    """Schema for one route's admission control counters."""
+    limit: int = Field(..., description="Maximum concurrent requests")
+    active: int = Field(..., description="Requests currently running")
+    waiting: int = Field(..., description="Requests waiting for a slot")
+    admitted: int
+    rejected: int = Field(..., description="Requests shed with 503")
+
+
+class QueryBudgetRouteStats(BaseModel):
+    """Schema for one route's statement time budget counters."""
+    budget_ms: int = Field(..., description="Longest a single statement may run")
+    requests: int = Field(..., description="Requests served under the budget")
+    aborted: int = Field(..., description="Statements interrupted and answered with 504")
+
+
+class ReadinessResponse(BaseModel):
+    """Schema for the readiness check."""
+    ready: bool
+    loop_lag_ms: float = Field(..., description="Worst event loop lag over the sampling window")
+    pool_saturation: Optional[float] = Field(None, description="Checked-out connections / pool capacity")
+    in_flight: int = Field(..., description="Requests currently being served")
+    failures: List[str] = Field(default_factory=list, description="Thresholds that were crossed")
+
+
+class LoopLagStats(BaseModel):
+    """Schema for event loop lag over the sampling window."""
+    current_ms: float
+    max_ms: float
+    avg_ms: float
+    samples: int
+    sampling: bool = Field(..., description="Whether the background sampler is running")
+
+
+class PoolStats(BaseModel):
+    """Schema for connection pool use."""
+    checked_out: int
+    peak_checked_out: int
+    capacity: Optional[int] = Field(None, description="Pool size plus overflow; null when unbounded")
+    saturation: Optional[float] = None
+    checkouts: int
+
+
+class SlowRequestTrace(BaseModel):
+    """Schema for one request slower than SLOW_REQUEST_MS."""
+    request_id: str
+    method: str
+    path: str
+    route: Optional[str] = None
+    started_at: float
+    status: Optional[int] = None
+    duration_ms: float
+    db_ms: float = Field(..., description="Time spent running SQL statements")
+    statements: int
+    loop_db_ms: float = Field(..., description="Part of db_ms run on the event loop thread, blocking it")
+    error: Optional[str] = Field(None, description="Exception type when the request failed without a response")
+
+
+class RuntimeStats(BaseModel):
+    """Schema for a worker's runtime health."""
+    loop_lag: LoopLagStats
+    pool: PoolStats
+    in_flight: int
+    requests: int
+    slow_requests: int
+    slow_request_ms: float
+    loop_statements: int = Field(..., description="Statements run on the event loop thread")
+    dropped_log_records: int = Field(..., description="Log records dropped because the log queue was full")
+    recent_slow_requests: List[SlowRequestTrace]
+
+
+class BackupRequest(BaseModel):
+    """Schema for starting an online backup."""
+    compress: bool = Field(False, description="gzip the backup file")
+    pages: int = Field(64, ge=1, le=100000, description="Pages copied per backup step")
+    pause_seconds: float = Field(0.01, ge=0, le=1, description="Sleep between steps to leave room for live traffic")
+
+
+class BackupResponse(BaseModel):
+    """Schema for backup status."""
+    id: int
+    status: str
+    path: Optional[str] = None
+    compressed: bool = False
+    size_bytes: int = 0
+    sha256: Optional[str] = None
+    pages: int = Field(0, description="Database pages copied")
+    steps: int = 0
+    restarts: int = Field(0, description="Times the copy restarted because the database was written to")
+    duration_seconds: float = 0.0
+    started_at: datetime
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DatabaseStatsResponse(BaseModel):
+    """Schema for the database file's size and free space."""
+    path: str
+    file_size_bytes: int
+    wal_size_bytes: int
+    page_size: int
+    page_count: int
+    freelist_count: int = Field(..., description="Pages freed by deletes and not yet returned to the filesystem")
+    auto_vacuum: str
+    journal_mode: str
+
+    class Config:
+        from_attributes = True
+
+
+class MaintenanceResponse(BaseModel):
+    """Schema for the outcome of a maintenance pass."""
+    id: int
+    status: str = Field(..., description="running, completed, deferred (traffic picked up) or failed")
+    optimized: bool = False
+    analyzed: bool = False
+    vacuumed_pages: int = 0
+    checkpointed_pages: int = 0
+    before: Optional[DatabaseStatsResponse] = None
+    after: Optional[DatabaseStatsResponse] = None
+    duration_seconds: float = 0.0
+    started_at: datetime
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class JobRequest(BaseModel):
+    """Schema for starting a bulk delete job; rows must match every filter given."""
+    kind: Literal["delete_posts", "delete_comments"] = Field(..., description="What to delete")
+    author: Optional[str] = Field(None, min_length=1, max_length=100, description="Only rows by this author")
+    before: Optional[datetime] = Field(None, description="Only rows created before this time (UTC if no offset)")
+
+    @model_validator(mode="after")
+    def require_filter(self):
+        if self.author is None and self.before is None:
+            raise ValueError("Give an author, a before cutoff or both")
+        return self
+
+
+class JobResponse(BaseModel):
+    """Schema for background job status and progress."""
+    id: int
+    kind: str
+    params: Dict[str, Any]
+    status: str = Field(..., description="queued, running, completed or failed")
+    processed: int = Field(0, description="Rows deleted so far")
+    chunks: int = Field(0, description="Transactions committed so far")
+    rows_per_second: float = 0.0
+    duration_seconds: float = 0.0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,105 @@
+"""
+Lightweight read models for list endpoints.
+
+These are plain named tuples filled straight from Core select() rows, so
+list reads skip the ORM identity map, state tracking and relationship
+loading. They expose the same attribute names as the ORM models, so the
+Pydantic response schemas (from_attributes) accept either. The in-memory
+storage backend also uses them as its stored records.
+"""
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+
+
+class PostListRow(NamedTuple):
+    """A post as shown in list views, with its comment count and persisted HTML, if any."""
+    id: int
+    title: str
+    content: str
+    author: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+    comment_count: int
+    view_count: int = 0
+    content_html: Optional[str] = None
+
+
+class PostExcerptRow(NamedTuple):
+    """A post as shown in compact list views: precomputed excerpt and reading stats, no content."""
+    id: int
+    title: str
+    author: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+    comment_count: int
+    view_count: int
+    excerpt: Optional[str]
+    word_count: Optional[int]
+    reading_time_minutes: Optional[int]
+
+
+class CommentRow(NamedTuple):
+    """A comment as returned by the comment list and thread endpoints."""
+    id: int
+    post_id: int
+    content: str
+    author: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+    parent_id: Optional[int]
+    path: str
+    depth: int
+
+
+class PostRow(NamedTuple):
+    """A post without its comments."""
+    id: int
+    title: str
+    content: str
+    author: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+    view_count: int = 0
+
+
+class PostDetailRow(NamedTuple):
+    """A post with its comments, as returned by GET /posts/{post_id}."""
+    id: int
+    title: str
+    content: str
+    author: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+    comments: List[CommentRow]
+    view_count: int = 0
+
+
+class PostLookupRow(NamedTuple):
+    """A post returned by a multi-get, with its comment count and, if requested, its comments."""
+    id: int
+    title: str
+    content: str
+    author: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+    comment_count: int
+    comments: Optional[List[CommentRow]]
+    view_count: int = 0
+
+
+class AuthorStatsRow(NamedTuple):
+    """An author's activity rollup."""
+    author: str
+    post_count: int
+    comment_count: int
+    last_activity_at: Optional[datetime]
+
+
+class ChangeRow(NamedTuple):
+    """An entry of the change log; op "deleted" is a tombstone."""
+    seq: int
+    entity: str
+    entity_id: int
+    post_id: int
+    op: str
+    changed_at: datetime
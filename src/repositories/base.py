@@ -0,0 +1,232 @@
+"""
+Repository interfaces shared by the storage backends.
+
+Routes and scripts only rely on these methods, so the SQLAlchemy/SQLite
+backend (repository.py) and the in-memory backend (memory.py) are
+interchangeable; src.repositories.factory picks one from configuration.
+Returned objects expose the same attributes as the ORM models.
+"""
+import base64
+import binascii
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.events import post_events
+from src.models.pydantic_models import PostCreate, PostUpdate, CommentCreate, CommentUpdate
+
+
+def encode_cursor(created_at: str, post_id: int) -> str:
+    """Encode a feed position as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(f"{created_at}|{post_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed."""
+    try:
+        created_at, _, post_id = base64.urlsafe_b64decode(cursor.encode()).decode().rpartition("|")
+        return created_at, int(post_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def comment_path(comment_id: int, parent_path: str = "") -> str:
+    """Materialized path of a comment: its ancestors' ids then its own, zero-padded to sort in thread order."""
+    return f"{parent_path}{comment_id:010d}/"
+
+
+def subtree_range(path: str) -> Tuple[str, str]:
+    """Get the [low, high) bounds of the paths in the subtree rooted at path."""
+    # "0" sorts right after "/", so every path extending this one stays below the bound
+    return path, path[:-1] + "0"
+
+
+def require_bulk_filter(author: Optional[str], before: Optional[datetime]) -> None:
+    """Refuse a bulk delete without filters, which would empty the table."""
+    if author is None and before is None:
+        raise ValueError("A bulk delete needs an author or a cutoff")
+
+
+def publish_comment_change(event: str, comment: Any) -> None:
+    """Fan a committed comment change out to listeners and live subscribers of its post."""
+    if not post_events.observed(comment.post_id):
+        return
+    post_events.publish(comment.post_id, event, {
+        "id": comment.id,
+        "post_id": comment.post_id,
+        "parent_id": comment.parent_id,
+        "content": comment.content,
+        "author": comment.author,
+        "created_at": comment.created_at,
+        "updated_at": comment.updated_at,
+    })
+
+
+def publish_comment_deleted(comment_id: int, post_id: int, created_at: Optional[datetime] = None) -> None:
+    """Tell listeners and live subscribers of a post that one of its comments is gone."""
+    if post_events.observed(post_id):
+        post_events.publish(post_id, "comment.deleted", {
+            "id": comment_id,
+            "post_id": post_id,
+            "created_at": created_at,
+        })
+
+
+def publish_post_updated(post: Any) -> None:
+    """Tell in-process listeners that a post was edited (comment streams do not carry post edits)."""
+    post_events.notify(post.id, "post.updated", {
+        "id": post.id,
+        "title": post.title,
+        "author": post.author,
+        "updated_at": post.updated_at,
+    })
+
+
+def publish_post_deleted(post_id: int) -> None:
+    """Tell live subscribers a post is gone and end their streams."""
+    post_events.publish(post_id, "post.deleted", {"id": post_id})
+    post_events.close(post_id)
+
+
+class BasePostRepository(ABC):
+    """Post operations every storage backend provides."""
+
+    @abstractmethod
+    def create_post(self, post: PostCreate) -> Any:
+        """Create a new post."""
+
+    @abstractmethod
+    def get_post(self, post_id: int, include_archived: bool = True, coalesce: bool = True) -> Optional[Any]:
+        """
+        Get a post by ID with its comments, falling back to archived posts if asked to.
+        coalesce=False always runs a fresh load instead of joining one already in flight.
+        """
+
+    @abstractmethod
+    def post_exists(self, post_id: int) -> bool:
+        """Check a post is in the hot database without loading it or its comments."""
+
+    @abstractmethod
+    def get_posts(self, skip: int = 0, limit: int = 10) -> List[Any]:
+        """Get multiple posts with pagination."""
+
+    @abstractmethod
+    def get_post_list(self, skip: int = 0, limit: int = 10) -> List[Any]:
+        """Get a page of posts with comment counts for list views."""
+
+    @abstractmethod
+    def get_post_excerpts(self, skip: int = 0, limit: int = 10) -> List[Any]:
+        """Get a page of posts with excerpts and reading stats, without their content."""
+
+    @abstractmethod
+    def get_posts_by_ids(self, post_ids: List[int], include_comments: bool = False) -> List[Any]:
+        """Get the posts with the given ids in the requested order, skipping ids that do not exist."""
+
+    @abstractmethod
+    def update_post(self, post_id: int, post_update: PostUpdate) -> Optional[Any]:
+        """Update a post."""
+
+    @abstractmethod
+    def delete_post(self, post_id: int) -> bool:
+        """Delete a post and its comments."""
+
+    @abstractmethod
+    def delete_posts_where(
+        self, author: Optional[str] = None, before: Optional[datetime] = None, limit: int = 500
+    ) -> int:
+        """
+        Delete up to limit of the posts matching every given filter (oldest ids first), with
+        their comments, in one transaction. Returns the number of posts deleted; call again
+        until it returns 0. Raises ValueError without any filter.
+        """
+
+    @abstractmethod
+    def get_posts_count(self) -> int:
+        """Get total count of posts."""
+
+    @abstractmethod
+    def add_post_views(self, views: Dict[int, int]) -> None:
+        """Add buffered view counts (post id -> views) to the stored totals; unknown posts are ignored."""
+
+    @abstractmethod
+    def get_changes(self, since: int = 0, limit: int = 100) -> List[Any]:
+        """Get post and comment change log entries after sequence number since, oldest first."""
+
+    @abstractmethod
+    def compact_changes(self, tombstone_retention: float) -> int:
+        """Keep only the latest entry per entity and drop expired tombstones; returns entries removed."""
+
+
+class BaseCommentRepository(ABC):
+    """Comment operations every storage backend provides."""
+
+    @abstractmethod
+    def create_comment(self, comment: CommentCreate, post_id: int) -> Any:
+        """Create a new comment for a post. Raises ValueError if the parent is not a comment on that post."""
+
+    @abstractmethod
+    def get_comment(self, comment_id: int) -> Optional[Any]:
+        """Get a comment by ID."""
+
+    @abstractmethod
+    def get_comments_for_post(self, post_id: int) -> List[Any]:
+        """Get all comments for a specific post."""
+
+    @abstractmethod
+    def get_comment_thread(self, comment_id: int, max_depth: Optional[int] = None) -> List[Any]:
+        """Get a comment and its replies down to max_depth levels below it, in thread order (empty if missing)."""
+
+    @abstractmethod
+    def get_comment_tree(self, post_id: int, max_depth: Optional[int] = None) -> List[Any]:
+        """Get a post's comments down to depth max_depth, in thread order."""
+
+    @abstractmethod
+    def update_comment(self, comment_id: int, comment_update: CommentUpdate) -> Optional[Any]:
+        """Update a comment."""
+
+    @abstractmethod
+    def delete_comment(self, comment_id: int) -> bool:
+        """Delete a comment and all replies below it."""
+
+    @abstractmethod
+    def delete_comments_where(
+        self, author: Optional[str] = None, before: Optional[datetime] = None, limit: int = 500
+    ) -> int:
+        """
+        Delete up to limit of the comments matching every given filter, with their replies, in one
+        transaction. Returns the number of comments deleted, replies included; call again until it
+        returns 0. Raises ValueError without any filter.
+        """
+
+    @abstractmethod
+    def get_comments_count_for_post(self, post_id: int) -> int:
+        """Get count of comments for a specific blog post."""
+
+    @abstractmethod
+    def get_comment_counts(self, post_ids: List[int]) -> Dict[int, int]:
+        """Get the comment counts of several posts at once (post id -> count); posts that do not exist are left out."""
+
+    @abstractmethod
+    def get_comment_activity(self, since: datetime) -> List[Tuple[int, datetime]]:
+        """Get (post_id, created_at) of every comment created at or after since."""
+
+
+class BaseAuthorRepository(ABC):
+    """Per-author feed and statistics operations every storage backend provides."""
+
+    @abstractmethod
+    def get_posts_by_author(
+        self, author: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[Any, int]], Optional[str]]:
+        """Get a page of an author's posts, newest first, with comment counts and the next cursor."""
+
+    @abstractmethod
+    def get_author_stats(self, author: str) -> Optional[Any]:
+        """Get an author's post count, comment count and last activity."""
+
+    @abstractmethod
+    def rebuild_author_stats(self) -> int:
+        """Recompute every author's rollup; returns the number of authors."""
+
+    def ensure_author_stats(self) -> None:
+        """Backfill the rollups if the backend needs it (no-op by default)."""
@@ -0,0 +1,33 @@
+"""
+Storage backend selection.
+
+The rest of the app imports its repositories from here; STORAGE_BACKEND
+chooses between the SQLAlchemy/SQLite backend ("sqlite", the default)
+and the in-memory backend ("memory").
+"""
+from typing import Tuple
+
+from src.core.config import settings
+from src.repositories.base import BaseAuthorRepository, BaseCommentRepository, BasePostRepository
+
+Repositories = Tuple[BasePostRepository, BaseCommentRepository, BaseAuthorRepository]
+
+
+def create_repositories(backend: str) -> Repositories:
+    """Build the post, comment and author repositories of a storage backend."""
+    if backend == "sqlite":
+        from src.repositories.repository import AuthorRepository, CommentRepository, PostRepository
+        return PostRepository(), CommentRepository(), AuthorRepository()
+    if backend == "memory":
+        from src.repositories.memory import (
+            MemoryAuthorRepository,
+            MemoryCommentRepository,
+            MemoryPostRepository,
+            MemoryStore,
+        )
+        store = MemoryStore()
+        return MemoryPostRepository(store), MemoryCommentRepository(store), MemoryAuthorRepository(store)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+post_repository, comment_repository, author_repository = create_repositories(settings.storage_backend)
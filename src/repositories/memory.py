@@ -0,0 +1,490 @@
+"""
+In-memory storage backend.
+
+Posts and comments live in dicts keyed by id, with sorted secondary
+indexes on (created_at, id), post_id, author and comment path so every
+read the API makes is a dict lookup or a bisect plus a slice. Nothing is persisted:
+this backend is meant for ephemeral preview environments, benchmarks
+and fast tests. Select it with STORAGE_BACKEND=memory.
+"""
+import itertools
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
+
+from src.core.rendering import markdown_cache
+from src.core.text_stats import PostStats, post_stats
+from src.models.pydantic_models import PostCreate, PostUpdate, CommentCreate, CommentUpdate
+from src.models.read_models import (
+    AuthorStatsRow,
+    ChangeRow,
+    CommentRow,
+    PostDetailRow,
+    PostExcerptRow,
+    PostListRow,
+    PostLookupRow,
+    PostRow,
+)
+from src.repositories.base import (
+    BaseAuthorRepository,
+    BaseCommentRepository,
+    BasePostRepository,
+    comment_path,
+    decode_cursor,
+    encode_cursor,
+    publish_comment_change,
+    publish_comment_deleted,
+    publish_post_deleted,
+    publish_post_updated,
+    require_bulk_filter,
+    subtree_range,
+)
+
+TimeKey = Tuple[datetime, int]
+
+
+def _now() -> datetime:
+    # Naive UTC, matching what SQLite's CURRENT_TIMESTAMP gives the SQL backend
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _remove_sorted(index: List, key) -> None:
+    position = bisect_left(index, key)
+    if position < len(index) and index[position] == key:
+        del index[position]
+
+
+class MemoryStore:
+    """Tables and secondary indexes shared by the in-memory repositories."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all data and restart id sequences."""
+        with self.lock:
+            self.posts: Dict[int, PostRow] = {}
+            self.comments: Dict[int, CommentRow] = {}
+            # Excerpt and reading stats per post, computed on write
+            self.post_stats: Dict[int, PostStats] = {}
+            self.posts_by_time: List[TimeKey] = []
+            self.posts_by_author: Dict[str, List[TimeKey]] = {}
+            # Comment ids per post, ascending (ids are allocated in increasing order)
+            self.comments_by_post: Dict[int, List[int]] = {}
+            # Comment paths per post, sorted, so a thread is one bisected slice
+            self.comment_paths: Dict[int, List[str]] = {}
+            self.author_stats: Dict[str, AuthorStatsRow] = {}
+            # Change log in sequence order
+            self.changes: List[ChangeRow] = []
+            self.post_ids = itertools.count(1)
+            self.comment_ids = itertools.count(1)
+            self.change_seqs = itertools.count(1)
+
+    def bump_author_stats(self, author: str, posts: int = 0, comments: int = 0, touch: bool = True) -> None:
+        """Apply a delta to an author's rollup. Caller holds the lock."""
+        stats = self.author_stats.get(author) or AuthorStatsRow(author, 0, 0, None)
+        self.author_stats[author] = stats._replace(
+            post_count=stats.post_count + posts,
+            comment_count=stats.comment_count + comments,
+            last_activity_at=_now() if touch else stats.last_activity_at
+        )
+
+    def record_change(self, entity: str, entity_id: int, post_id: int, op: str) -> None:
+        """Append an entry to the change log. Caller holds the lock."""
+        self.changes.append(ChangeRow(next(self.change_seqs), entity, entity_id, post_id, op, _now()))
+
+    def comment_count(self, post_id: int) -> int:
+        return len(self.comments_by_post.get(post_id, ()))
+
+    def thread_ids(self, post_id: int, path: str = "") -> List[int]:
+        """Get the ids of the comments at or below path on a post, in thread order. Caller holds the lock."""
+        paths = self.comment_paths.get(post_id, [])
+        if not path:
+            return [int(entry[-11:-1]) for entry in paths]
+        low, high = subtree_range(path)
+        return [int(entry[-11:-1]) for entry in paths[bisect_left(paths, low):bisect_left(paths, high)]]
+
+    def index_post(self, post: PostRow) -> None:
+        key = (post.created_at, post.id)
+        insort(self.posts_by_time, key)
+        insort(self.posts_by_author.setdefault(post.author, []), key)
+
+    def unindex_post(self, post: PostRow) -> None:
+        key = (post.created_at, post.id)
+        _remove_sorted(self.posts_by_time, key)
+        by_author = self.posts_by_author.get(post.author, [])
+        _remove_sorted(by_author, key)
+        if not by_author:
+            self.posts_by_author.pop(post.author, None)
+
+
+class MemoryPostRepository(BasePostRepository):
+    """In-memory repository for Post operations."""
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    def create_post(self, post: PostCreate) -> PostDetailRow:
+        """Create a new post."""
+        markdown_cache.render(post.content)
+        stats = post_stats(post.content)
+        store = self.store
+        with store.lock:
+            record = PostRow(next(store.post_ids), post.title, post.content, post.author, _now(), None)
+            store.posts[record.id] = record
+            store.post_stats[record.id] = stats
+            store.index_post(record)
+            store.bump_author_stats(record.author, posts=1)
+            store.record_change("post", record.id, record.id, "created")
+        return PostDetailRow(**record._asdict(), comments=[])
+
+    def get_post(self, post_id: int, include_archived: bool = True, coalesce: bool = True) -> Optional[PostDetailRow]:
+        """Get a post by ID with its comments (nothing is ever archived, nor coalesced, in memory)."""
+        store = self.store
+        with store.lock:
+            record = store.posts.get(post_id)
+            if record is None:
+                return None
+            comments = [store.comments[comment_id] for comment_id in store.comments_by_post.get(post_id, ())]
+        return PostDetailRow(**record._asdict(), comments=comments)
+
+    def post_exists(self, post_id: int) -> bool:
+        """Check a post exists."""
+        with self.store.lock:
+            return post_id in self.store.posts
+
+    def get_posts(self, skip: int = 0, limit: int = 10) -> List[PostRow]:
+        """Get multiple posts with pagination."""
+        store = self.store
+        with store.lock:
+            return [store.posts[post_id] for _, post_id in store.posts_by_time[skip:skip + limit]]
+
+    def get_post_list(self, skip: int = 0, limit: int = 10) -> List[PostListRow]:
+        """Get a page of posts with comment counts."""
+        store = self.store
+        with store.lock:
+            return [
+                PostListRow(**store.posts[post_id]._asdict(), comment_count=store.comment_count(post_id))
+                for _, post_id in store.posts_by_time[skip:skip + limit]
+            ]
+
+    def get_post_excerpts(self, skip: int = 0, limit: int = 10) -> List[PostExcerptRow]:
+        """Get a page of posts with excerpts and reading stats."""
+        store = self.store
+        with store.lock:
+            rows = []
+            for _, post_id in store.posts_by_time[skip:skip + limit]:
+                record = store.posts[post_id]
+                rows.append(PostExcerptRow(
+                    record.id, record.title, record.author, record.created_at, record.updated_at,
+                    store.comment_count(post_id), record.view_count, *store.post_stats[post_id]
+                ))
+            return rows
+
+    def get_posts_by_ids(self, post_ids: List[int], include_comments: bool = False) -> List[PostLookupRow]:
+        """Get the posts with the given ids in the requested order, skipping missing ids."""
+        store = self.store
+        rows = []
+        with store.lock:
+            for post_id in dict.fromkeys(post_ids):
+                record = store.posts.get(post_id)
+                if record is None:
+                    continue
+                comment_ids = store.comments_by_post.get(post_id, ())
+                comments = [store.comments[comment_id] for comment_id in comment_ids] if include_comments else None
+                rows.append(PostLookupRow(**record._asdict(), comment_count=len(comment_ids), comments=comments))
+        return rows
+
+    def update_post(self, post_id: int, post_update: PostUpdate) -> Optional[PostDetailRow]:
+        """Update a post."""
+        stats = None
+        if post_update.content is not None:
+            markdown_cache.render(post_update.content)
+            stats = post_stats(post_update.content)
+        store = self.store
+        with store.lock:
+            record = store.posts.get(post_id)
+            if record is None:
+                return None
+            if stats is not None:
+                store.post_stats[post_id] = stats
+
+            updated = record._replace(**post_update.model_dump(exclude_unset=True), updated_at=_now())
+            if updated.author != record.author:
+                store.unindex_post(record)
+                store.index_post(updated)
+                store.bump_author_stats(record.author, posts=-1, touch=False)
+                store.bump_author_stats(updated.author, posts=1)
+            else:
+                store.bump_author_stats(updated.author)
+            store.posts[post_id] = updated
+            store.record_change("post", post_id, post_id, "updated")
+        publish_post_updated(updated)
+        return self.get_post(post_id)
+
+    def delete_post(self, post_id: int) -> bool:
+        """Delete a post and its comments."""
+        store = self.store
+        with store.lock:
+            record = store.posts.pop(post_id, None)
+            if record is None:
+                return False
+
+            store.unindex_post(record)
+            store.post_stats.pop(post_id, None)
+            store.bump_author_stats(record.author, posts=-1, touch=False)
+            comments = [store.comments.pop(comment_id) for comment_id in store.comments_by_post.pop(post_id, ())]
+            store.comment_paths.pop(post_id, None)
+            for author, count in Counter(comment.author for comment in comments).items():
+                store.bump_author_stats(author, comments=-count, touch=False)
+            store.record_change("post", post_id, post_id, "deleted")
+            for comment in comments:
+                store.record_change("comment", comment.id, post_id, "deleted")
+        publish_post_deleted(post_id)
+        return True
+
+    def delete_posts_where(
+        self, author: Optional[str] = None, before: Optional[datetime] = None, limit: int = 500
+    ) -> int:
+        """Delete one chunk of the posts matching the filters, with their comments; returns posts deleted."""
+        require_bulk_filter(author, before)
+        store = self.store
+        with store.lock:
+            keys = store.posts_by_author.get(author, []) if author is not None else store.posts_by_time
+            post_ids = sorted(post_id for created_at, post_id in keys if before is None or created_at < before)
+            return sum(self.delete_post(post_id) for post_id in post_ids[:limit])
+
+    def get_posts_count(self) -> int:
+        """Get total count of posts."""
+        return len(self.store.posts)
+
+    def add_post_views(self, views: Dict[int, int]) -> None:
+        """Add buffered view counts to the stored totals."""
+        store = self.store
+        with store.lock:
+            for post_id, count in views.items():
+                record = store.posts.get(post_id)
+                if record is not None:
+                    store.posts[post_id] = record._replace(view_count=record.view_count + count)
+
+    def get_changes(self, since: int = 0, limit: int = 100) -> List[ChangeRow]:
+        """Get change log entries after sequence number since, oldest first."""
+        store = self.store
+        with store.lock:
+            start = bisect_right(store.changes, since, key=attrgetter("seq"))
+            return store.changes[start:start + limit]
+
+    def compact_changes(self, tombstone_retention: float) -> int:
+        """Keep only the latest entry per entity and drop tombstones older than the retention (seconds)."""
+        store = self.store
+        expired = _now() - timedelta(seconds=tombstone_retention)
+        with store.lock:
+            latest = {(change.entity, change.entity_id): change.seq for change in store.changes}
+            kept = [
+                change for change in store.changes
+                if latest[change.entity, change.entity_id] == change.seq
+                and not (change.op == "deleted" and change.changed_at < expired)
+            ]
+            removed = len(store.changes) - len(kept)
+            store.changes = kept
+        return removed
+
+
+class MemoryCommentRepository(BaseCommentRepository):
+    """In-memory repository for Comment operations."""
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    def create_comment(self, comment: CommentCreate, post_id: int) -> CommentRow:
+        """Create a new comment for a post. Raises ValueError if the parent is not a comment on that post."""
+        store = self.store
+        with store.lock:
+            parent = None
+            if comment.parent_id is not None:
+                parent = store.comments.get(comment.parent_id)
+                if parent is None or parent.post_id != post_id:
+                    raise ValueError("Parent comment not found")
+
+            comment_id = next(store.comment_ids)
+            record = CommentRow(
+                comment_id, post_id, comment.content, comment.author, _now(), None,
+                parent_id=comment.parent_id,
+                path=comment_path(comment_id, parent.path if parent else ""),
+                depth=parent.depth + 1 if parent else 0
+            )
+            store.comments[record.id] = record
+            store.comments_by_post.setdefault(post_id, []).append(record.id)
+            insort(store.comment_paths.setdefault(post_id, []), record.path)
+            store.bump_author_stats(record.author, comments=1)
+            store.record_change("comment", record.id, post_id, "created")
+        publish_comment_change("comment.created", record)
+        return record
+
+    def get_comment(self, comment_id: int) -> Optional[CommentRow]:
+        """Get a comment by ID."""
+        return self.store.comments.get(comment_id)
+
+    def get_comments_for_post(self, post_id: int) -> List[CommentRow]:
+        """Get all comments for a specific post."""
+        store = self.store
+        with store.lock:
+            return [store.comments[comment_id] for comment_id in store.comments_by_post.get(post_id, ())]
+
+    def get_comment_thread(self, comment_id: int, max_depth: Optional[int] = None) -> List[CommentRow]:
+        """Get a comment and its replies in thread order."""
+        store = self.store
+        with store.lock:
+            root = store.comments.get(comment_id)
+            if root is None:
+                return []
+            rows = [store.comments[reply_id] for reply_id in store.thread_ids(root.post_id, root.path)]
+        if max_depth is not None:
+            rows = [row for row in rows if row.depth <= root.depth + max_depth]
+        return rows
+
+    def get_comment_tree(self, post_id: int, max_depth: Optional[int] = None) -> List[CommentRow]:
+        """Get a post's comments in thread order, down to depth max_depth."""
+        store = self.store
+        with store.lock:
+            rows = [store.comments[comment_id] for comment_id in store.thread_ids(post_id)]
+        if max_depth is not None:
+            rows = [row for row in rows if row.depth <= max_depth]
+        return rows
+
+    def update_comment(self, comment_id: int, comment_update: CommentUpdate) -> Optional[CommentRow]:
+        """Update a comment."""
+        store = self.store
+        with store.lock:
+            record = store.comments.get(comment_id)
+            if record is None:
+                return None
+
+            updated = record._replace(**comment_update.model_dump(exclude_unset=True), updated_at=_now())
+            if updated.author != record.author:
+                store.bump_author_stats(record.author, comments=-1, touch=False)
+                store.bump_author_stats(updated.author, comments=1)
+            else:
+                store.bump_author_stats(updated.author)
+            store.comments[comment_id] = updated
+            store.record_change("comment", comment_id, updated.post_id, "updated")
+        publish_comment_change("comment.updated", updated)
+        return updated
+
+    def delete_comment(self, comment_id: int) -> bool:
+        """Delete a comment and all replies below it."""
+        store = self.store
+        with store.lock:
+            record = store.comments.get(comment_id)
+            if record is None:
+                return False
+
+            post_id = record.post_id
+            removed = [store.comments.pop(reply_id) for reply_id in store.thread_ids(post_id, record.path)]
+            siblings, paths = store.comments_by_post[post_id], store.comment_paths[post_id]
+            for reply in removed:
+                _remove_sorted(siblings, reply.id)
+                _remove_sorted(paths, reply.path)
+            if not siblings:
+                del store.comments_by_post[post_id]
+                del store.comment_paths[post_id]
+            for author, count in Counter(reply.author for reply in removed).items():
+                store.bump_author_stats(author, comments=-count, touch=False)
+            for reply in removed:
+                store.record_change("comment", reply.id, post_id, "deleted")
+        for reply in removed:
+            publish_comment_deleted(reply.id, post_id, reply.created_at)
+        return True
+
+    def delete_comments_where(
+        self, author: Optional[str] = None, before: Optional[datetime] = None, limit: int = 500
+    ) -> int:
+        """Delete one chunk of the comments matching the filters, with their replies; returns comments deleted."""
+        require_bulk_filter(author, before)
+        store = self.store
+        with store.lock:
+            roots = sorted(
+                comment.id for comment in store.comments.values()
+                if (author is None or comment.author == author) and (before is None or comment.created_at < before)
+            )
+            remaining = len(store.comments)
+            for comment_id in roots[:limit]:
+                # Already gone if it was a reply to an earlier match
+                if comment_id in store.comments:
+                    self.delete_comment(comment_id)
+            return remaining - len(store.comments)
+
+    def get_comments_count_for_post(self, post_id: int) -> int:
+        """Get count of comments for a specific blog post."""
+        return self.store.comment_count(post_id)
+
+    def get_comment_counts(self, post_ids: List[int]) -> Dict[int, int]:
+        """Get the comment counts of several posts; posts that do not exist are left out."""
+        store = self.store
+        with store.lock:
+            return {post_id: store.comment_count(post_id) for post_id in post_ids if post_id in store.posts}
+
+    def get_comment_activity(self, since: datetime) -> List[Tuple[int, datetime]]:
+        """Get (post_id, created_at) of every comment created at or after since."""
+        with self.store.lock:
+            return [
+                (comment.post_id, comment.created_at)
+                for comment in self.store.comments.values() if comment.created_at >= since
+            ]
+
+
+class MemoryAuthorRepository(BaseAuthorRepository):
+    """In-memory repository for per-author feeds and statistics."""
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    def get_posts_by_author(
+        self, author: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[PostRow, int]], Optional[str]]:
+        """Get a page of an author's posts, newest first. Raises ValueError if the cursor is malformed."""
+        end = None
+        if cursor:
+            created_at, post_id = decode_cursor(cursor)
+            try:
+                end = (datetime.fromisoformat(created_at), post_id)
+            except ValueError:
+                raise ValueError("Invalid cursor")
+
+        store = self.store
+        with store.lock:
+            index = store.posts_by_author.get(author, [])
+            stop = len(index) if end is None else bisect_left(index, end)
+            keys = index[max(stop - limit, 0):stop][::-1]
+            rows = [(store.posts[post_id], store.comment_count(post_id)) for _, post_id in keys]
+            has_more = stop > limit
+
+        next_cursor = None
+        if has_more and keys:
+            created_at, post_id = keys[-1]
+            next_cursor = encode_cursor(created_at.isoformat(), post_id)
+        return rows, next_cursor
+
+    def get_author_stats(self, author: str) -> Optional[AuthorStatsRow]:
+        """Get the maintained rollup for an author."""
+        return self.store.author_stats.get(author)
+
+    def rebuild_author_stats(self) -> int:
+        """Recompute every author's rollup from the stored posts and comments."""
+        store = self.store
+        with store.lock:
+            stats: Dict[str, AuthorStatsRow] = {}
+            for records, field in ((store.posts.values(), "post_count"), (store.comments.values(), "comment_count")):
+                for record in records:
+                    entry = stats.get(record.author) or AuthorStatsRow(record.author, 0, 0, None)
+                    activity = record.updated_at or record.created_at
+                    stats[record.author] = entry._replace(**{
+                        field: getattr(entry, field) + 1,
+                        "last_activity_at": max(filter(None, (entry.last_activity_at, activity))),
+                    })
+            store.author_stats = stats
+            return len(stats)
@@ -1,23 +1,109 @@
-from typing import List, Optional
-from sqlalchemy.orm import joinedload
-from src.core.database import SessionLocal
-from src.models.db_models import Post, Comment
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import String, and_, bindparam, delete, exists, func, insert, or_, select, tuple_, type_coerce, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, aliased, joinedload
+from src.core.config import settings
+from src.core.database import ArchiveSessionLocal, SessionLocal
+from src.core.rendering import markdown_cache
+from src.core.text_stats import post_stats
+from src.core.singleflight import read_coalescer
+from src.models.db_models import Post, Comment, AuthorStats, Change
+from src.models.read_models import ChangeRow, CommentRow, PostExcerptRow, PostListRow, PostLookupRow
 from src.models.pydantic_models import PostCreate, PostUpdate, CommentCreate, CommentUpdate
+from src.repositories.base import (
+    BaseAuthorRepository,
+    BaseCommentRepository,
+    BasePostRepository,
+    comment_path,
+    decode_cursor,
+    encode_cursor,
+    publish_comment_change,
+    publish_comment_deleted,
+    publish_post_deleted,
+    publish_post_updated,
+    require_bulk_filter,
+    subtree_range,
+)
 
+# Columns of a CommentRow, in field order
+_COMMENT_COLUMNS = (
+    Comment.id, Comment.post_id, Comment.content, Comment.author, Comment.created_at,
+    Comment.updated_at, Comment.parent_id, Comment.path, Comment.depth
+)
 
-class PostRepository:
-    """Repository for Post operations with internal session management."""
+
+def _comment_count_subquery():
+    """Correlated count of a post's comments (an index lookup on comments.post_id)."""
+    return (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id)
+        .correlate(Post)
+        .scalar_subquery()
+    )
+
+
+def _fetch_comment_rows(stmt, session_factory=None) -> List[CommentRow]:
+    db = (session_factory or SessionLocal)()
+    try:
+        return [CommentRow._make(row) for row in db.execute(stmt)]
+    finally:
+        db.close()
+
+
+def _bump_author_stats(db: Session, author: str, posts: int = 0, comments: int = 0, touch: bool = True) -> None:
+    """Apply a delta to an author's rollup row within the caller's transaction."""
+    activity = func.now() if touch else None
+    stmt = sqlite_insert(AuthorStats).values(
+        author=author,
+        post_count=max(posts, 0),
+        comment_count=max(comments, 0),
+        last_activity_at=activity
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AuthorStats.author],
+        set_={
+            "post_count": AuthorStats.post_count + posts,
+            "comment_count": AuthorStats.comment_count + comments,
+            "last_activity_at": activity if touch else AuthorStats.last_activity_at,
+        }
+    )
+    db.execute(stmt)
+
+
+def _record_changes(db: Session, entity: str, op: str, entries: List[Tuple[int, int]]) -> None:
+    """Append (entity_id, post_id) entries to the change log within the caller's transaction.
+
+    SQLite serializes writers, so sequence numbers become visible in commit order.
+    """
+    if entries:
+        db.execute(insert(Change), [
+            {"entity": entity, "entity_id": entity_id, "post_id": post_id, "op": op}
+            for entity_id, post_id in entries
+        ])
+
+
+class PostRepository(BasePostRepository):
+    """SQLAlchemy/SQLite repository for Post operations with internal session management."""
 
     def create_post(self, post: PostCreate) -> Post:
         """Create a new post."""
+        # Rendered once per write, outside the transaction, so format=html reads hit the cache
+        html = markdown_cache.render(post.content)
         db = SessionLocal()
         try:
             db_post = Post(
                 title=post.title,
                 content=post.content,
-                author=post.author
+                author=post.author,
+                content_html=html if settings.markdown_persist_html else None,
+                **post_stats(post.content)._asdict()
             )
             db.add(db_post)
+            _bump_author_stats(db, post.author, posts=1)
+            db.flush()
+            _record_changes(db, "post", "created", [(db_post.id, db_post.id)])
             db.commit()
             db.refresh(db_post)
             # Access comments to trigger loading while session is still open
@@ -26,14 +112,39 @@ class PostRepository:
         finally:
             db.close()
 
-    def get_post(self, post_id: int) -> Optional[Post]:
-        """Get a post by ID with eagerly loaded comments."""
-        db = SessionLocal()
+    def get_post(self, post_id: int, include_archived: bool = True, coalesce: bool = True) -> Optional[Post]:
+        """Get a post by ID with eagerly loaded comments, sharing concurrent identical loads.
+
+        Posts missing from the hot database are looked up in the archive, if one is attached.
+        With coalesce=False the load never joins one already in flight, which may have
+        started before the latest write committed.
+        """
+        if coalesce:
+            post = read_coalescer.do(("post", post_id), self._load_post, post_id)
+        else:
+            post = self._load_post(post_id)
+        if post is None and include_archived and ArchiveSessionLocal is not None:
+            if coalesce:
+                post = read_coalescer.do(("archived_post", post_id), self._load_post, post_id, ArchiveSessionLocal)
+            else:
+                post = self._load_post(post_id, ArchiveSessionLocal)
+        return post
+
+    def _load_post(self, post_id: int, session_factory=None) -> Optional[Post]:
+        db = (session_factory or SessionLocal)()
         try:
             return db.query(Post).options(joinedload(Post.comments)).filter(Post.id == post_id).first()
         finally:
             db.close()
 
+    def post_exists(self, post_id: int) -> bool:
+        """Check a post is in the hot database with one primary key lookup."""
+        db = SessionLocal()
+        try:
+            return db.execute(select(exists().where(Post.id == post_id))).scalar()
+        finally:
+            db.close()
+
     def get_posts(self, skip: int = 0, limit: int = 10) -> List[Post]:
         """Get multiple posts with pagination."""
         db = SessionLocal()
@@ -42,22 +153,115 @@ class PostRepository:
         finally:
             db.close()
 
+    def get_post_list(self, skip: int = 0, limit: int = 10) -> List[PostListRow]:
+        """Get a page of posts with comment counts as lightweight rows, in one query."""
+        stmt = (
+            select(
+                Post.id, Post.title, Post.content, Post.author,
+                Post.created_at, Post.updated_at, _comment_count_subquery(), Post.view_count, Post.content_html
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        db = SessionLocal()
+        try:
+            return [PostListRow._make(row) for row in db.execute(stmt)]
+        finally:
+            db.close()
+
+    def get_post_excerpts(self, skip: int = 0, limit: int = 10) -> List[PostExcerptRow]:
+        """Get a page of posts with their stored excerpts and reading stats; content is never read."""
+        stmt = (
+            select(
+                Post.id, Post.title, Post.author, Post.created_at, Post.updated_at,
+                _comment_count_subquery(), Post.view_count,
+                Post.excerpt, Post.word_count, Post.reading_time_minutes
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        db = SessionLocal()
+        try:
+            return [PostExcerptRow._make(row) for row in db.execute(stmt)]
+        finally:
+            db.close()
+
+    def get_posts_by_ids(self, post_ids: List[int], include_comments: bool = False) -> List[PostLookupRow]:
+        """
+        Get the posts with the given ids, in the requested order, as lightweight rows.
+
+        One IN query fetches the posts with their comment counts; with
+        include_comments a second IN query loads all of their comments.
+        Ids missing from the hot database are looked up in the archive, if
+        one is attached; ids that exist in neither are skipped.
+        """
+        post_ids = list(dict.fromkeys(post_ids))
+        if not post_ids:
+            return []
+
+        rows = self._lookup_posts(post_ids, include_comments)
+        missing = [post_id for post_id in post_ids if post_id not in rows]
+        if missing and ArchiveSessionLocal is not None:
+            rows.update(self._lookup_posts(missing, include_comments, ArchiveSessionLocal))
+        return [rows[post_id] for post_id in post_ids if post_id in rows]
+
+    def _lookup_posts(
+        self, post_ids: List[int], include_comments: bool, session_factory=None
+    ) -> Dict[int, PostLookupRow]:
+        posts_stmt = select(
+            Post.id, Post.title, Post.content, Post.author, Post.created_at, Post.updated_at,
+            _comment_count_subquery().label("comment_count"), Post.view_count
+        ).where(Post.id.in_(post_ids))
+        db = (session_factory or SessionLocal)()
+        try:
+            rows = {row[0]: row for row in db.execute(posts_stmt)}
+            comments = {post_id: [] for post_id in rows} if include_comments else None
+            if include_comments and rows:
+                comments_stmt = (
+                    select(*_COMMENT_COLUMNS)
+                    .where(Comment.post_id.in_(list(rows)))
+                    .order_by(Comment.post_id, Comment.id)
+                )
+                for row in db.execute(comments_stmt):
+                    comments[row.post_id].append(CommentRow._make(row))
+        finally:
+            db.close()
+
+        return {
+            post_id: PostLookupRow(**row._mapping, comments=comments[post_id] if comments is not None else None)
+            for post_id, row in rows.items()
+        }
+
     def update_post(self, post_id: int, post_update: PostUpdate) -> Optional[Post]:
         """Update a post."""
+        html = markdown_cache.render(post_update.content) if post_update.content is not None else None
         db = SessionLocal()
         try:
             db_post = db.query(Post).options(joinedload(Post.comments)).filter(Post.id == post_id).first()
             if not db_post:
                 return None
 
+            previous_author = db_post.author
             update_data = post_update.model_dump(exclude_unset=True)
             for field, value in update_data.items():
                 setattr(db_post, field, value)
+            if html is not None:
+                db_post.content_html = html if settings.markdown_persist_html else None
+                for field, value in post_stats(post_update.content)._asdict().items():
+                    setattr(db_post, field, value)
+
+            if db_post.author != previous_author:
+                _bump_author_stats(db, previous_author, posts=-1, touch=False)
+                _bump_author_stats(db, db_post.author, posts=1)
+            else:
+                _bump_author_stats(db, db_post.author)
+            _record_changes(db, "post", "updated", [(post_id, post_id)])
 
             db.commit()
             db.refresh(db_post)
             # Access comments to ensure they're loaded
             _ = db_post.comments
+            publish_post_updated(db_post)
             return db_post
         finally:
             db.close()
@@ -70,12 +274,57 @@ class PostRepository:
             if not db_post:
                 return False
 
+            # The cascade loads the comments anyway, so the rollup costs no extra query
+            _bump_author_stats(db, db_post.author, posts=-1, touch=False)
+            for author, count in Counter(comment.author for comment in db_post.comments).items():
+                _bump_author_stats(db, author, comments=-count, touch=False)
+            _record_changes(db, "post", "deleted", [(post_id, post_id)])
+            _record_changes(db, "comment", "deleted", [(comment.id, post_id) for comment in db_post.comments])
+
             db.delete(db_post)
             db.commit()
+            publish_post_deleted(post_id)
             return True
         finally:
             db.close()
 
+    def delete_posts_where(
+        self, author: Optional[str] = None, before: Optional[datetime] = None, limit: int = 500
+    ) -> int:
+        """Delete one chunk of the posts matching the filters, with their comments; returns posts deleted."""
+        require_bulk_filter(author, before)
+        filters = [Post.author == author] if author is not None else []
+        if before is not None:
+            filters.append(Post.created_at < before)
+        db = SessionLocal()
+        try:
+            posts = db.execute(select(Post.id, Post.author).where(*filters).order_by(Post.id).limit(limit)).all()
+            if not posts:
+                return 0
+            post_ids = [row.id for row in posts]
+            comments = db.execute(
+                select(Comment.id, Comment.author, Comment.post_id).where(Comment.post_id.in_(post_ids))
+            ).all()
+
+            for name, count in Counter(row.author for row in posts).items():
+                _bump_author_stats(db, name, posts=-count, touch=False)
+            for name, count in Counter(row.author for row in comments).items():
+                _bump_author_stats(db, name, comments=-count, touch=False)
+            _record_changes(db, "post", "deleted", [(post_id, post_id) for post_id in post_ids])
+            _record_changes(db, "comment", "deleted", [(row.id, row.post_id) for row in comments])
+
+            db.execute(
+                delete(Comment).where(Comment.post_id.in_(post_ids)).execution_options(synchronize_session=False)
+            )
+            db.execute(delete(Post).where(Post.id.in_(post_ids)).execution_options(synchronize_session=False))
+            db.commit()
+        finally:
+            db.close()
+
+        for post_id in post_ids:
+            publish_post_deleted(post_id)
+        return len(post_ids)
+
     def get_posts_count(self) -> int:
         """Get total count of posts."""
         db = SessionLocal()
@@ -84,41 +333,157 @@ class PostRepository:
         finally:
             db.close()
 
+    def add_post_views(self, views: Dict[int, int]) -> None:
+        """Add buffered view counts to the stored totals in one batched UPDATE."""
+        if not views:
+            return
+        posts = Post.__table__
+        stmt = (
+            update(posts)
+            .where(posts.c.id == bindparam("post_id"))
+            # Keep updated_at: being read is not an edit
+            .values(view_count=posts.c.view_count + bindparam("views"), updated_at=posts.c.updated_at)
+        )
+        db = SessionLocal()
+        try:
+            db.execute(stmt, [{"post_id": post_id, "views": count} for post_id, count in views.items()])
+            db.commit()
+        finally:
+            db.close()
+
+    def get_changes(self, since: int = 0, limit: int = 100) -> List[ChangeRow]:
+        """Get change log entries after sequence number since, oldest first (a primary key range)."""
+        stmt = (
+            select(Change.seq, Change.entity, Change.entity_id, Change.post_id, Change.op, Change.changed_at)
+            .where(Change.seq > since)
+            .order_by(Change.seq)
+            .limit(limit)
+        )
+        db = SessionLocal()
+        try:
+            return [ChangeRow._make(row) for row in db.execute(stmt)]
+        finally:
+            db.close()
+
+    def compact_changes(self, tombstone_retention: float) -> int:
+        """Keep only the latest entry per entity and drop tombstones older than the retention (seconds)."""
+        newer = aliased(Change)
+        superseded = exists().where(
+            newer.entity == Change.entity, newer.entity_id == Change.entity_id, newer.seq > Change.seq
+        )
+        expired = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=tombstone_retention)
+        db = SessionLocal()
+        try:
+            removed = db.execute(delete(Change).where(superseded)).rowcount
+            removed += db.execute(
+                delete(Change).where(Change.op == "deleted", Change.changed_at < expired)
+            ).rowcount
+            db.commit()
+            return removed
+        finally:
+            db.close()
+
 
-class CommentRepository:
-    """Repository for Comment operations with internal session management."""
+class CommentRepository(BaseCommentRepository):
+    """SQLAlchemy/SQLite repository for Comment operations with internal session management."""
 
     def create_comment(self, comment: CommentCreate, post_id: int) -> Comment:
-        """Create a new comment for a post."""
+        """Create a new comment for a post. Raises ValueError if the parent is not a comment on that post."""
         db = SessionLocal()
         try:
+            parent = None
+            if comment.parent_id is not None:
+                parent = db.query(Comment.path, Comment.depth).filter(
+                    Comment.id == comment.parent_id, Comment.post_id == post_id
+                ).first()
+                if parent is None:
+                    raise ValueError("Parent comment not found")
+
             db_comment = Comment(
                 content=comment.content,
                 author=comment.author,
-                post_id=post_id
+                post_id=post_id,
+                parent_id=comment.parent_id,
+                depth=parent.depth + 1 if parent else 0
             )
             db.add(db_comment)
+            # The path ends with the comment's own id, so it is set once the insert assigned one
+            db.flush()
+            db_comment.path = comment_path(db_comment.id, parent.path if parent else "")
+            _bump_author_stats(db, comment.author, comments=1)
+            _record_changes(db, "comment", "created", [(db_comment.id, post_id)])
             db.commit()
             db.refresh(db_comment)
+            publish_comment_change("comment.created", db_comment)
             return db_comment
         finally:
             db.close()
 
     def get_comment(self, comment_id: int) -> Optional[Comment]:
-        """Get a comment by ID."""
-        db = SessionLocal()
+        """Get a comment by ID, looking in the archive if it is not in the hot database."""
+        comment = self._load_comment(comment_id)
+        if comment is None and ArchiveSessionLocal is not None:
+            comment = self._load_comment(comment_id, ArchiveSessionLocal)
+        return comment
+
+    def _load_comment(self, comment_id: int, session_factory=None) -> Optional[Comment]:
+        db = (session_factory or SessionLocal)()
         try:
             return db.query(Comment).filter(Comment.id == comment_id).first()
         finally:
             db.close()
 
-    def get_comments_for_post(self, post_id: int) -> List[Comment]:
-        """Get all comments for a specific post."""
-        db = SessionLocal()
-        try:
-            return db.query(Comment).filter(Comment.post_id == post_id).all()
-        finally:
-            db.close()
+    def get_comments_for_post(self, post_id: int) -> List[CommentRow]:
+        """Get all comments for a specific post, sharing concurrent identical loads.
+
+        A post's comments are archived with it, so when the hot database has
+        none they are looked up in the archive, if one is attached.
+        """
+        comments = read_coalescer.do(("comments", post_id), self._load_comments_for_post, post_id)
+        if not comments and ArchiveSessionLocal is not None:
+            comments = read_coalescer.do(
+                ("archived_comments", post_id), self._load_comments_for_post, post_id, ArchiveSessionLocal
+            )
+        return comments
+
+    def _load_comments_for_post(self, post_id: int, session_factory=None) -> List[CommentRow]:
+        stmt = select(*_COMMENT_COLUMNS).where(Comment.post_id == post_id)
+        return _fetch_comment_rows(stmt, session_factory)
+
+    def get_comment_thread(self, comment_id: int, max_depth: Optional[int] = None) -> List[CommentRow]:
+        """
+        Get a comment and its replies in thread order.
+
+        The root is joined by primary key and its subtree read as one range
+        of ix_comments_post_id_path, however deep or wide the thread is.
+        """
+        root = aliased(Comment)
+        low, high = root.path, func.substr(root.path, 1, func.length(root.path) - 1).concat("0")
+        stmt = (
+            select(*_COMMENT_COLUMNS)
+            .join(root, root.id == comment_id)
+            .where(Comment.post_id == root.post_id, Comment.path >= low, Comment.path < high)
+            .order_by(Comment.path)
+        )
+        if max_depth is not None:
+            stmt = stmt.where(Comment.depth <= root.depth + max_depth)
+        rows = _fetch_comment_rows(stmt)
+        if not rows and ArchiveSessionLocal is not None:
+            rows = _fetch_comment_rows(stmt, ArchiveSessionLocal)
+        return rows
+
+    def get_comment_tree(self, post_id: int, max_depth: Optional[int] = None) -> List[CommentRow]:
+        """Get a post's comments in thread order, down to depth max_depth, from one index scan.
+
+        Falls back to the archive, if one is attached, when the hot database has none.
+        """
+        stmt = select(*_COMMENT_COLUMNS).where(Comment.post_id == post_id).order_by(Comment.path)
+        if max_depth is not None:
+            stmt = stmt.where(Comment.depth <= max_depth)
+        rows = _fetch_comment_rows(stmt)
+        if not rows and ArchiveSessionLocal is not None:
+            rows = _fetch_comment_rows(stmt, ArchiveSessionLocal)
+        return rows
 
     def update_comment(self, comment_id: int, comment_update: CommentUpdate) -> Optional[Comment]:
         """Update a comment."""
@@ -128,30 +493,92 @@ class CommentRepository:
             if not db_comment:
                 return None
 
+            previous_author = db_comment.author
             update_data = comment_update.model_dump(exclude_unset=True)
             for field, value in update_data.items():
                 setattr(db_comment, field, value)
 
+            if db_comment.author != previous_author:
+                _bump_author_stats(db, previous_author, comments=-1, touch=False)
+                _bump_author_stats(db, db_comment.author, comments=1)
+            else:
+                _bump_author_stats(db, db_comment.author)
+            _record_changes(db, "comment", "updated", [(comment_id, db_comment.post_id)])
+
             db.commit()
             db.refresh(db_comment)
+            publish_comment_change("comment.updated", db_comment)
             return db_comment
         finally:
             db.close()
 
     def delete_comment(self, comment_id: int) -> bool:
-        """Delete a comment."""
+        """Delete a comment and all replies below it."""
         db = SessionLocal()
         try:
             db_comment = db.query(Comment).filter(Comment.id == comment_id).first()
             if not db_comment:
                 return False
 
-            db.delete(db_comment)
+            post_id = db_comment.post_id
+            low, high = subtree_range(db_comment.path)
+            in_subtree = (Comment.post_id == post_id, Comment.path >= low, Comment.path < high)
+            removed = db.execute(select(Comment.id, Comment.author, Comment.created_at).where(*in_subtree)).all()
+            for author, count in Counter(row.author for row in removed).items():
+                _bump_author_stats(db, author, comments=-count, touch=False)
+            _record_changes(db, "comment", "deleted", [(row.id, post_id) for row in removed])
+
+            db.execute(delete(Comment).where(*in_subtree).execution_options(synchronize_session=False))
             db.commit()
+            for row in removed:
+                publish_comment_deleted(row.id, post_id, row.created_at)
             return True
         finally:
             db.close()
 
+    def delete_comments_where(
+        self, author: Optional[str] = None, before: Optional[datetime] = None, limit: int = 500
+    ) -> int:
+        """Delete one chunk of the comments matching the filters, with their replies; returns comments deleted."""
+        require_bulk_filter(author, before)
+        filters = [Comment.author == author] if author is not None else []
+        if before is not None:
+            filters.append(Comment.created_at < before)
+        db = SessionLocal()
+        try:
+            roots = db.execute(
+                select(Comment.post_id, Comment.path).where(*filters).order_by(Comment.id).limit(limit)
+            ).all()
+            if not roots:
+                return 0
+
+            # Matches inside another match's subtree go with it
+            subtrees = []
+            for post_id, path in sorted(roots):
+                if subtrees and subtrees[-1][0] == post_id and path.startswith(subtrees[-1][1]):
+                    continue
+                subtrees.append((post_id, path))
+            in_subtrees = or_(*(
+                and_(Comment.post_id == post_id, Comment.path >= low, Comment.path < high)
+                for post_id, (low, high) in ((post_id, subtree_range(path)) for post_id, path in subtrees)
+            ))
+            removed = db.execute(
+                select(Comment.id, Comment.author, Comment.post_id, Comment.created_at).where(in_subtrees)
+            ).all()
+
+            for name, count in Counter(row.author for row in removed).items():
+                _bump_author_stats(db, name, comments=-count, touch=False)
+            _record_changes(db, "comment", "deleted", [(row.id, row.post_id) for row in removed])
+
+            db.execute(delete(Comment).where(in_subtrees).execution_options(synchronize_session=False))
+            db.commit()
+        finally:
+            db.close()
+
+        for row in removed:
+            publish_comment_deleted(row.id, row.post_id, row.created_at)
+        return len(removed)
+
     def get_comments_count_for_post(self, post_id: int) -> int:
         """Get count of comments for a specific blog post."""
         db = SessionLocal()
@@ -160,6 +587,122 @@ class CommentRepository:
         finally:
             db.close()
 
+    def get_comment_counts(self, post_ids: List[int]) -> Dict[int, int]:
+        """
+        Get the comment counts of several posts in one grouped query.
+
+        Posts are left-joined to their comments so posts without comments
+        count 0 and ids that do not exist are left out; the counts come
+        from the comments.post_id index without reading comment rows.
+        Ids missing from the hot database are counted in the archive, if
+        one is attached.
+        """
+        post_ids = list(dict.fromkeys(post_ids))
+        if not post_ids:
+            return {}
+        counts = self._count_comments(post_ids)
+        missing = [post_id for post_id in post_ids if post_id not in counts]
+        if missing and ArchiveSessionLocal is not None:
+            counts.update(self._count_comments(missing, ArchiveSessionLocal))
+        return counts
+
+    def _count_comments(self, post_ids: List[int], session_factory=None) -> Dict[int, int]:
+        stmt = (
+            select(Post.id, func.count(Comment.id))
+            .outerjoin(Comment, Comment.post_id == Post.id)
+            .where(Post.id.in_(post_ids))
+            .group_by(Post.id)
+        )
+        db = (session_factory or SessionLocal)()
+        try:
+            return dict(db.execute(stmt).all())
+        finally:
+            db.close()
+
+    def get_comment_activity(self, since: datetime) -> List[Tuple[int, datetime]]:
+        """Get (post_id, created_at) of every comment created at or after since."""
+        db = SessionLocal()
+        try:
+            return db.execute(
+                select(Comment.post_id, Comment.created_at).where(Comment.created_at >= since)
+            ).all()
+        finally:
+            db.close()
+
+
+class AuthorRepository(BaseAuthorRepository):
+    """SQLAlchemy/SQLite repository for per-author feeds and statistics."""
+
+    def get_posts_by_author(
+        self, author: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[Post, int]], Optional[str]]:
+        """
+        Get a page of an author's posts, newest first, with their comment counts.
+
+        Pages are keyed on (created_at, id) so every page is a single range scan
+        of ix_posts_author_created_at_id, however deep the client has paged.
+        Raises ValueError if the cursor is malformed.
+        """
+        # Compare timestamps as stored so the cursor round-trips exactly
+        created_at = type_coerce(Post.created_at, String)
+        db = SessionLocal()
+        try:
+            query = db.query(Post, created_at, _comment_count_subquery()).filter(Post.author == author)
+            if cursor:
+                query = query.filter(tuple_(created_at, Post.id) < tuple_(*decode_cursor(cursor)))
+            rows = query.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit + 1).all()
+        finally:
+            db.close()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_post, last_created_at, _ = rows[-1]
+            next_cursor = encode_cursor(last_created_at, last_post.id)
+        return [(post, count) for post, _, count in rows], next_cursor
+
+    def get_author_stats(self, author: str) -> Optional[AuthorStats]:
+        """Get the maintained rollup for an author."""
+        db = SessionLocal()
+        try:
+            return db.query(AuthorStats).filter(AuthorStats.author == author).first()
+        finally:
+            db.close()
+
+    def rebuild_author_stats(self) -> int:
+        """Recompute every author's rollup from the posts and comments tables."""
+        db = SessionLocal()
+        try:
+            stats = {}
+            for model, field in ((Post, "post_count"), (Comment, "comment_count")):
+                rows = db.query(
+                    model.author,
+                    func.count(model.id),
+                    func.max(func.coalesce(model.updated_at, model.created_at))
+                ).group_by(model.author).all()
+                for author, count, last_activity in rows:
+                    entry = stats.setdefault(author, AuthorStats(author=author, post_count=0, comment_count=0))
+                    setattr(entry, field, count)
+                    if last_activity and (entry.last_activity_at is None or last_activity > entry.last_activity_at):
+                        entry.last_activity_at = last_activity
+
+            db.query(AuthorStats).delete()
+            db.add_all(stats.values())
+            db.commit()
+            return len(stats)
+        finally:
+            db.close()
+
+    def ensure_author_stats(self) -> None:
+        """Backfill the rollups once for databases created before they existed."""
+        db = SessionLocal()
+        try:
+            missing = (
+                db.query(AuthorStats.author).first() is None
+                and db.query(Post.id).first() is not None
+            )
+        finally:
+            db.close()
+        if missing:
+            self.rebuild_author_stats()
 
-post_repository = PostRepository()
-comment_repository = CommentRepository()
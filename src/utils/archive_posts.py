@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Move old posts and their comments from the hot database into the archive.
+
+The archive is a separate SQLite file (ARCHIVE_DATABASE_PATH) attached to every
+connection, so each batch is copied and deleted in one transaction and
+PostRepository.get_post keeps finding archived posts. Archived content is
+zlib-compressed at the highest level; archived posts are read-only.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import MetaData, delete, exists, func, insert, select
+from sqlalchemy.engine import Engine
+
+from src.core.config import settings
+from src.core.database import ARCHIVE_SCHEMA, create_archive_tables, get_engine
+from src.models.db_models import Comment, Post
+
+posts = Post.__table__
+comments = Comment.__table__
+
+_archive_metadata = MetaData()
+archived_posts = posts.to_metadata(_archive_metadata, schema=ARCHIVE_SCHEMA)
+archived_comments = comments.to_metadata(_archive_metadata, schema=ARCHIVE_SCHEMA)
+
+
+def _candidates(cutoff: datetime, batch_size: int):
+    """Posts created before the cutoff with no comments since, oldest first."""
+    newest_post = select(func.max(posts.c.id)).scalar_subquery()
+    newest_comment = select(func.max(comments.c.id)).scalar_subquery()
+    recent_activity = exists().where(
+        comments.c.post_id == posts.c.id,
+        (comments.c.created_at >= cutoff) | (comments.c.id == newest_comment)
+    )
+    return (
+        select(posts.c.id)
+        # Leaving the newest post and comment in place keeps SQLite from reusing archived ids
+        .where(posts.c.created_at < cutoff, posts.c.id < newest_post, ~recent_activity)
+        .order_by(posts.c.id)
+        .limit(batch_size)
+    )
+
+
+def _copy(source, target, where):
+    columns = [column.name for column in source.columns]
+    values = [
+        func.archive_compress(column) if column.name == "content" and source is posts else column
+        for column in source.columns
+    ]
+    # OR REPLACE makes a batch interrupted between the two files safe to rerun
+    return insert(target).prefix_with("OR REPLACE").from_select(columns, select(*values).where(where))
+
+
+def archive_posts(
+    cutoff: datetime, batch_size: int = 100, pause: float = 0.0, bind: Optional[Engine] = None
+) -> Tuple[int, int]:
+    """Archive posts inactive since the cutoff; returns (posts, comments) moved."""
+    engine = bind or get_engine()
+    create_archive_tables(engine)
+    moved_posts, moved_comments = 0, 0
+    while True:
+        with engine.begin() as connection:
+            post_ids = connection.execute(_candidates(cutoff, batch_size)).scalars().all()
+            if not post_ids:
+                return moved_posts, moved_comments
+            connection.execute(_copy(posts, archived_posts, posts.c.id.in_(post_ids)))
+            connection.execute(_copy(comments, archived_comments, comments.c.post_id.in_(post_ids)))
+            moved_comments += connection.execute(delete(comments).where(comments.c.post_id.in_(post_ids))).rowcount
+            connection.execute(delete(posts).where(posts.c.id.in_(post_ids)))
+
+        moved_posts += len(post_ids)
+        if pause:
+            time.sleep(pause)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=settings.archive_after_days, help="Archive posts inactive for this many days")
+    parser.add_argument("--batch-size", type=int, default=100, help="Posts moved per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the hot database afterwards to shrink the file")
+    args = parser.parse_args()
+
+    if not settings.archive_database_path:
+        parser.error("ARCHIVE_DATABASE_PATH is not set")
+
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=args.days)
+    print(f"🧊 Archiving posts inactive since {cutoff:%Y-%m-%d} into {settings.archive_database_path}")
+    moved_posts, moved_comments = archive_posts(cutoff, batch_size=args.batch_size, pause=args.pause)
+    if args.vacuum:
+        with get_engine().connect() as connection:
+            connection.exec_driver_sql("VACUUM main")
+    print(f"✅ Archived {moved_posts} posts and {moved_comments} comments")
+
+
+if __name__ == "__main__":
+    main()
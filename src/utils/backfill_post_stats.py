@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compute excerpts, word counts and reading times for posts that predate them.
+
+New and edited posts get these on write; this fills in older rows in small
+id-ordered batches so the write lock is never held for long. Pass --all to
+recompute every post, e.g. after changing EXCERPT_LENGTH.
+"""
+import argparse
+import time
+
+from sqlalchemy import bindparam, select, update
+
+from src.core.database import SessionLocal
+from src.core.text_stats import post_stats
+from src.models.db_models import Post
+
+
+def backfill_post_stats(batch_size: int = 200, pause: float = 0.0, recompute: bool = False) -> int:
+    """Store stats for posts missing them (or all posts); returns the number of rows written."""
+    posts = Post.__table__
+    write = (
+        update(posts)
+        .where(posts.c.id == bindparam("post_id"))
+        # Keep updated_at: deriving fields is not an edit
+        .values(
+            excerpt=bindparam("new_excerpt"),
+            word_count=bindparam("new_word_count"),
+            reading_time_minutes=bindparam("new_reading_time_minutes"),
+            updated_at=posts.c.updated_at
+        )
+    )
+    last_id, total = 0, 0
+    while True:
+        query = select(Post.id, Post.content).where(Post.id > last_id).order_by(Post.id).limit(batch_size)
+        if not recompute:
+            query = query.where(Post.word_count.is_(None))
+        db = SessionLocal()
+        try:
+            rows = db.execute(query).all()
+            if not rows:
+                return total
+            db.execute(write, [
+                {"post_id": post_id, **{f"new_{field}": value for field, value in post_stats(content)._asdict().items()}}
+                for post_id, content in rows
+            ])
+            db.commit()
+        finally:
+            db.close()
+
+        last_id = rows[-1].id
+        total += len(rows)
+        if pause:
+            time.sleep(pause)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=200, help="Posts written per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    parser.add_argument("--all", action="store_true", help="Recompute posts that already have stats")
+    args = parser.parse_args()
+
+    print("📝 Computing post excerpts and reading stats")
+    total = backfill_post_stats(batch_size=args.batch_size, pause=args.pause, recompute=args.all)
+    print(f"✅ Updated {total} posts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Online backups of the SQLite database using the SQLite backup API.
+
+The copy is made in small page steps with a pause after each one, so the
+source is only read-locked briefly and live writes slip in between steps.
+Because a write from another connection makes SQLite restart the copy,
+a backup that keeps restarting under heavy write traffic falls back to a
+single-step copy after max_restarts. Backups can be gzip-compressed and
+are always written with a SHA-256 checksum file next to them.
+"""
+import argparse
+import gzip
+import hashlib
+import itertools
+import shutil
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+
+from src.core.config import settings
+
+
+@dataclass
+class BackupResult:
+    """Outcome of one backup run."""
+    id: int
+    status: str = "running"
+    path: Optional[str] = None
+    compressed: bool = False
+    size_bytes: int = 0
+    sha256: Optional[str] = None
+    pages: int = 0
+    steps: int = 0
+    restarts: int = 0
+    duration_seconds: float = 0.0
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    error: Optional[str] = None
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def database_path() -> Path:
+    """Get the path of the configured SQLite database file."""
+    return Path(make_url(settings.database_url).database)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def backup_database(
+    destination: Path,
+    result: BackupResult,
+    pages: int = 64,
+    pause: float = 0.01,
+    compress: bool = False,
+    max_restarts: int = 5,
+    source: Optional[Path] = None,
+) -> BackupResult:
+    """Copy the database to destination in steps of `pages` pages, sleeping `pause` seconds between steps."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    raw_path = destination.with_name(destination.name + ".partial")
+    start = time.perf_counter()
+    last_remaining = None
+
+    def progress(status, remaining, total):
+        nonlocal last_remaining
+        result.steps += 1
+        result.pages = total
+        # The copy starts over when another connection writes to the source
+        if last_remaining is not None and remaining > last_remaining:
+            result.restarts += 1
+            if result.restarts > max_restarts:
+                raise _TooManyRestarts()
+        last_remaining = remaining
+        if remaining and pause:
+            time.sleep(pause)
+
+    # mode=rw so a missing database is an error rather than a new empty file
+    source_conn = sqlite3.connect(f"file:{source or database_path()}?mode=rw", uri=True)
+    try:
+        target_conn = sqlite3.connect(raw_path)
+        try:
+            try:
+                source_conn.backup(target_conn, pages=pages, progress=progress)
+            except _TooManyRestarts:
+                source_conn.backup(target_conn)
+        finally:
+            target_conn.close()
+    finally:
+        source_conn.close()
+
+    if compress:
+        with open(raw_path, "rb") as raw, gzip.open(destination, "wb", compresslevel=6) as packed:
+            shutil.copyfileobj(raw, packed, 1024 * 1024)
+        raw_path.unlink()
+    else:
+        raw_path.replace(destination)
+
+    result.path = str(destination)
+    result.compressed = compress
+    result.size_bytes = destination.stat().st_size
+    result.sha256 = _sha256(destination)
+    destination.with_name(destination.name + ".sha256").write_text(f"{result.sha256}  {destination.name}\n")
+    result.duration_seconds = time.perf_counter() - start
+    result.status = "completed"
+    return result
+
+
+class BackupManager:
+    """Runs one backup at a time in a background thread and remembers recent results."""
+
+    def __init__(self, directory: str, keep: int = 20, source: Optional[Path] = None):
+        self.directory = Path(directory)
+        self.keep = keep
+        self.source = source
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._results: Dict[int, BackupResult] = {}
+        self._running: Optional[BackupResult] = None
+
+    def start(self, compress: bool = False, pages: int = 64, pause: float = 0.01) -> Optional[BackupResult]:
+        """Start a backup; returns None if one is already running."""
+        with self._lock:
+            if self._running is not None:
+                return None
+            result = self._running = BackupResult(id=next(self._ids))
+            self._results[result.id] = result
+            for stale in sorted(self._results)[:-self.keep]:
+                del self._results[stale]
+
+        name = f"blog-{result.started_at:%Y%m%dT%H%M%S}-{result.id}.db" + (".gz" if compress else "")
+        thread = threading.Thread(
+            target=self._run, args=(result, self.directory / name, compress, pages, pause),
+            name="backup", daemon=True
+        )
+        thread.start()
+        return result
+
+    def _run(self, result: BackupResult, destination: Path, compress: bool, pages: int, pause: float) -> None:
+        try:
+            backup_database(destination, result, pages=pages, pause=pause, compress=compress, source=self.source)
+        except Exception as exc:
+            result.status = "failed"
+            result.error = str(exc)
+        finally:
+            with self._lock:
+                self._running = None
+
+    def get(self, backup_id: int) -> Optional[BackupResult]:
+        return self._results.get(backup_id)
+
+    def list(self) -> List[BackupResult]:
+        return [self._results[backup_id] for backup_id in sorted(self._results, reverse=True)]
+
+
+backup_manager = BackupManager(settings.backup_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back up the blog database while it is in use.")
+    parser.add_argument("destination", nargs="?", help="Backup file (default: BACKUP_DIR/blog-<timestamp>.db)")
+    parser.add_argument("--compress", action="store_true", help="gzip the backup")
+    parser.add_argument("--pages", type=int, default=64, help="Pages copied per step")
+    parser.add_argument("--pause", type=float, default=0.01, help="Seconds to sleep between steps")
+    args = parser.parse_args()
+
+    result = BackupResult(id=0)
+    default_name = f"blog-{result.started_at:%Y%m%dT%H%M%S}.db" + (".gz" if args.compress else "")
+    destination = Path(args.destination or Path(settings.backup_dir) / default_name)
+
+    print(f"💾 Backing up {database_path()} to {destination}...")
+    backup_database(destination, result, pages=args.pages, pause=args.pause, compress=args.compress)
+    print(
+        f"✅ Backup completed: {result.size_bytes / 1024:.0f} KiB in {result.duration_seconds:.2f}s "
+        f"({result.steps} steps, {result.restarts} restarts)\n   sha256 {result.sha256}"
+    )
+
+
+if __name__ == "__main__":
+    main()
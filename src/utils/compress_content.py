@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Rewrite existing post content with the configured compression settings.
+
+Runs in small id-ordered batches so the write lock is never held for long.
+With CONTENT_COMPRESSION=none it decompresses everything back to plain text.
+"""
+import argparse
+import os
+import time
+
+from sqlalchemy import bindparam, select, update
+
+from src.core.database import SessionLocal, get_engine
+from src.models.db_models import Post, content_compressor
+
+
+def recompress_posts(batch_size: int = 200, pause: float = 0.0) -> int:
+    """Re-encode every post's content; returns the number of rows rewritten."""
+    posts = Post.__table__
+    rewrite = (
+        update(posts)
+        .where(posts.c.id == bindparam("post_id"))
+        # Keep updated_at: re-encoding is not an edit
+        .values(content=bindparam("new_content", type_=posts.c.content.type), updated_at=posts.c.updated_at)
+    )
+    last_id, total = 0, 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(Post.id, Post.content).where(Post.id > last_id).order_by(Post.id).limit(batch_size)
+            ).all()
+            if not rows:
+                return total
+            db.execute(rewrite, [{"post_id": post_id, "new_content": content} for post_id, content in rows])
+            db.commit()
+        finally:
+            db.close()
+
+        last_id = rows[-1].id
+        total += len(rows)
+        if pause:
+            time.sleep(pause)
+
+
+def database_size() -> int:
+    """Get the size in bytes of the database file."""
+    return os.path.getsize(get_engine().url.database)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=200, help="Posts rewritten per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to return freed pages to the OS")
+    args = parser.parse_args()
+
+    print(f"🗜️  Rewriting post content (codec={content_compressor.codec}, threshold={content_compressor.threshold} B)")
+    before = database_size()
+    total = recompress_posts(batch_size=args.batch_size, pause=args.pause)
+    if args.vacuum:
+        with get_engine().connect() as connection:
+            connection.exec_driver_sql("VACUUM")
+    after = database_size()
+    print(f"✅ Rewrote {total} posts; database file {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
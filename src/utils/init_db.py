@@ -3,7 +3,7 @@
 Database initialization script for the blog API.
 """
 from src.core.database import create_tables, reset_database
-from src.repositories.repository import post_repository, comment_repository
+from src.repositories.factory import post_repository, comment_repository
 from src.models.pydantic_models import PostCreate, CommentCreate
 
 
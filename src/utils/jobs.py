@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Background jobs for bulk deletes.
+
+POST /admin/jobs queues a job on a small thread pool instead of making
+clients call DELETE once per row. A job works through its rows in chunks
+of JOB_CHUNK_SIZE, each chunk one short transaction, and sleeps
+JOB_CHUNK_PAUSE_SECONDS between chunks so API writes get the write lock
+in between. With the sqlite backend every job's progress is saved to the
+jobs table after each chunk; jobs cut short by a restart are picked up by
+resume(), which is safe because each chunk deletes whatever still matches.
+"""
+import argparse
+import itertools
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Engine
+
+from src.core.config import settings
+from src.core.database import get_engine
+from src.models.db_models import Job
+from src.repositories.base import BaseCommentRepository, BasePostRepository
+from src.repositories.factory import comment_repository, post_repository
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("delete_posts", "delete_comments")
+
+
+def _now() -> datetime:
+    # Naive UTC, like the timestamps SQLite stores
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_cutoff(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    cutoff = datetime.fromisoformat(value)
+    return cutoff.astimezone(timezone.utc).replace(tzinfo=None) if cutoff.tzinfo else cutoff
+
+
+@dataclass
+class JobResult:
+    """State and progress of one job."""
+    id: int
+    kind: str
+    params: Dict[str, Any]
+    status: str = "queued"
+    processed: int = 0
+    chunks: int = 0
+    created_at: datetime = field(default_factory=_now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def duration_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return ((self.finished_at or _now()) - self.started_at).total_seconds()
+
+    @property
+    def rows_per_second(self) -> float:
+        duration = self.duration_seconds
+        return round(self.processed / duration, 1) if duration > 0 else 0.0
+
+
+class JobRunner:
+    """Runs bulk delete jobs on a thread pool in chunked transactions and tracks their progress."""
+
+    def __init__(
+        self,
+        posts: BasePostRepository,
+        comments: BaseCommentRepository,
+        workers: int = 1,
+        chunk_size: int = 200,
+        pause: float = 0.05,
+        persist: bool = False,
+        bind: Optional[Engine] = None,
+        keep: int = 100
+    ):
+        self.posts = posts
+        self.comments = comments
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.persist = persist
+        self.bind = bind
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, JobResult] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping = threading.Event()
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> JobResult:
+        """Queue a job. Raises ValueError for an unknown kind."""
+        job = self._new(kind, params)
+        self._enqueue(job)
+        return job
+
+    def run(self, kind: str, params: Dict[str, Any]) -> JobResult:
+        """Run a job to the end in the calling thread. Raises ValueError for an unknown kind."""
+        job = self._new(kind, params)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._run(job)
+        return job
+
+    def resume(self) -> int:
+        """Queue again the saved jobs a previous process did not finish; returns how many."""
+        if not self.persist:
+            return 0
+        with self._engine().connect() as connection:
+            rows = connection.execute(
+                select(Job).where(Job.status.in_(("queued", "running"))).order_by(Job.id)
+            ).all()
+        for row in rows:
+            job = self._from_row(row)
+            job.status = "queued"
+            self._enqueue(job)
+        return len(rows)
+
+    def stop(self) -> None:
+        """Stop after the current chunks; unfinished jobs stay queued for resume()."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            self._stopping.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._stopping.clear()
+
+    def get(self, job_id: int) -> Optional[JobResult]:
+        """Get a job of this process, or a saved one."""
+        job = self._jobs.get(job_id)
+        if job is None and self.persist:
+            with self._engine().connect() as connection:
+                row = connection.execute(select(Job).where(Job.id == job_id)).first()
+            job = self._from_row(row) if row else None
+        return job
+
+    def list(self, limit: int = 20) -> List[JobResult]:
+        """Get recent jobs, newest first."""
+        if not self.persist:
+            return [self._jobs[job_id] for job_id in sorted(self._jobs, reverse=True)[:limit]]
+        with self._engine().connect() as connection:
+            rows = connection.execute(select(Job).order_by(Job.id.desc()).limit(limit)).all()
+        # Jobs running here have fresher progress than their last saved chunk
+        return [self._jobs.get(row.id) or self._from_row(row) for row in rows]
+
+    def _new(self, kind: str, params: Dict[str, Any]) -> JobResult:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = JobResult(id=0, kind=kind, params=params)
+        job.id = self._insert(job) if self.persist else next(self._ids)
+        return job
+
+    def _enqueue(self, job: JobResult) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            for stale in sorted(self._jobs)[:-self.keep]:
+                if self._jobs[stale].status not in ("queued", "running"):
+                    del self._jobs[stale]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+            self._executor.submit(self._run, job)
+
+    def _run(self, job: JobResult) -> None:
+        delete = self.posts.delete_posts_where if job.kind == "delete_posts" else self.comments.delete_comments_where
+        job.status = "running"
+        job.started_at = job.started_at or _now()
+        self._save(job)
+        try:
+            author, before = job.params.get("author"), _parse_cutoff(job.params.get("before"))
+            while not self._stopping.is_set():
+                deleted = delete(author=author, before=before, limit=self.chunk_size)
+                if not deleted:
+                    job.status = "completed"
+                    break
+                job.processed += deleted
+                job.chunks += 1
+                self._save(job)
+                if self.pause:
+                    time.sleep(self.pause)
+            else:
+                job.status = "queued"
+        except Exception as exc:
+            logger.exception("Job %d (%s) failed", job.id, job.kind)
+            job.status = "failed"
+            job.error = str(exc)
+        if job.status != "queued":
+            job.finished_at = _now()
+        self._save(job)
+
+    def _engine(self) -> Engine:
+        return self.bind or get_engine()
+
+    def _insert(self, job: JobResult) -> int:
+        with self._engine().begin() as connection:
+            return connection.execute(
+                insert(Job).values(
+                    kind=job.kind, params=json.dumps(job.params), status=job.status, created_at=job.created_at
+                )
+            ).inserted_primary_key[0]
+
+    def _save(self, job: JobResult) -> None:
+        if not self.persist:
+            return
+        with self._engine().begin() as connection:
+            connection.execute(
+                update(Job).where(Job.id == job.id).values(
+                    status=job.status, processed=job.processed, chunks=job.chunks, error=job.error,
+                    started_at=job.started_at, finished_at=job.finished_at
+                )
+            )
+
+    @staticmethod
+    def _from_row(row) -> JobResult:
+        return JobResult(
+            id=row.id, kind=row.kind, params=json.loads(row.params), status=row.status,
+            processed=row.processed, chunks=row.chunks, created_at=row.created_at,
+            started_at=row.started_at, finished_at=row.finished_at, error=row.error
+        )
+
+
+job_runner = JobRunner(
+    post_repository,
+    comment_repository,
+    workers=settings.job_workers,
+    chunk_size=settings.job_chunk_size,
+    pause=settings.job_chunk_pause_seconds,
+    persist=settings.storage_backend == "sqlite"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a bulk delete job in the foreground.")
+    parser.add_argument("kind", choices=JOB_KINDS)
+    parser.add_argument("--author", help="Only rows written by this author")
+    parser.add_argument("--before", help="Only rows created before this ISO timestamp (UTC if no offset)")
+    parser.add_argument("--chunk-size", type=int, default=settings.job_chunk_size, help="Rows per transaction")
+    parser.add_argument("--pause", type=float, default=settings.job_chunk_pause_seconds, help="Seconds between chunks")
+    args = parser.parse_args()
+    if args.author is None and args.before is None:
+        parser.error("pass --author, --before or both")
+
+    runner = JobRunner(post_repository, comment_repository, chunk_size=args.chunk_size, pause=args.pause)
+    params = {key: value for key, value in (("author", args.author), ("before", args.before)) if value is not None}
+    job = runner.run(args.kind, params)
+    print(f"🧹 {job.kind}: {job.status}, {job.processed} rows in {job.chunks} chunks ({job.rows_per_second} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
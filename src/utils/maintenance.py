@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Routine SQLite maintenance: planner statistics, free pages and the WAL.
+
+After bulk deletes the database file keeps its dead pages, and the planner
+statistics in sqlite_stat1 go stale. A maintenance pass runs PRAGMA
+optimize and an ANALYZE capped by analysis_limit. It then hands free pages
+back to the filesystem with incremental vacuum, a few hundred pages per
+statement, and checkpoints the WAL without blocking readers or writers.
+Each step is short and first asks is_quiet(), so the scheduler in
+src/main.py only works while the API is idle and backs off as soon as
+traffic picks up.
+
+Incremental vacuum needs auto_vacuum=INCREMENTAL. The engine asks for it
+on every connection (see configure_sqlite), but a database file created
+without it keeps auto_vacuum=NONE until it is rebuilt once with --convert.
+"""
+import argparse
+import itertools
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.engine import Connection, Engine
+
+from src.core.config import settings
+from src.core.database import get_engine
+
+_AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+_CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+
+@dataclass
+class DatabaseStats:
+    """Size and free space of the database file as SQLite reports them."""
+    path: str
+    file_size_bytes: int
+    wal_size_bytes: int
+    page_size: int
+    page_count: int
+    freelist_count: int
+    auto_vacuum: str
+    journal_mode: str
+
+
+@dataclass
+class MaintenanceResult:
+    """Outcome of one maintenance pass."""
+    id: int
+    status: str = "running"
+    optimized: bool = False
+    analyzed: bool = False
+    vacuumed_pages: int = 0
+    checkpointed_pages: int = 0
+    before: Optional[DatabaseStats] = None
+    after: Optional[DatabaseStats] = None
+    duration_seconds: float = 0.0
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    error: Optional[str] = None
+
+
+class _NotQuiet(Exception):
+    pass
+
+
+def _stats(connection: Connection) -> DatabaseStats:
+    def pragma(name):
+        return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+    # database_list lists main first; its file is "" for in-memory databases
+    path = connection.exec_driver_sql("PRAGMA database_list").first()[2]
+    page_size, page_count = pragma("page_size"), pragma("page_count")
+    wal_path = f"{path}-wal"
+    return DatabaseStats(
+        path=path,
+        file_size_bytes=os.path.getsize(path) if path else page_size * page_count,
+        wal_size_bytes=os.path.getsize(wal_path) if path and os.path.exists(wal_path) else 0,
+        page_size=page_size,
+        page_count=page_count,
+        freelist_count=pragma("freelist_count"),
+        auto_vacuum=_AUTO_VACUUM_MODES.get(pragma("auto_vacuum"), "unknown"),
+        journal_mode=pragma("journal_mode"),
+    )
+
+
+def database_stats(bind: Optional[Engine] = None) -> DatabaseStats:
+    """Get the file size, free pages and WAL size of the database."""
+    with (bind or get_engine()).connect() as connection:
+        return _stats(connection)
+
+
+def run_maintenance(
+    result: MaintenanceResult,
+    bind: Optional[Engine] = None,
+    analyze: bool = True,
+    analysis_limit: int = 1000,
+    vacuum_step_pages: int = 256,
+    max_vacuum_pages: Optional[int] = None,
+    pause: float = 0.05,
+    checkpoint: str = "PASSIVE",
+    is_quiet: Optional[Callable[[], bool]] = None,
+) -> MaintenanceResult:
+    """
+    Run one maintenance pass, recording what it did in result.
+
+    Stops with status "deferred" at the first step where is_quiet() returns
+    False; whatever was done until then stays done.
+    """
+    if checkpoint.upper() not in _CHECKPOINT_MODES:
+        raise ValueError(f"Unknown checkpoint mode: {checkpoint}")
+    start = time.perf_counter()
+
+    def check():
+        if is_quiet is not None and not is_quiet():
+            raise _NotQuiet()
+
+    # Every PRAGMA commits on its own, so no step holds the write lock past its statement
+    with (bind or get_engine()).connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        def execute(sql):
+            rows = connection.exec_driver_sql(sql)
+            return rows.fetchall() if rows.returns_rows else []
+
+        result.before = _stats(connection)
+        try:
+            check()
+            execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+            execute("PRAGMA optimize")
+            result.optimized = True
+
+            if analyze:
+                check()
+                execute("ANALYZE")
+                result.analyzed = True
+
+            if result.before.auto_vacuum == "incremental":
+                free = result.before.freelist_count
+                while free and (max_vacuum_pages is None or result.vacuumed_pages < max_vacuum_pages):
+                    check()
+                    # incremental_vacuum frees one page per step, and sqlite3's execute() only
+                    # steps a statement without result columns once; executescript() runs it out
+                    connection.connection.driver_connection.executescript(
+                        f"PRAGMA incremental_vacuum({int(vacuum_step_pages)})"
+                    )
+                    remaining = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+                    if remaining >= free:
+                        break
+                    result.vacuumed_pages += free - remaining
+                    free = remaining
+                    if pause:
+                        time.sleep(pause)
+
+            if result.before.journal_mode == "wal":
+                check()
+                _busy, _log, checkpointed = execute(f"PRAGMA wal_checkpoint({checkpoint.upper()})")[0]
+                result.checkpointed_pages = max(checkpointed, 0)
+            result.status = "completed"
+        except _NotQuiet:
+            result.status = "deferred"
+
+        result.after = _stats(connection)
+    result.duration_seconds = round(time.perf_counter() - start, 3)
+    return result
+
+
+def convert_to_incremental(bind: Optional[Engine] = None) -> DatabaseStats:
+    """Rebuild the database with auto_vacuum=INCREMENTAL; blocks writers for the whole VACUUM."""
+    with (bind or get_engine()).connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        connection.exec_driver_sql("VACUUM")
+        return _stats(connection)
+
+
+class DatabaseMaintainer:
+    """Runs one maintenance pass at a time and remembers recent results."""
+
+    def __init__(
+        self,
+        bind: Optional[Engine] = None,
+        analysis_limit: int = 1000,
+        vacuum_step_pages: int = 256,
+        pause: float = 0.05,
+        keep: int = 20
+    ):
+        self.bind = bind
+        self.analysis_limit = analysis_limit
+        self.vacuum_step_pages = vacuum_step_pages
+        self.pause = pause
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._running = threading.Lock()
+        self._ids = itertools.count(1)
+        self._results: Dict[int, MaintenanceResult] = {}
+
+    def run(self, is_quiet: Optional[Callable[[], bool]] = None) -> Optional[MaintenanceResult]:
+        """Run a maintenance pass in the calling thread; returns None if one is already running."""
+        if not self._running.acquire(blocking=False):
+            return None
+        try:
+            with self._lock:
+                result = MaintenanceResult(id=next(self._ids))
+                self._results[result.id] = result
+                for stale in sorted(self._results)[:-self.keep]:
+                    del self._results[stale]
+            try:
+                run_maintenance(
+                    result,
+                    bind=self.bind,
+                    analysis_limit=self.analysis_limit,
+                    vacuum_step_pages=self.vacuum_step_pages,
+                    pause=self.pause,
+                    is_quiet=is_quiet
+                )
+            except Exception as exc:
+                result.status = "failed"
+                result.error = str(exc)
+            return result
+        finally:
+            self._running.release()
+
+    def stats(self) -> DatabaseStats:
+        return database_stats(self.bind)
+
+    def list(self) -> List[MaintenanceResult]:
+        return [self._results[result_id] for result_id in sorted(self._results, reverse=True)]
+
+
+database_maintainer = DatabaseMaintainer(
+    analysis_limit=settings.maintenance_analysis_limit,
+    vacuum_step_pages=settings.maintenance_vacuum_step_pages,
+    pause=settings.maintenance_pause_seconds
+)
+
+
+def _print_stats(label: str, stats: DatabaseStats) -> None:
+    print(
+        f"   {label}: {stats.file_size_bytes:,} bytes, {stats.freelist_count:,} free pages, "
+        f"WAL {stats.wal_size_bytes:,} bytes (auto_vacuum={stats.auto_vacuum}, journal_mode={stats.journal_mode})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--convert", action="store_true",
+                        help="Rebuild the file once with auto_vacuum=INCREMENTAL (full VACUUM, blocks writes)")
+    parser.add_argument("--no-analyze", action="store_true", help="Only run PRAGMA optimize")
+    parser.add_argument("--vacuum-pages", type=int, default=None, help="Free at most this many pages")
+    parser.add_argument("--step-pages", type=int, default=settings.maintenance_vacuum_step_pages,
+                        help="Pages freed per incremental vacuum statement")
+    parser.add_argument("--pause", type=float, default=settings.maintenance_pause_seconds,
+                        help="Seconds to sleep between vacuum steps")
+    parser.add_argument("--truncate", action="store_true", help="Checkpoint with TRUNCATE to shrink the WAL file")
+    parser.add_argument("--stats", action="store_true", help="Only print the database stats")
+    args = parser.parse_args()
+
+    print("🔧 SQLite maintenance")
+    if args.stats:
+        _print_stats("now", database_stats())
+        return
+    if args.convert:
+        _print_stats("converted", convert_to_incremental())
+
+    result = run_maintenance(
+        MaintenanceResult(id=1),
+        analyze=not args.no_analyze,
+        analysis_limit=settings.maintenance_analysis_limit,
+        vacuum_step_pages=args.step_pages,
+        max_vacuum_pages=args.vacuum_pages,
+        pause=args.pause,
+        checkpoint="TRUNCATE" if args.truncate else "PASSIVE"
+    )
+    _print_stats("before", result.before)
+    _print_stats("after", result.after)
+    print(
+        f"✅ {result.status} in {result.duration_seconds}s: {result.vacuumed_pages} pages freed, "
+        f"{result.checkpointed_pages} WAL pages checkpointed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Unit tests for queued logging and sampled JSON access logs.
+"""
+import json
+import logging
+import queue
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.core.access_log import (
+    ACCESS_LOGGER,
+    AccessLogFormatter,
+    AccessLogger,
+    DroppingQueueHandler,
+    RequestIdFilter,
+    access_logger,
+)
+from src.core.runtime import RuntimeMonitor
+from src.main import app
+from src.models.pydantic_models import PostCreate
+from src.repositories.factory import create_repositories
+
+
+class TestAccessLogSelection(unittest.TestCase):
+    """Test which requests are logged."""
+
+    def test_errors_and_slow_requests_are_always_logged(self):
+        """Test sampling only thins out ordinary requests."""
+        logger = AccessLogger(sample_rate=0, slow_ms=100)
+
+        self.assertIsNone(logger.reason(200, 5))
+        self.assertEqual(logger.reason(503, 5), "error")
+        self.assertEqual(logger.reason(None, 5), "error")
+        self.assertEqual(logger.reason(200, 5, failed=True), "error")
+        self.assertEqual(logger.reason(404, 150), "slow")
+        self.assertEqual(AccessLogger(sample_rate=1).reason(200, 5), "sampled")
+
+    def test_sample_rate(self):
+        """Test a fraction of ordinary requests is logged."""
+        logger = AccessLogger(sample_rate=0.25)
+
+        with patch("src.core.access_log.random.random", side_effect=[0.1, 0.5]):
+            self.assertEqual(logger.reason(200, 5), "sampled")
+            self.assertIsNone(logger.reason(200, 5))
+
+
+class TestQueuedLogging(unittest.TestCase):
+    """Test the queue handler and request id tagging."""
+
+    def test_full_queue_drops_records(self):
+        """Test records are dropped and counted, never blocking, once the queue is full."""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        record = logging.LogRecord("app", logging.INFO, __file__, 1, "hello", None, None)
+
+        handler.handle(record)
+        handler.handle(record)
+
+        self.assertEqual((handler.queue.qsize(), handler.dropped), (1, 1))
+
+    def test_records_carry_the_request_id(self):
+        """Test log lines written while serving a request are tagged with its id."""
+        monitor = RuntimeMonitor()
+        record = logging.LogRecord("app", logging.INFO, __file__, 1, "hello", None, None)
+        outside = logging.LogRecord("app", logging.INFO, __file__, 1, "hello", None, None)
+
+        trace, token = monitor.begin_request("GET", "/posts", "/posts", "req-1")
+        RequestIdFilter().filter(record)
+        monitor.end_request(trace, token, 0)
+        RequestIdFilter().filter(outside)
+
+        self.assertEqual((record.request_id, outside.request_id), ("req-1", "-"))
+
+
+class TestAccessLogRoute(unittest.TestCase):
+    """Test access log lines written for requests on the in-memory backend."""
+
+    def setUp(self):
+        posts, comments, authors = create_repositories("memory")
+        for name, repository in (
+            ("post_repository", posts), ("comment_repository", comments), ("author_repository", authors)
+        ):
+            patcher = patch(f"src.api.routes.{name}", repository)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+        self.post = posts.create_post(PostCreate(title="T", content="C", author="A"))
+
+    def test_json_line_with_request_id(self):
+        """Test the client's X-Request-ID is echoed and logged with the request's timings."""
+        with patch.object(access_logger, "sample_rate", 1.0), self.assertLogs(ACCESS_LOGGER) as logs:
+            response = self.client.get(f"/posts/{self.post.id}", headers={"X-Request-ID": "trace-42"})
+
+        self.assertEqual(response.headers["x-request-id"], "trace-42")
+        line = json.loads(AccessLogFormatter().format(logs.records[0]))
+        self.assertEqual(
+            (line["request_id"], line["route"], line["status"], line["reason"]),
+            ("trace-42", "/posts/{post_id}", 200, "sampled")
+        )
+        for field in ("ts", "duration_ms", "db_ms", "statements", "loop_db_ms"):
+            self.assertIn(field, line)
+
+    def test_generated_request_id(self):
+        """Test requests without a usable X-Request-ID get a generated one."""
+        for headers in ({}, {"X-Request-ID": "x" * 500}):
+            response = self.client.get("/health/ready", headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.headers["x-request-id"]), 32)
+
+
+if __name__ == '__main__':
+    unittest.main()
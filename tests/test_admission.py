@@ -0,0 +1,86 @@
+"""
+Unit tests for admission control and load shedding.
+"""
+import asyncio
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.admission import AdmissionControlMiddleware, AdmissionController, RouteLimiter
+
+
+class TestRouteLimiter(unittest.IsolatedAsyncioTestCase):
+    """Test cases for RouteLimiter."""
+
+    async def test_queue_and_handoff(self):
+        """Test a queued request gets the slot released by a finished one."""
+        limiter = RouteLimiter(limit=1, max_queue=1)
+        self.assertTrue(await limiter.acquire(timeout=1))
+
+        waiter = asyncio.ensure_future(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.waiting, 1)
+
+        limiter.release()
+        self.assertTrue(await waiter)
+        self.assertEqual(limiter.active, 1)
+        limiter.release()
+        self.assertEqual(limiter.active, 0)
+
+    async def test_full_queue_rejects_immediately(self):
+        """Test requests beyond limit plus queue are shed without waiting."""
+        limiter = RouteLimiter(limit=1, max_queue=0)
+        self.assertTrue(await limiter.acquire(timeout=1))
+        self.assertFalse(await limiter.acquire(timeout=1))
+        self.assertEqual(limiter.rejected, 1)
+
+    async def test_queue_timeout_rejects(self):
+        """Test a queued request gives up after the queue timeout."""
+        limiter = RouteLimiter(limit=1, max_queue=4)
+        await limiter.acquire(timeout=1)
+
+        self.assertFalse(await limiter.acquire(timeout=0.01))
+        self.assertEqual(limiter.waiting, 0)
+
+
+class TestAdmissionControlMiddleware(unittest.TestCase):
+    """Test cases for AdmissionControlMiddleware."""
+
+    def setUp(self):
+        """Set up an app whose write budget is already exhausted."""
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def read_item(item_id: int):
+            return {"id": item_id}
+
+        @app.post("/items")
+        async def create_item():
+            return {"id": 1}
+
+        self.controller = AdmissionController(
+            read_limit=2, read_queue=2, write_limit=1, write_queue=0, queue_timeout=0.1, retry_after=3
+        )
+        self.controller.limiter_for("POST", "/items").active = 1
+        app.add_middleware(AdmissionControlMiddleware, controller=self.controller)
+        self.client = TestClient(app)
+
+    def test_saturated_route_returns_503(self):
+        """Test a saturated route is shed with Retry-After."""
+        response = self.client.post("/items")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["retry-after"], "3")
+
+    def test_reads_use_separate_budget(self):
+        """Test reads are admitted while writes are saturated."""
+        response = self.client.get("/items/1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.controller.stats()["GET /items/{item_id}"]["admitted"], 1)
+        self.assertEqual(self.controller.stats()["GET /items/{item_id}"]["active"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ from fastapi import status
 
 from src.main import app
 from src.models.db_models import Post, Comment
+from src.models.read_models import PostListRow
 
 
 class TestPostRoutes(unittest.TestCase):
@@ -27,6 +28,7 @@ class TestPostRoutes(unittest.TestCase):
         mock_post.author = "Test Author"
         mock_post.created_at = "2024-01-01T12:00:00"
         mock_post.updated_at = None
+        mock_post.view_count = 0
         mock_post.comments = []
         
         mock_post_repo.create_post.return_value = mock_post
@@ -54,29 +56,21 @@ class TestPostRoutes(unittest.TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
 
-    @patch('src.api.routes.comment_repository')
     @patch('src.api.routes.post_repository')
-    def test_get_posts_success(self, mock_post_repo, mock_comment_repo):
+    def test_get_posts_success(self, mock_post_repo):
         """Test successful retrieval of posts."""
-        mock_post = Mock(spec=Post)
-        mock_post.id = 1
-        mock_post.title = "Test Post"
-        mock_post.content = "Test content"
-        mock_post.author = "Test Author"
-        mock_post.created_at = "2024-01-01T12:00:00"
-        mock_post.updated_at = None
-        
-        mock_post_repo.get_posts.return_value = [mock_post]
-        mock_comment_repo.get_comments_count_for_post.return_value = 2
+        mock_post_repo.get_post_list.return_value = [
+            PostListRow(1, "Test Post", "Test content", "Test Author", "2024-01-01T12:00:00", None, 2)
+        ]
         
         response = self.client.get("/posts")
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         data = response.json()
         self.assertIsInstance(data, list)
-        if data:
-            self.assertIn("content", data[0])
-            self.assertIn("comment_count", data[0])
+        self.assertEqual(data[0]["content"], "Test content")
+        self.assertEqual(data[0]["comment_count"], 2)
+        mock_post_repo.get_post_list.assert_called_once_with(skip=0, limit=10)
 
     @patch('src.api.routes.post_repository')
     def test_get_post_success(self, mock_post_repo):
@@ -88,6 +82,7 @@ class TestPostRoutes(unittest.TestCase):
         mock_post.author = "Test Author"
         mock_post.created_at = "2024-01-01T12:00:00"
         mock_post.updated_at = None
+        mock_post.view_count = 0
         mock_post.comments = []
         
         mock_post_repo.get_post.return_value = mock_post
@@ -167,6 +162,8 @@ class TestCommentRoutes(unittest.TestCase):
         mock_comment.content = "Test comment"
         mock_comment.author = "Test Author"
         mock_comment.post_id = 1
+        mock_comment.parent_id = None
+        mock_comment.depth = 0
         mock_comment.created_at = "2024-01-01T12:00:00"
         mock_comment.updated_at = None
         
@@ -196,6 +193,17 @@ class TestCommentRoutes(unittest.TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    @patch('src.api.routes.post_repository')
+    def test_stream_comments_post_not_found(self, mock_post_repo):
+        """Test the comment stream checks the post exists without loading it."""
+        mock_post_repo.post_exists.return_value = False
+
+        response = self.client.get("/posts/999/comments/stream")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        mock_post_repo.post_exists.assert_called_once_with(post_id=999)
+        mock_post_repo.get_post.assert_not_called()
+
     def test_create_comment_invalid_data(self):
         """Test comment creation with invalid data."""
         invalid_data = {
@@ -208,6 +216,54 @@ class TestCommentRoutes(unittest.TestCase):
         self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
 
 
+class TestAuthorRoutes(unittest.TestCase):
+    """Test cases for Author API routes."""
+
+    def setUp(self):
+        """Set up test client."""
+        self.client = TestClient(app)
+
+    @patch('src.api.routes.author_repository')
+    def test_get_author_posts_success(self, mock_author_repo):
+        """Test retrieval of an author's feed page."""
+        mock_post = Mock(spec=Post)
+        mock_post.id = 1
+        mock_post.title = "Test Post"
+        mock_post.content = "Test content"
+        mock_post.author = "Test Author"
+        mock_post.created_at = "2024-01-01T12:00:00"
+        mock_post.updated_at = None
+        mock_post.view_count = 0
+
+        mock_author_repo.get_posts_by_author.return_value = ([(mock_post, 3)], "next")
+
+        response = self.client.get("/authors/Test Author/posts?limit=1")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["next_cursor"], "next")
+        self.assertEqual(data["items"][0]["comment_count"], 3)
+        mock_author_repo.get_posts_by_author.assert_called_once_with(author="Test Author", limit=1, cursor=None)
+
+    @patch('src.api.routes.author_repository')
+    def test_get_author_posts_invalid_cursor(self, mock_author_repo):
+        """Test a malformed cursor is rejected."""
+        mock_author_repo.get_posts_by_author.side_effect = ValueError("Invalid cursor")
+
+        response = self.client.get("/authors/Test Author/posts?cursor=bogus")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch('src.api.routes.author_repository')
+    def test_get_author_stats_not_found(self, mock_author_repo):
+        """Test stats for an author without activity."""
+        mock_author_repo.get_author_stats.return_value = None
+
+        response = self.client.get("/authors/Nobody/stats")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
 class TestPaginationAndValidation(unittest.TestCase):
     """Test cases for pagination and validation."""
 
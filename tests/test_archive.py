@@ -0,0 +1,120 @@
+"""
+Unit tests for archiving old posts into the attached archive database.
+"""
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from src.core.compression import ZLIB_HEADER
+from src.core.database import Base, archive_bind, attach_archive
+from src.main import app
+from src.models.db_models import Comment, Post
+from src.models.pydantic_models import CommentCreate, PostCreate
+from src.repositories.repository import CommentRepository, PostRepository
+from src.utils.archive_posts import archive_posts
+
+LONG_AGO = datetime(2020, 1, 1)
+
+
+class TestArchivePosts(unittest.TestCase):
+    """Test cases for archive_posts and the get_post fallback."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.engine = create_engine(f"sqlite:///{os.path.join(directory, 'blog.db')}")
+        attach_archive(self.engine, os.path.join(directory, "archive.db"))
+        self.addCleanup(self.engine.dispose)
+        Base.metadata.create_all(bind=self.engine)
+
+        for name, factory in (
+            ("SessionLocal", sessionmaker(bind=self.engine)),
+            ("ArchiveSessionLocal", sessionmaker(bind=archive_bind(self.engine))),
+        ):
+            patcher = patch(f"src.repositories.repository.{name}", factory)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.posts, self.comments = PostRepository(), CommentRepository()
+
+    def _post(self, title, age=LONG_AGO):
+        post = self.posts.create_post(PostCreate(title=title, content=f"{title} " * 50, author="Alice"))
+        with self.engine.begin() as connection:
+            connection.execute(update(Post).where(Post.id == post.id).values(created_at=age))
+        return post
+
+    def _comment(self, post, age=LONG_AGO):
+        comment = self.comments.create_comment(CommentCreate(content="Hi", author="Bob"), post_id=post.id)
+        with self.engine.begin() as connection:
+            connection.execute(update(Comment).where(Comment.id == comment.id).values(created_at=age))
+        return comment
+
+    def test_old_posts_move_with_their_comments(self):
+        """Test old posts leave the hot database and are still served by get_post."""
+        old = self._post("old")
+        self._comment(old)
+        self._comment(old)
+        self._comment(self._post("newest"))
+
+        moved = archive_posts(datetime(2021, 1, 1), batch_size=1, bind=self.engine)
+
+        self.assertEqual(moved, (1, 2))
+        self.assertIsNone(self.posts.get_post(old.id, include_archived=False))
+        self.assertFalse(self.posts.post_exists(old.id))
+        archived = self.posts.get_post(old.id)
+        self.assertEqual(archived.content, "old " * 50)
+        self.assertEqual(len(archived.comments), 2)
+        with self.engine.connect() as connection:
+            stored = connection.exec_driver_sql("SELECT content FROM archive.posts").scalar_one()
+        self.assertTrue(stored.startswith(ZLIB_HEADER))
+
+    def test_active_and_newest_posts_stay_hot(self):
+        """Test recent comments and the newest ids keep posts in the hot database."""
+        commented = self._post("commented")
+        self._comment(commented, age=datetime.now())
+        newest_comment_owner = self._post("discussed")
+        self._post("quiet")
+        newest = self._post("newest")
+        self._comment(newest_comment_owner)
+
+        moved = archive_posts(datetime.now() - timedelta(days=1), bind=self.engine)
+
+        self.assertEqual(moved, (1, 0))
+        hot = {row.title for row in self.posts.get_post_list()}
+        self.assertEqual(hot, {"commented", "discussed", "newest"})
+        self.assertIsNotNone(self.posts.get_post(newest.id, include_archived=False))
+
+    def test_archived_comments_are_still_served(self):
+        """Test every read of a post's or comment's id finds archived comments and counts."""
+        old = self._post("old")
+        comment = self._comment(old)
+        self._comment(self._post("newest"))
+        archive_posts(datetime(2021, 1, 1), bind=self.engine)
+        self.assertIsNone(self.posts.get_post(old.id, include_archived=False))
+        client = TestClient(app)
+
+        self.assertEqual([item["id"] for item in client.get(f"/posts/{old.id}/comments").json()], [comment.id])
+        self.assertEqual([item["id"] for item in client.get(f"/posts/{old.id}/comments/tree").json()], [comment.id])
+        self.assertEqual(client.get(f"/comments/{comment.id}/thread").json()["id"], comment.id)
+        response = client.get(f"/comments/{comment.id}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["post_id"], old.id)
+        self.assertEqual(
+            client.get("/posts/comment-counts", params={"ids": f"{old.id},999"}).json(),
+            {"counts": {str(old.id): 1}, "missing": [999]}
+        )
+        lookup = client.post("/posts/lookup", json={"ids": [old.id, 999], "include_comments": True}).json()
+        self.assertEqual(lookup["missing"], [999])
+        self.assertEqual(
+            (lookup["items"][0]["id"], lookup["items"][0]["comment_count"], len(lookup["items"][0]["comments"])),
+            (old.id, 1, 1)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
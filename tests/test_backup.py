@@ -0,0 +1,80 @@
+"""
+Unit tests for online backups.
+"""
+import gzip
+import hashlib
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.utils.backup import BackupManager, BackupResult, backup_database
+
+
+class TestBackupDatabase(unittest.TestCase):
+    """Test cases for backup_database and BackupManager."""
+
+    def setUp(self):
+        """Set up a small source database."""
+        self.tmp = Path(tempfile.mkdtemp())
+        self.source = self.tmp / "source.db"
+        connection = sqlite3.connect(self.source)
+        connection.execute("CREATE TABLE posts (id INTEGER PRIMARY KEY, content TEXT)")
+        connection.executemany("INSERT INTO posts (content) VALUES (?)", [("x" * 500,)] * 500)
+        connection.commit()
+        connection.close()
+
+    def _count_posts(self, path):
+        connection = sqlite3.connect(path)
+        try:
+            return connection.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        finally:
+            connection.close()
+
+    def test_stepped_backup_with_checksum(self):
+        """Test a backup copied in small steps is complete and checksummed."""
+        destination = self.tmp / "backup.db"
+
+        result = backup_database(destination, BackupResult(id=1), pages=4, pause=0, source=self.source)
+
+        self.assertEqual(result.status, "completed")
+        self.assertGreater(result.steps, 1)
+        self.assertEqual(self._count_posts(destination), 500)
+        self.assertEqual(result.sha256, hashlib.sha256(destination.read_bytes()).hexdigest())
+        self.assertIn(result.sha256, (self.tmp / "backup.db.sha256").read_text())
+
+    def test_compressed_backup(self):
+        """Test a compressed backup decompresses to a valid database."""
+        destination = self.tmp / "backup.db.gz"
+
+        result = backup_database(destination, BackupResult(id=1), pause=0, compress=True, source=self.source)
+
+        restored = self.tmp / "restored.db"
+        restored.write_bytes(gzip.decompress(destination.read_bytes()))
+        self.assertTrue(result.compressed)
+        self.assertLess(result.size_bytes, self.source.stat().st_size)
+        self.assertEqual(self._count_posts(restored), 500)
+
+    def test_manager_runs_one_backup_at_a_time(self):
+        """Test the manager refuses a second backup while one is running."""
+        manager = BackupManager(str(self.tmp / "backups"), source=self.source)
+
+        first = manager.start(pages=1, pause=0.01)
+        self.assertIsNone(manager.start())
+
+        deadline = time.time() + 10
+        while manager.get(first.id).status == "running" and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(manager.get(first.id).status, "completed")
+        self.assertEqual([result.id for result in manager.list()], [first.id])
+
+    def test_missing_source_fails(self):
+        """Test backing up a missing database fails instead of creating it."""
+        with self.assertRaises(sqlite3.OperationalError):
+            backup_database(self.tmp / "out.db", BackupResult(id=1), source=self.tmp / "missing.db")
+        self.assertFalse((self.tmp / "missing.db").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Unit tests for the change log and GET /changes.
+"""
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.core.database import Base
+from src.main import app
+from src.models.pydantic_models import CommentCreate, CommentUpdate, PostCreate, PostUpdate
+from src.repositories.factory import create_repositories
+from src.repositories.repository import CommentRepository, PostRepository
+
+
+class ChangeLogTests:
+    """Behaviour shared by both storage backends; subclasses provide the repositories."""
+
+    def entries(self, since=0):
+        return [(row.entity, row.entity_id, row.op) for row in self.posts.get_changes(since=since, limit=100)]
+
+    def test_mutations_are_logged_in_order(self):
+        """Test every write appends an entry, with tombstones for everything deleted."""
+        post = self.posts.create_post(PostCreate(title="T", content="C", author="A"))
+        first = self.comments.create_comment(CommentCreate(content="Hi", author="B"), post_id=post.id)
+        reply = self.comments.create_comment(
+            CommentCreate(content="Re", author="C", parent_id=first.id), post_id=post.id
+        )
+        self.posts.update_post(post.id, PostUpdate(title="T2"))
+        self.comments.update_comment(first.id, CommentUpdate(content="Hello"))
+        self.comments.delete_comment(reply.id)
+        self.posts.delete_post(post.id)
+
+        self.assertEqual(self.entries(), [
+            ("post", post.id, "created"),
+            ("comment", first.id, "created"),
+            ("comment", reply.id, "created"),
+            ("post", post.id, "updated"),
+            ("comment", first.id, "updated"),
+            ("comment", reply.id, "deleted"),
+            ("post", post.id, "deleted"),
+            ("comment", first.id, "deleted"),
+        ])
+        rows = self.posts.get_changes(since=0, limit=100)
+        self.assertEqual([row.seq for row in rows], sorted({row.seq for row in rows}))
+        self.assertEqual(self.entries(since=rows[5].seq), self.entries()[6:])
+
+    def test_compaction_keeps_latest_entry_per_entity(self):
+        """Test superseded entries are dropped and tombstones expire after the retention."""
+        kept = self.posts.create_post(PostCreate(title="K", content="C", author="A"))
+        gone = self.posts.create_post(PostCreate(title="G", content="C", author="A"))
+        self.posts.update_post(kept.id, PostUpdate(title="K2"))
+        self.posts.delete_post(gone.id)
+
+        self.assertEqual(self.posts.compact_changes(tombstone_retention=3600), 2)
+        self.assertEqual(self.entries(), [("post", kept.id, "updated"), ("post", gone.id, "deleted")])
+
+        self.assertEqual(self.posts.compact_changes(tombstone_retention=-1), 1)
+        self.assertEqual(self.entries(), [("post", kept.id, "updated")])
+
+        # Sequence numbers keep increasing after compaction
+        last_seq = self.posts.get_changes()[-1].seq
+        newer = self.posts.create_post(PostCreate(title="N", content="C", author="A"))
+        self.assertEqual(self.posts.get_changes(since=last_seq)[0].entity_id, newer.id)
+
+
+class TestSqlChangeLog(ChangeLogTests, unittest.TestCase):
+    """Test the change log written by the SQLAlchemy repositories."""
+
+    def setUp(self):
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(engine)
+        patcher = patch('src.repositories.repository.SessionLocal', sessionmaker(bind=engine))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.posts, self.comments = PostRepository(), CommentRepository()
+
+
+class TestMemoryChangeLog(ChangeLogTests, unittest.TestCase):
+    """Test the change log kept by the in-memory repositories."""
+
+    def setUp(self):
+        self.posts, self.comments, _ = create_repositories("memory")
+
+
+class TestChangesRoute(unittest.TestCase):
+    """Test GET /changes on the in-memory backend."""
+
+    def setUp(self):
+        posts, comments, authors = create_repositories("memory")
+        self.posts = posts
+        for name, repository in (
+            ("post_repository", posts), ("comment_repository", comments), ("author_repository", authors)
+        ):
+            patcher = patch(f"src.api.routes.{name}", repository)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def test_pages_through_changes(self):
+        """Test next_since and has_more let a client fetch only new changes."""
+        for title in "ABC":
+            self.posts.create_post(PostCreate(title=title, content="C", author="A"))
+
+        first = self.client.get("/changes", params={"limit": 2})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        page = first.json()
+        self.assertEqual([change["entity_id"] for change in page["changes"]], [1, 2])
+        self.assertTrue(page["has_more"])
+
+        rest = self.client.get("/changes", params={"since": page["next_since"]}).json()
+        self.assertEqual([change["op"] for change in rest["changes"]], ["created"])
+        self.assertFalse(rest["has_more"])
+
+        idle = self.client.get("/changes", params={"since": rest["next_since"]}).json()
+        self.assertEqual((idle["changes"], idle["next_since"]), ([], rest["next_since"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
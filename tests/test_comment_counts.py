@@ -0,0 +1,77 @@
+"""
+Unit tests for batch comment counts.
+"""
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.core.database import Base
+from src.main import app
+from src.models.pydantic_models import CommentCreate, PostCreate
+from src.repositories.factory import create_repositories
+from src.repositories.repository import CommentRepository, PostRepository
+
+
+class TestGetCommentCounts(unittest.TestCase):
+    """Test CommentRepository.get_comment_counts."""
+
+    def setUp(self):
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(engine)
+        patcher = patch('src.repositories.repository.SessionLocal', sessionmaker(bind=engine))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.posts, self.comments = PostRepository(), CommentRepository()
+
+    def test_counts_zero_and_missing(self):
+        """Test posts without comments count 0 and unknown ids are left out."""
+        busy = self.posts.create_post(PostCreate(title="A", content="C", author="a"))
+        quiet = self.posts.create_post(PostCreate(title="B", content="C", author="a"))
+        first = self.comments.create_comment(CommentCreate(content="1", author="b"), post_id=busy.id)
+        self.comments.create_comment(CommentCreate(content="2", author="b", parent_id=first.id), post_id=busy.id)
+
+        counts = self.comments.get_comment_counts([quiet.id, busy.id, 999, busy.id])
+
+        self.assertEqual(counts, {busy.id: 2, quiet.id: 0})
+        self.assertEqual(self.comments.get_comment_counts([]), {})
+
+
+class TestCommentCountsRoute(unittest.TestCase):
+    """Test GET /posts/comment-counts on the in-memory backend."""
+
+    def setUp(self):
+        posts, comments, authors = create_repositories("memory")
+        for name, repository in (
+            ("post_repository", posts), ("comment_repository", comments), ("author_repository", authors)
+        ):
+            patcher = patch(f"src.api.routes.{name}", repository)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+        self.ids = [posts.create_post(PostCreate(title=t, content="C", author="a")).id for t in "AB"]
+        comments.create_comment(CommentCreate(content="Hi", author="b"), post_id=self.ids[1])
+
+    def test_comma_separated_and_repeated_ids(self):
+        """Test both id styles give counts in the requested order and list unknown ids."""
+        response = self.client.get(f"/posts/comment-counts?ids={self.ids[1]},{self.ids[0]}&ids=42")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"counts": {str(self.ids[1]): 1, str(self.ids[0]): 0}, "missing": [42]})
+
+    def test_invalid_ids_are_rejected(self):
+        """Test non-integer, empty and oversized id lists get 422."""
+        too_many = ",".join(str(i) for i in range(1001))
+        for query in ("ids=1,x", "ids=,", f"ids={too_many}", ""):
+            response = self.client.get(f"/posts/comment-counts?{query}")
+            self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY, query)
+
+
+if __name__ == '__main__':
+    unittest.main()
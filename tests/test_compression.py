@@ -0,0 +1,74 @@
+"""
+Unit tests for post content compression.
+"""
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.core.compression import ZLIB_HEADER, TextCompressor
+from src.core.database import Base
+from src.models.db_models import Post, content_compressor
+
+
+class TestTextCompressor(unittest.TestCase):
+    """Test cases for TextCompressor."""
+
+    def test_large_text_round_trips(self):
+        """Test text above the threshold is compressed and restored."""
+        compressor = TextCompressor(codec="zlib", threshold=100)
+        original = "héllo world " * 100
+
+        stored = compressor.compress(original)
+
+        self.assertIsInstance(stored, bytes)
+        self.assertTrue(stored.startswith(ZLIB_HEADER))
+        self.assertLess(len(stored), len(original))
+        self.assertEqual(compressor.decompress(stored), original)
+
+    def test_small_text_stays_plain(self):
+        """Test text under the threshold is stored as-is."""
+        compressor = TextCompressor(codec="zlib", threshold=100)
+        self.assertEqual(compressor.compress("short"), "short")
+
+    def test_disabled_codec_still_reads_compressed_rows(self):
+        """Test turning compression off keeps existing compressed rows readable."""
+        stored = TextCompressor(codec="zlib", threshold=0).compress("x" * 500)
+        self.assertEqual(TextCompressor(codec="none").decompress(stored), "x" * 500)
+
+    def test_incompressible_text_stays_plain(self):
+        """Test text that would not shrink is not compressed."""
+        compressor = TextCompressor(codec="zlib", threshold=0)
+        self.assertEqual(compressor.compress("ab"), "ab")
+
+    def test_unknown_codec(self):
+        """Test an unknown codec is rejected."""
+        with self.assertRaises(ValueError):
+            TextCompressor(codec="lz4")
+
+
+class TestCompressedContentColumn(unittest.TestCase):
+    """Test cases for the compressed Post.content column."""
+
+    def test_post_content_is_compressed_transparently(self):
+        """Test large content is stored compressed and loaded as text."""
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        content = "Long-form post body. " * 1000
+
+        with patch.object(content_compressor, "codec", "zlib"), \
+                patch.object(content_compressor, "threshold", 1024):
+            session.add(Post(title="Long", content=content, author="Writer"))
+            session.commit()
+            session.expire_all()
+
+            stored_type = session.execute(text("SELECT typeof(content) FROM posts")).scalar()
+            self.assertEqual(stored_type, "blob")
+            self.assertEqual(session.query(Post).one().content, content)
+        session.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
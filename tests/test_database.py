@@ -0,0 +1,72 @@
+"""
+Unit tests for database schema initialization.
+"""
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, inspect
+
+import src.models.db_models  # noqa: F401  (registers the tables on Base)
+from src.core.database import SCHEMA_VERSION, get_schema_version, init_schema
+
+
+class TestInitSchema(unittest.TestCase):
+    """Test cases for the versioned schema check."""
+
+    def setUp(self):
+        """Set up an empty database file."""
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        self.engine = create_engine(f"sqlite:///{path}")
+        self.addCleanup(self.engine.dispose)
+
+    def test_creates_schema_and_stamps_version(self):
+        """Test a new database gets the tables and the current version."""
+        self.assertEqual(get_schema_version(self.engine), 0)
+
+        self.assertTrue(init_schema(self.engine))
+
+        self.assertEqual(get_schema_version(self.engine), SCHEMA_VERSION)
+        self.assertIn("posts", inspect(self.engine).get_table_names())
+
+    def test_current_version_skips_create(self):
+        """Test a database at the current version is left untouched."""
+        init_schema(self.engine)
+
+        self.assertFalse(init_schema(self.engine))
+
+    def test_adds_indexes_to_existing_tables(self):
+        """Test indexes added after a table was created are backfilled."""
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE posts (id INTEGER PRIMARY KEY, title VARCHAR(200), content TEXT, "
+                "author VARCHAR(100), created_at DATETIME, updated_at DATETIME)"
+            )
+
+        init_schema(self.engine)
+
+        indexes = {index["name"] for index in inspect(self.engine).get_indexes("posts")}
+        self.assertIn("ix_posts_author_created_at_id", indexes)
+
+    def test_adds_columns_to_existing_tables(self):
+        """Test columns added after a table was created are added and backfilled."""
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE comments (id INTEGER PRIMARY KEY, content TEXT, author VARCHAR(100), "
+                "created_at DATETIME, updated_at DATETIME, post_id INTEGER)"
+            )
+            connection.exec_driver_sql("INSERT INTO comments (id, content, author, post_id) VALUES (12, 'Hi', 'Bob', 1)")
+
+        init_schema(self.engine)
+
+        with self.engine.connect() as connection:
+            row = connection.exec_driver_sql("SELECT parent_id, path, depth FROM comments").one()
+        self.assertEqual(tuple(row), (None, "0000000012/", 0))
+        indexes = {index["name"] for index in inspect(self.engine).get_indexes("comments")}
+        self.assertIn("ix_comments_post_id_path", indexes)
+
+
+if __name__ == '__main__':
+    unittest.main()
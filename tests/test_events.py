@@ -0,0 +1,71 @@
+"""
+Unit tests for the in-process event bus.
+"""
+import asyncio
+import threading
+import unittest
+
+from src.core.events import EventBus
+
+
+class TestEventBus(unittest.IsolatedAsyncioTestCase):
+    """Test cases for EventBus fan-out."""
+
+    async def test_publish_reaches_post_subscribers_only(self):
+        """Test events are delivered to subscribers of the same post."""
+        bus = EventBus(queue_size=4)
+        subscription = bus.subscribe(1)
+        other = bus.subscribe(2)
+
+        bus.publish(1, "comment.created", {"id": 7})
+
+        frame = subscription.queue.get_nowait()
+        self.assertIn("event: comment.created", frame)
+        self.assertIn('data: {"id":7}', frame)
+        self.assertTrue(other.queue.empty())
+
+    async def test_publish_without_subscribers_is_noop(self):
+        """Test publishing to a post nobody follows does nothing."""
+        bus = EventBus()
+        bus.publish(1, "comment.created", {"id": 7})
+        self.assertEqual(bus.published, 0)
+        self.assertFalse(bus.has_subscribers(1))
+
+    async def test_slow_consumer_is_dropped(self):
+        """Test a full queue ends the subscriber's stream."""
+        bus = EventBus(queue_size=2)
+        subscription = bus.subscribe(1)
+
+        for i in range(3):
+            bus.publish(1, "comment.created", {"id": i})
+
+        self.assertTrue(subscription.dropped)
+        self.assertIsNone(subscription.queue.get_nowait())
+        self.assertEqual(bus.dropped, 1)
+        self.assertFalse(bus.has_subscribers(1))
+
+    async def test_publish_from_worker_thread(self):
+        """Test publishing from another thread is handed to the subscriber's loop."""
+        bus = EventBus()
+        subscription = bus.subscribe(1)
+
+        thread = threading.Thread(target=bus.publish, args=(1, "comment.deleted", {"id": 1}))
+        thread.start()
+        thread.join()
+
+        frame = await asyncio.wait_for(subscription.queue.get(), timeout=1)
+        self.assertIn("event: comment.deleted", frame)
+
+    async def test_close_ends_streams(self):
+        """Test closing a post's channel ends its streams."""
+        bus = EventBus()
+        subscription = bus.subscribe(1)
+
+        bus.close(1)
+
+        self.assertIsNone(subscription.queue.get_nowait())
+        self.assertEqual(bus.subscriber_count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+Unit tests for idempotency keys.
+"""
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from src.core.database import Base
+from src.core.idempotency import (
+    IN_PROGRESS,
+    MISMATCH,
+    PROCEED,
+    REPLAY,
+    IdempotencyStore,
+    request_fingerprint,
+)
+from src.main import app
+from src.repositories.factory import create_repositories
+
+
+class TestIdempotencyStore(unittest.TestCase):
+    """Test cases for the in-memory store."""
+
+    def setUp(self):
+        self.store = IdempotencyStore(capacity=2)
+        self.fingerprint = request_fingerprint("POST", "/posts", '{"title":"Hello"}')
+
+    def test_completed_key_is_replayed(self):
+        """Test a retry after completion replays the stored response."""
+        self.assertEqual(self.store.begin("k1", self.fingerprint), (PROCEED, None))
+        self.store.complete("k1", 201, '{"id":1}')
+
+        outcome, stored = self.store.begin("k1", self.fingerprint)
+
+        self.assertEqual(outcome, REPLAY)
+        self.assertEqual((stored.status_code, stored.body), (201, '{"id":1}'))
+
+    def test_duplicate_while_in_flight_conflicts(self):
+        """Test a duplicate arriving before the first request finishes is not run."""
+        self.store.begin("k1", self.fingerprint)
+
+        self.assertEqual(self.store.begin("k1", self.fingerprint)[0], IN_PROGRESS)
+
+    def test_key_reused_for_different_request_is_rejected(self):
+        """Test a key cannot replay a response for a different payload."""
+        self.store.begin("k1", self.fingerprint)
+        self.store.complete("k1", 201, "{}")
+
+        other = request_fingerprint("POST", "/posts", '{"title":"Other"}')
+        self.assertEqual(self.store.begin("k1", other)[0], MISMATCH)
+
+    def test_abandoned_key_can_be_retried(self):
+        """Test a failed request releases its key."""
+        self.store.begin("k1", self.fingerprint)
+        self.store.abandon("k1")
+
+        self.assertEqual(self.store.begin("k1", self.fingerprint)[0], PROCEED)
+
+    def test_least_recently_used_keys_are_evicted(self):
+        """Test the cache stays within capacity."""
+        for key in ("k1", "k2", "k3"):
+            self.store.begin(key, self.fingerprint)
+            self.store.complete(key, 201, "{}")
+
+        self.assertEqual(self.store.stats()["cached"], 2)
+        self.assertEqual(self.store.begin("k1", self.fingerprint)[0], PROCEED)
+
+    def test_concurrent_duplicates_run_once(self):
+        """Test only one of many simultaneous duplicates may proceed."""
+        outcomes = []
+        barrier = threading.Barrier(8)
+
+        def attempt():
+            barrier.wait()
+            outcomes.append(self.store.begin("k1", self.fingerprint)[0])
+
+        threads = [threading.Thread(target=attempt) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(outcomes.count(PROCEED), 1)
+        self.assertEqual(outcomes.count(IN_PROGRESS), 7)
+
+
+class TestPersistedIdempotencyStore(unittest.TestCase):
+    """Test cases for the SQLite-backed store."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.engine = create_engine(f"sqlite:///{os.path.join(directory, 'keys.db')}")
+        self.addCleanup(self.engine.dispose)
+        Base.metadata.create_all(bind=self.engine)
+        self.fingerprint = request_fingerprint("POST", "/posts", "{}")
+
+    def test_key_survives_a_new_store(self):
+        """Test a response stored by one process is replayed by another."""
+        first = IdempotencyStore(persist=True, bind=self.engine)
+        first.begin("k1", self.fingerprint)
+        first.complete("k1", 201, '{"id":7}')
+
+        outcome, stored = IdempotencyStore(persist=True, bind=self.engine).begin("k1", self.fingerprint)
+
+        self.assertEqual(outcome, REPLAY)
+        self.assertEqual(stored.body, '{"id":7}')
+
+    def test_claim_is_shared_across_stores(self):
+        """Test a key claimed by one worker is in progress for another."""
+        IdempotencyStore(persist=True, bind=self.engine).begin("k1", self.fingerprint)
+
+        other = IdempotencyStore(persist=True, bind=self.engine)
+        self.assertEqual(other.begin("k1", self.fingerprint)[0], IN_PROGRESS)
+
+    def test_stale_claim_is_taken_over(self):
+        """Test a key left claimed by a crashed worker is freed after the lock timeout."""
+        IdempotencyStore(persist=True, bind=self.engine).begin("k1", self.fingerprint)
+
+        other = IdempotencyStore(persist=True, lock_timeout=-1, bind=self.engine)
+        self.assertEqual(other.begin("k1", self.fingerprint)[0], PROCEED)
+
+
+class TestIdempotentRoutes(unittest.TestCase):
+    """Test the Idempotency-Key header on POST routes."""
+
+    def setUp(self):
+        """Point the routes at a fresh in-memory store and repositories."""
+        posts, comments, authors = create_repositories("memory")
+        self.posts = posts
+        for name, value in (
+            ("post_repository", posts),
+            ("comment_repository", comments),
+            ("author_repository", authors),
+            ("idempotency_store", IdempotencyStore()),
+        ):
+            patcher = patch(f"src.api.routes.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+        self.payload = {"title": "Hello", "content": "World", "author": "Alice"}
+
+    def test_retried_post_is_created_once(self):
+        """Test a retry replays the first response without writing a second post."""
+        headers = {"Idempotency-Key": "abc"}
+        first = self.client.post("/posts", json=self.payload, headers=headers)
+        retry = self.client.post("/posts", json=self.payload, headers=headers)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(self.posts.get_posts_count(), 1)
+
+    def test_key_reused_with_different_body(self):
+        """Test reusing a key for a different post returns 422."""
+        self.client.post("/posts", json=self.payload, headers={"Idempotency-Key": "abc"})
+        response = self.client.post(
+            "/posts", json={**self.payload, "title": "Other"}, headers={"Idempotency-Key": "abc"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(self.posts.get_posts_count(), 1)
+
+    def test_failed_comment_is_not_recorded(self):
+        """Test a 404 releases the key so the retry runs again."""
+        headers = {"Idempotency-Key": "c1"}
+        comment = {"content": "Nice", "author": "Bob"}
+        self.assertEqual(
+            self.client.post("/posts/1/comments", json=comment, headers=headers).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+
+        self.client.post("/posts", json=self.payload)
+        first = self.client.post("/posts/1/comments", json=comment, headers=headers)
+        retry = self.client.post("/posts/1/comments", json=comment, headers=headers)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json()["id"], first.json()["id"])
+        self.assertEqual(len(self.client.get("/posts/1/comments").json()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
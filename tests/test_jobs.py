@@ -0,0 +1,166 @@
+"""
+Unit tests for chunked bulk deletes and the background job runner.
+"""
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.core.database import Base
+from src.main import app
+from src.models.db_models import Comment, Job
+from src.models.pydantic_models import CommentCreate, PostCreate
+from src.repositories.factory import create_repositories
+from src.repositories.repository import AuthorRepository, CommentRepository, PostRepository
+from src.utils.jobs import JobRunner
+
+
+def _wait(runner, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while runner.get(job_id).status in ("queued", "running"):
+        if time.monotonic() > deadline:
+            raise AssertionError("job did not finish")
+        time.sleep(0.01)
+    return runner.get(job_id)
+
+
+class TestBulkDeletes(unittest.TestCase):
+    """Test delete_posts_where and delete_comments_where in the SQL backend."""
+
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(self.engine)
+        patcher = patch('src.repositories.repository.SessionLocal', sessionmaker(bind=self.engine))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.posts, self.comments, self.authors = PostRepository(), CommentRepository(), AuthorRepository()
+
+    def test_deletes_an_authors_posts_in_chunks(self):
+        """Test each call removes one chunk of posts with their comments and keeps rollups right."""
+        spam = [self.posts.create_post(PostCreate(title=f"S{i}", content="C", author="spam")) for i in range(5)]
+        keep = self.posts.create_post(PostCreate(title="K", content="C", author="alice"))
+        self.comments.create_comment(CommentCreate(content="Hi", author="bob"), post_id=spam[0].id)
+        self.comments.create_comment(CommentCreate(content="Hi", author="bob"), post_id=keep.id)
+
+        chunks = []
+        while True:
+            deleted = self.posts.delete_posts_where(author="spam", limit=2)
+            if not deleted:
+                break
+            chunks.append(deleted)
+
+        self.assertEqual(chunks, [2, 2, 1])
+        self.assertEqual([row.id for row in self.posts.get_post_list()], [keep.id])
+        self.assertEqual(self.authors.get_author_stats("spam").post_count, 0)
+        self.assertEqual(self.authors.get_author_stats("bob").comment_count, 1)
+        tombstones = [row for row in self.posts.get_changes(limit=100) if row.op == "deleted"]
+        self.assertEqual(len(tombstones), 6)
+
+    def test_deletes_old_comments_with_their_replies(self):
+        """Test a matching comment takes its (newer) replies with it."""
+        post = self.posts.create_post(PostCreate(title="T", content="C", author="alice"))
+        old = self.comments.create_comment(CommentCreate(content="Old", author="bob"), post_id=post.id)
+        self.comments.create_comment(CommentCreate(content="Re", author="carol", parent_id=old.id), post_id=post.id)
+        recent = self.comments.create_comment(CommentCreate(content="New", author="bob"), post_id=post.id)
+        with self.engine.begin() as connection:
+            connection.execute(update(Comment).where(Comment.id == old.id).values(created_at=datetime(2020, 1, 1)))
+
+        self.assertEqual(self.comments.delete_comments_where(before=datetime(2021, 1, 1)), 2)
+        self.assertEqual(self.comments.delete_comments_where(before=datetime(2021, 1, 1)), 0)
+
+        self.assertEqual([row.id for row in self.comments.get_comments_for_post(post.id)], [recent.id])
+        self.assertEqual(self.authors.get_author_stats("carol").comment_count, 0)
+
+    def test_filter_is_required(self):
+        """Test a bulk delete without filters is refused."""
+        with self.assertRaises(ValueError):
+            self.posts.delete_posts_where()
+
+
+class TestJobRunner(unittest.TestCase):
+    """Test cases for JobRunner."""
+
+    def setUp(self):
+        self.posts, self.comments, _ = create_repositories("memory")
+        for i in range(5):
+            post = self.posts.create_post(PostCreate(title=f"S{i}", content="C", author="spam"))
+            self.comments.create_comment(CommentCreate(content="Hi", author="spam"), post_id=post.id)
+        self.posts.create_post(PostCreate(title="K", content="C", author="alice"))
+
+    def test_job_runs_in_chunks_and_reports_progress(self):
+        """Test a queued job deletes everything that matches and records its progress."""
+        runner = JobRunner(self.posts, self.comments, chunk_size=2, pause=0)
+        self.addCleanup(runner.stop)
+
+        job = _wait(runner, runner.submit("delete_posts", {"author": "spam"}).id)
+
+        self.assertEqual((job.status, job.processed, job.chunks), ("completed", 5, 3))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(self.posts.get_posts_count(), 1)
+        self.assertEqual([item.id for item in runner.list()], [job.id])
+
+    def test_jobs_are_saved_and_resumed(self):
+        """Test progress is persisted and an interrupted job is picked up by a new runner."""
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'jobs.db')}")
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(insert(Job).values(
+                id=7, kind="delete_comments", params=json.dumps({"author": "spam"}), status="running",
+                processed=1, chunks=1, created_at=datetime.now() - timedelta(minutes=1)
+            ))
+
+        runner = JobRunner(self.posts, self.comments, chunk_size=2, pause=0, persist=True, bind=engine)
+        self.addCleanup(runner.stop)
+        self.assertEqual(runner.resume(), 1)
+        _wait(runner, 7)
+
+        saved = JobRunner(self.posts, self.comments, persist=True, bind=engine).get(7)
+        self.assertEqual((saved.status, saved.processed), ("completed", 6))
+        self.assertEqual(self.posts.get_post(1).comments, [])
+
+
+class TestJobRoutes(unittest.TestCase):
+    """Test the /admin/jobs endpoints."""
+
+    def setUp(self):
+        posts, comments, _ = create_repositories("memory")
+        posts.create_post(PostCreate(title="S", content="C", author="spam"))
+        self.runner = JobRunner(posts, comments, pause=0)
+        self.addCleanup(self.runner.stop)
+        patcher = patch("src.api.admin_routes.job_runner", self.runner)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def test_start_and_poll_job(self):
+        """Test a job is accepted and its progress can be fetched."""
+        response = self.client.post("/admin/jobs", json={"kind": "delete_posts", "author": "spam"})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.json()["id"]
+        _wait(self.runner, job_id)
+        job = self.client.get(f"/admin/jobs/{job_id}").json()
+        self.assertEqual((job["status"], job["processed"], job["params"]), ("completed", 1, {"author": "spam"}))
+        self.assertEqual(self.client.get("/admin/jobs/999").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_job_without_filter_is_rejected(self):
+        """Test a job that would delete everything is refused."""
+        response = self.client.post("/admin/jobs", json={"kind": "delete_comments"})
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Unit tests for scheduled SQLite maintenance.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, insert
+
+from src.core.database import Base, configure_sqlite
+from src.core.runtime import runtime_monitor
+from src.main import _is_quiet, app
+from src.models.db_models import Post
+from src.utils.maintenance import (
+    DatabaseMaintainer,
+    MaintenanceResult,
+    convert_to_incremental,
+    database_stats,
+    run_maintenance,
+)
+
+
+def _file_engine(journal_mode="wal", incremental=True):
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'blog.db')}")
+    if incremental:
+        configure_sqlite(engine, journal_mode)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def _fill_and_delete(engine, rows=200):
+    with engine.begin() as connection:
+        connection.execute(insert(Post), [
+            {"title": f"P{i}", "content": "x" * 4000, "author": "spam"} for i in range(rows)
+        ])
+    with engine.begin() as connection:
+        connection.execute(delete(Post))
+
+
+class TestRunMaintenance(unittest.TestCase):
+    """Test cases for run_maintenance."""
+
+    def test_frees_pages_and_checkpoints(self):
+        """Test a pass analyzes, returns every free page and checkpoints the WAL."""
+        engine = _file_engine()
+        self.addCleanup(engine.dispose)
+        _fill_and_delete(engine)
+
+        result = run_maintenance(MaintenanceResult(id=1), bind=engine, vacuum_step_pages=64, pause=0)
+
+        self.assertEqual(result.status, "completed")
+        self.assertTrue(result.optimized and result.analyzed)
+        self.assertEqual(result.before.journal_mode, "wal")
+        self.assertGreater(result.before.freelist_count, 64)
+        self.assertEqual(result.vacuumed_pages, result.before.freelist_count)
+        self.assertEqual(result.after.freelist_count, 0)
+        self.assertGreater(result.checkpointed_pages, 0)
+        self.assertLess(result.after.page_count, result.before.page_count)
+
+    def test_defers_when_traffic_arrives(self):
+        """Test the pass stops at the first step taken while the API is busy."""
+        engine = _file_engine()
+        self.addCleanup(engine.dispose)
+        _fill_and_delete(engine)
+        answers = iter([True, True, True, False])
+
+        result = run_maintenance(
+            MaintenanceResult(id=1), bind=engine, vacuum_step_pages=16, pause=0, is_quiet=lambda: next(answers)
+        )
+
+        self.assertEqual(result.status, "deferred")
+        # One step's worth of pages (pointer-map pages can free one or two more)
+        self.assertTrue(16 <= result.vacuumed_pages < 32)
+        self.assertEqual(result.after.freelist_count, result.before.freelist_count - result.vacuumed_pages)
+
+    def test_quiet_counts_requests_without_admission_control(self):
+        """Test the scheduled pass sees in-flight requests even when admission control is off."""
+        with patch("src.main.settings.maintenance_quiet_requests", 2):
+            with patch.object(runtime_monitor, "in_flight", 2):
+                self.assertTrue(_is_quiet())
+            with patch.object(runtime_monitor, "in_flight", 3):
+                self.assertFalse(_is_quiet())
+
+    def test_convert_enables_incremental_vacuum(self):
+        """Test a file created without auto_vacuum is only vacuumed after converting it."""
+        engine = _file_engine(incremental=False)
+        self.addCleanup(engine.dispose)
+        _fill_and_delete(engine)
+
+        result = run_maintenance(MaintenanceResult(id=1), bind=engine, pause=0)
+        self.assertEqual((result.before.auto_vacuum, result.vacuumed_pages), ("none", 0))
+
+        stats = convert_to_incremental(engine)
+        self.assertEqual((stats.auto_vacuum, stats.freelist_count), ("incremental", 0))
+
+
+class TestMaintenanceRoutes(unittest.TestCase):
+    """Test the database stats and maintenance endpoints."""
+
+    def setUp(self):
+        self.engine = _file_engine()
+        self.addCleanup(self.engine.dispose)
+        _fill_and_delete(self.engine, rows=20)
+        patcher = patch("src.api.admin_routes.database_maintainer", DatabaseMaintainer(bind=self.engine, pause=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def test_stats_and_manual_run(self):
+        """Test the stats report free pages and a manual pass returns them."""
+        stats = self.client.get("/debug/database").json()
+        self.assertEqual(stats["freelist_count"], database_stats(self.engine).freelist_count)
+        self.assertGreater(stats["freelist_count"], 0)
+
+        response = self.client.post("/admin/maintenance")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["after"]["freelist_count"], 0)
+        self.assertEqual([run["id"] for run in self.client.get("/admin/maintenance").json()], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
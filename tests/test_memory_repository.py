@@ -0,0 +1,165 @@
+"""
+Unit tests for the in-memory storage backend.
+"""
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.models.pydantic_models import PostCreate, PostUpdate, CommentCreate, CommentUpdate
+from src.repositories.factory import create_repositories
+
+
+class TestMemoryRepositories(unittest.TestCase):
+    """Test cases for the in-memory repositories."""
+
+    def setUp(self):
+        """Set up a fresh in-memory store."""
+        self.posts, self.comments, self.authors = create_repositories("memory")
+
+    def _create_post(self, author="Alice", title="Post"):
+        return self.posts.create_post(PostCreate(title=title, content="Content", author=author))
+
+    def test_post_crud(self):
+        """Test creating, reading, updating and deleting a post."""
+        post = self._create_post()
+        self.comments.create_comment(CommentCreate(content="Hi", author="Bob"), post_id=post.id)
+
+        loaded = self.posts.get_post(post.id)
+        self.assertEqual(loaded.title, "Post")
+        self.assertEqual([comment.author for comment in loaded.comments], ["Bob"])
+
+        updated = self.posts.update_post(post.id, PostUpdate(title="Renamed"))
+        self.assertEqual(updated.title, "Renamed")
+        self.assertIsNotNone(updated.updated_at)
+
+        self.assertTrue(self.posts.post_exists(post.id))
+        self.assertTrue(self.posts.delete_post(post.id))
+        self.assertFalse(self.posts.post_exists(post.id))
+        self.assertIsNone(self.posts.get_post(post.id))
+        self.assertEqual(self.comments.get_comments_for_post(post.id), [])
+        self.assertFalse(self.posts.delete_post(post.id))
+
+    def test_post_list_pagination_and_counts(self):
+        """Test list pages follow creation order and carry comment counts."""
+        created = [self._create_post(title=f"Post {i}") for i in range(5)]
+        self.comments.create_comment(CommentCreate(content="Hi", author="Bob"), post_id=created[3].id)
+
+        page = self.posts.get_post_list(skip=2, limit=2)
+
+        self.assertEqual([row.id for row in page], [created[2].id, created[3].id])
+        self.assertEqual(page[1].comment_count, 1)
+        self.assertEqual(self.posts.get_posts_count(), 5)
+
+    def test_comment_threads(self):
+        """Test threads come back depth first and deletes take the whole subtree."""
+        post = self._create_post()
+        root = self.comments.create_comment(CommentCreate(content="Hi", author="Bob"), post_id=post.id)
+        child = self.comments.create_comment(
+            CommentCreate(content="Re", author="Carol", parent_id=root.id), post_id=post.id
+        )
+        other = self.comments.create_comment(CommentCreate(content="Hey", author="Dan"), post_id=post.id)
+        grandchild = self.comments.create_comment(
+            CommentCreate(content="Re re", author="Bob", parent_id=child.id), post_id=post.id
+        )
+
+        self.assertEqual([row.id for row in self.comments.get_comment_thread(root.id)],
+                         [root.id, child.id, grandchild.id])
+        self.assertEqual([row.id for row in self.comments.get_comment_tree(post.id, max_depth=1)],
+                         [root.id, child.id, other.id])
+        with self.assertRaises(ValueError):
+            self.comments.create_comment(CommentCreate(content="?", author="Bob", parent_id=99), post_id=post.id)
+
+        self.assertTrue(self.comments.delete_comment(child.id))
+        self.assertEqual([row.id for row in self.comments.get_comments_for_post(post.id)], [root.id, other.id])
+        self.assertEqual(self.authors.get_author_stats("Bob").comment_count, 1)
+
+    def test_comment_update_and_delete(self):
+        """Test comment changes are reflected in the post's comments."""
+        post = self._create_post()
+        comment = self.comments.create_comment(CommentCreate(content="Hi", author="Bob"), post_id=post.id)
+
+        self.assertEqual(self.comments.update_comment(comment.id, CommentUpdate(content="Edited")).content, "Edited")
+        self.assertEqual(self.comments.get_comments_count_for_post(post.id), 1)
+        self.assertTrue(self.comments.delete_comment(comment.id))
+        self.assertIsNone(self.comments.get_comment(comment.id))
+        self.assertEqual(self.comments.get_comments_count_for_post(post.id), 0)
+
+    def test_author_feed_and_stats(self):
+        """Test the author feed pages newest first and stats follow writes."""
+        created = [self._create_post(title=f"Post {i}") for i in range(5)]
+        self._create_post(author="Bob")
+        self.posts.update_post(created[0].id, PostUpdate(author="Bob"))
+
+        seen, cursor = [], None
+        while True:
+            rows, cursor = self.authors.get_posts_by_author("Alice", limit=2, cursor=cursor)
+            seen.extend(post.id for post, _ in rows)
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, [post.id for post in reversed(created[1:])])
+        self.assertEqual(self.authors.get_author_stats("Alice").post_count, 4)
+        self.assertEqual(self.authors.get_author_stats("Bob").post_count, 2)
+        self.assertEqual(self.authors.rebuild_author_stats(), 2)
+        self.assertEqual(self.authors.get_author_stats("Bob").post_count, 2)
+
+        with self.assertRaises(ValueError):
+            self.authors.get_posts_by_author("Alice", cursor="bogus")
+
+
+class TestApiOnMemoryBackend(unittest.TestCase):
+    """Test the API end to end on the in-memory backend."""
+
+    def setUp(self):
+        """Point the routes at a fresh in-memory store."""
+        posts, comments, authors = create_repositories("memory")
+        for name, repository in (
+            ("post_repository", posts), ("comment_repository", comments), ("author_repository", authors)
+        ):
+            patcher = patch(f"src.api.routes.{name}", repository)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def test_post_and_comment_flow(self):
+        """Test creating a post and comment and reading them back."""
+        response = self.client.post("/posts", json={"title": "Hello", "content": "World", "author": "Alice"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        post_id = response.json()["id"]
+
+        response = self.client.post(f"/posts/{post_id}/comments", json={"content": "Nice", "author": "Bob"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        post = self.client.get(f"/posts/{post_id}").json()
+        self.assertEqual(post["comments"][0]["content"], "Nice")
+        self.assertEqual(self.client.get("/posts").json()[0]["comment_count"], 1)
+        self.assertEqual(self.client.get("/authors/Bob/stats").json()["comment_count"], 1)
+
+        reply = self.client.post(
+            f"/posts/{post_id}/comments", json={"content": "Thanks", "author": "Alice", "parent_id": 1}
+        ).json()
+        self.assertEqual(reply["depth"], 1)
+        tree = self.client.get(f"/posts/{post_id}/comments/tree").json()
+        self.assertEqual(tree[0]["replies"][0]["id"], reply["id"])
+        self.assertEqual(self.client.get("/comments/1/thread?max_depth=0").json()["replies"], [])
+        self.assertEqual(
+            self.client.post(
+                f"/posts/{post_id}/comments", json={"content": "?", "author": "Bob", "parent_id": 99}
+            ).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+        lookup = self.client.post("/posts/lookup", json={"ids": [99, post_id], "include_comments": True}).json()
+        self.assertEqual([item["id"] for item in lookup["items"]], [post_id])
+        self.assertEqual(lookup["items"][0]["comments"][0]["content"], "Nice")
+        self.assertEqual(lookup["missing"], [99])
+
+        self.assertEqual(self.client.delete(f"/posts/{post_id}").status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(f"/posts/{post_id}").status_code, status.HTTP_404_NOT_FOUND)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -244,7 +244,8 @@ class TestModelSerialization(unittest.TestCase):
         json_data = comment.model_dump()
         expected = {
             "content": "Test comment",
-            "author": "Test Author"
+            "author": "Test Author",
+            "parent_id": None
         }
         
         self.assertEqual(json_data, expected)
@@ -0,0 +1,108 @@
+"""
+Unit tests for per-route statement time budgets.
+"""
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from src.core.query_budget import (
+    QueryBudgetExceeded,
+    QueryBudgets,
+    _route_budget,
+    install_query_budget,
+    query_budgets,
+)
+from src.main import app
+
+# Counts to a hundred million: seconds of work unless it is interrupted
+SLOW_QUERY = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000) "
+    "SELECT count(*) FROM c"
+)
+FAST_QUERY = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 1000) SELECT count(*) FROM c"
+
+
+def _engine(budgets):
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    install_query_budget(engine, budgets)
+    return engine
+
+
+class TestQueryBudget(unittest.TestCase):
+    """Test statements are interrupted once past the request's budget."""
+
+    def setUp(self):
+        self.budgets = QueryBudgets(read_ms=50, write_ms=50)
+        self.engine = _engine(self.budgets)
+        self.addCleanup(self.engine.dispose)
+
+    def test_slow_statement_is_interrupted(self):
+        """Test a statement over budget raises QueryBudgetExceeded and is counted; the connection stays usable."""
+        token = _route_budget.set(("GET /slow", 0.05))
+        self.addCleanup(_route_budget.reset, token)
+        started = time.monotonic()
+
+        with self.engine.connect() as connection:
+            with self.assertRaises(QueryBudgetExceeded) as raised:
+                connection.exec_driver_sql(SLOW_QUERY).scalar()
+            self.assertEqual(connection.exec_driver_sql(FAST_QUERY).scalar(), 1000)
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(raised.exception.route, "GET /slow")
+        self.assertEqual(self.budgets.stats()["GET /slow"]["aborted"], 1)
+
+    def test_no_budget_outside_requests(self):
+        """Test statements run without a request context are never interrupted."""
+        with self.engine.connect() as connection:
+            self.assertEqual(connection.exec_driver_sql(FAST_QUERY).scalar(), 1000)
+
+    def test_route_overrides(self):
+        """Test per-route budgets take precedence over the read/write defaults."""
+        budgets = QueryBudgets(read_ms=1000, write_ms=2000, route_budgets={"GET /posts": 0})
+
+        self.assertEqual(budgets.budget_for("GET", "/posts"), 0)
+        self.assertEqual(budgets.budget_for("GET", "/posts/{post_id}"), 1000)
+        self.assertEqual(budgets.budget_for("POST", "/posts"), 2000)
+
+
+class TestQueryBudgetRoute(unittest.TestCase):
+    """Test an aborted statement is answered with 504."""
+
+    def setUp(self):
+        engine = _engine(query_budgets)
+        self.addCleanup(engine.dispose)
+
+        def slow_list(**kwargs):
+            with engine.connect() as connection:
+                connection.exec_driver_sql(SLOW_QUERY).scalar()
+
+        repository = MagicMock()
+        repository.get_post_list.side_effect = slow_list
+        for patcher in (
+            patch("src.api.routes.post_repository", repository),
+            patch.dict(query_budgets.route_budgets, {"GET /posts": 50}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def test_returns_504_and_counts_abort(self):
+        """Test the client gets 504 and the route's abort counter goes up."""
+        before = query_budgets.stats().get("GET /posts", {}).get("aborted", 0)
+
+        response = self.client.get("/posts")
+
+        self.assertEqual(response.status_code, status.HTTP_504_GATEWAY_TIMEOUT)
+        stats = self.client.get("/debug/query-budgets").json()["GET /posts"]
+        self.assertEqual((stats["budget_ms"], stats["aborted"]), (50, before + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
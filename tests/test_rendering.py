@@ -0,0 +1,166 @@
+"""
+Unit tests for server-side Markdown rendering.
+"""
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.core.database import Base
+from src.core.rendering import MarkdownCache, _render_builtin, _render_with_library, markdown, markdown_cache
+from src.main import app
+from src.models.pydantic_models import PostCreate, PostUpdate
+from src.repositories.factory import create_repositories
+from src.repositories.repository import PostRepository
+
+
+class TestBuiltinRenderer(unittest.TestCase):
+    """Test cases for the built-in Markdown renderer."""
+
+    def test_renders_common_markup(self):
+        """Test headings, emphasis, code, lists and links."""
+        html = _render_builtin(
+            "# Title\n\nSome **bold**, *italic* and `a<b`.\n\n- one\n- [two](https://example.com/?a=1&b=2)"
+        )
+
+        self.assertEqual(html, (
+            "<h1>Title</h1>\n"
+            "<p>Some <strong>bold</strong>, <em>italic</em> and <code>a&lt;b</code>.</p>\n"
+            '<ul><li>one</li><li><a href="https://example.com/?a=1&amp;b=2">two</a></li></ul>'
+        ))
+
+    def test_escapes_raw_html_and_unsafe_links(self):
+        """Test posts cannot inject markup or script URLs."""
+        html = _render_builtin('<script>alert(1)</script> [x](javascript:alert(1)) [y](&#106;avascript:1) snake_case_name')
+
+        self.assertEqual(html, "<p>&lt;script&gt;alert(1)&lt;/script&gt; x y snake_case_name</p>")
+
+    def test_link_urls_with_parentheses(self):
+        """Test balanced parentheses stay part of the URL."""
+        html = _render_builtin("[w](https://en.wikipedia.org/wiki/Foo_(bar)).")
+
+        self.assertEqual(html, '<p><a href="https://en.wikipedia.org/wiki/Foo_(bar)">w</a>.</p>')
+
+    def test_fenced_code_is_left_verbatim(self):
+        """Test markup inside fenced code blocks is escaped, not rendered."""
+        html = _render_builtin("```\n**not bold** <b>\n```")
+
+        self.assertEqual(html, "<pre><code>**not bold** &lt;b&gt;</code></pre>")
+
+
+@unittest.skipIf(markdown is None, "the markdown package is not installed")
+class TestLibraryRenderer(unittest.TestCase):
+    """Test cases for rendering with the markdown package."""
+
+    def test_escapes_raw_html_and_unsafe_urls(self):
+        """Test the library output gets the same raw HTML escaping and scheme allow-list."""
+        html = _render_with_library(
+            '<script>alert(1)</script> [x](javascript:alert(1)) [y](&#106;avascript:alert(1)) ![i](data:x)'
+        )
+
+        self.assertNotIn("<script>", html)
+        self.assertNotIn("href", html)
+        self.assertNotIn("src", html)
+
+    def test_safe_urls_are_kept(self):
+        """Test http(s), mailto and relative URLs, with parentheses, survive the filter."""
+        html = _render_with_library("[w](https://en.wikipedia.org/wiki/Foo_(bar)) [r](/posts/1) ![i](img.png)")
+
+        self.assertIn('href="https://en.wikipedia.org/wiki/Foo_(bar)"', html)
+        self.assertIn('href="/posts/1"', html)
+        self.assertIn('src="img.png"', html)
+
+
+class TestMarkdownCache(unittest.TestCase):
+    """Test cases for MarkdownCache."""
+
+    def test_renders_each_source_once(self):
+        """Test repeated content is served from the cache and the LRU stays bounded."""
+        calls = []
+        cache = MarkdownCache(capacity=2, renderer=lambda source: calls.append(source) or source.upper())
+
+        self.assertEqual(cache.render("a"), "A")
+        cache.render("a")
+        cache.render("b")
+        cache.render("c")
+        cache.render("a")
+
+        self.assertEqual(calls, ["a", "b", "c", "a"])
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["cached"]), (1, 4, 2))
+
+
+class TestPersistedHtml(unittest.TestCase):
+    """Test the rendered HTML column written by PostRepository."""
+
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(self.engine)
+        patcher = patch('src.repositories.repository.SessionLocal', sessionmaker(bind=self.engine))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repository = PostRepository()
+
+    def stored_html(self, post_id):
+        with self.engine.connect() as connection:
+            return connection.execute(text("SELECT content_html FROM posts WHERE id = :id"), {"id": post_id}).scalar()
+
+    def test_html_is_rendered_on_write(self):
+        """Test creates and edits store fresh HTML, and title-only edits keep it."""
+        with patch('src.repositories.repository.settings.markdown_persist_html', True):
+            post = self.repository.create_post(PostCreate(title="T", content="**a**", author="A"))
+            self.assertEqual(self.stored_html(post.id), "<p><strong>a</strong></p>")
+
+            self.repository.update_post(post.id, PostUpdate(content="*b*"))
+            self.assertEqual(self.stored_html(post.id), "<p><em>b</em></p>")
+
+            self.repository.update_post(post.id, PostUpdate(title="T2"))
+            self.assertEqual(self.stored_html(post.id), "<p><em>b</em></p>")
+
+        self.repository.update_post(post.id, PostUpdate(content="c"))
+        self.assertIsNone(self.stored_html(post.id))
+
+
+class TestHtmlFormatRoutes(unittest.TestCase):
+    """Test format=html on the in-memory backend."""
+
+    def setUp(self):
+        posts, comments, authors = create_repositories("memory")
+        for name, repository in (
+            ("post_repository", posts), ("comment_repository", comments), ("author_repository", authors)
+        ):
+            patcher = patch(f"src.api.routes.{name}", repository)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+        self.post = posts.create_post(PostCreate(title="T", content="# Hi", author="A"))
+
+    def test_single_post_and_list(self):
+        """Test both read endpoints return rendered content only when asked to."""
+        hits = markdown_cache.hits
+
+        single = self.client.get(f"/posts/{self.post.id}", params={"format": "html"})
+        listed = self.client.get("/posts", params={"format": "html"})
+
+        self.assertEqual(single.status_code, status.HTTP_200_OK)
+        self.assertEqual(single.json()["content"], "<h1>Hi</h1>")
+        self.assertEqual(listed.json()[0]["content"], "<h1>Hi</h1>")
+        # Rendered when the post was created; both reads hit the cache
+        self.assertEqual(markdown_cache.hits - hits, 2)
+        self.assertEqual(self.client.get(f"/posts/{self.post.id}").json()["content"], "# Hi")
+
+    def test_unknown_format_is_rejected(self):
+        """Test only markdown and html are accepted."""
+        response = self.client.get("/posts", params={"format": "pdf"})
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,14 @@
 import unittest
 from unittest.mock import Mock, patch
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from src.repositories.repository import PostRepository, CommentRepository
-from src.models.pydantic_models import PostCreate, PostUpdate, CommentCreate
-from src.models.db_models import Post, Comment
+from src.core.database import Base
+from src.repositories.repository import PostRepository, CommentRepository, AuthorRepository
+from src.models.pydantic_models import PostCreate, PostUpdate, CommentCreate, CommentUpdate
+from src.models.db_models import Post
+from src.models.read_models import CommentRow, PostListRow
 
 
 class TestPostRepository(unittest.TestCase):
@@ -86,6 +90,20 @@ class TestPostRepository(unittest.TestCase):
         mock_session.close.assert_called_once()
         self.assertEqual(result, mock_posts)
 
+    @patch('src.repositories.repository.SessionLocal')
+    def test_get_post_list(self, mock_session_local):
+        """Test getting a page of posts as lightweight rows."""
+        mock_session = Mock(spec=Session)
+        mock_session_local.return_value = mock_session
+        mock_session.execute.return_value = [(1, "Title", "Content", "Author", None, None, 3, 0, None)]
+
+        result = self.repository.get_post_list(skip=0, limit=10)
+
+        mock_session.execute.assert_called_once()
+        mock_session.close.assert_called_once()
+        self.assertIsInstance(result[0], PostListRow)
+        self.assertEqual(result[0].comment_count, 3)
+
     @patch('src.repositories.repository.SessionLocal')
     def test_update_post(self, mock_session_local):
         """Test updating a post."""
@@ -113,6 +131,8 @@ class TestPostRepository(unittest.TestCase):
         mock_session_local.return_value = mock_session
         
         mock_post = Mock(spec=Post)
+        mock_post.author = "Test Author"
+        mock_post.comments = []
         mock_session.query.return_value.filter.return_value.first.return_value = mock_post
         
         result = self.repository.delete_post(1)
@@ -154,8 +174,12 @@ class TestCommentRepository(unittest.TestCase):
             content="Test comment",
             author="Test Author"
         )
-        
-        self.repository.create_comment(comment_data, post_id=1)
+        # Stand in for the insert assigning the id
+        mock_session.flush.side_effect = lambda: setattr(mock_session.add.call_args[0][0], "id", 1)
+
+        comment = self.repository.create_comment(comment_data, post_id=1)
+
+        self.assertEqual((comment.path, comment.depth), ("0000000001/", 0))
         
         mock_session.add.assert_called_once()
         mock_session.commit.assert_called_once()
@@ -168,14 +192,18 @@ class TestCommentRepository(unittest.TestCase):
         mock_session = Mock(spec=Session)
         mock_session_local.return_value = mock_session
         
-        mock_comments = [Mock(spec=Comment), Mock(spec=Comment)]
-        mock_session.query.return_value.filter.return_value.all.return_value = mock_comments
+        rows = [
+            (1, 1, "First", "Author 1", None, None, None, "0000000001/", 0),
+            (2, 1, "Second", "Author 2", None, None, 1, "0000000001/0000000002/", 1),
+        ]
+        mock_session.execute.return_value = rows
         
         result = self.repository.get_comments_for_post(1)
         
-        mock_session.query.assert_called_once()
+        mock_session.execute.assert_called_once()
         mock_session.close.assert_called_once()
-        self.assertEqual(result, mock_comments)
+        self.assertEqual(result, [CommentRow._make(row) for row in rows])
+        self.assertEqual(result[1].author, "Author 2")
 
     @patch('src.repositories.repository.SessionLocal')
     def test_get_comments_count_for_post(self, mock_session_local):
@@ -191,5 +219,182 @@ class TestCommentRepository(unittest.TestCase):
         mock_session.close.assert_called_once()
 
 
+class TestAuthorRepository(unittest.TestCase):
+    """Test cases for AuthorRepository against an in-memory database."""
+
+    def setUp(self):
+        """Set up an in-memory database shared by all repositories."""
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(engine)
+        patcher = patch(
+            'src.repositories.repository.SessionLocal',
+            sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.posts = PostRepository()
+        self.comments = CommentRepository()
+        self.repository = AuthorRepository()
+
+    def _create_post(self, author, title="Post"):
+        return self.posts.create_post(PostCreate(title=title, content="Content", author=author))
+
+    def test_posts_by_author_keyset_pagination(self):
+        """Test paging through an author's feed returns every post exactly once."""
+        created = [self._create_post("Alice", title=f"Post {i}") for i in range(5)]
+        self._create_post("Bob")
+        self.comments.create_comment(CommentCreate(content="Nice", author="Bob"), post_id=created[0].id)
+
+        seen, cursor = [], None
+        while True:
+            rows, cursor = self.repository.get_posts_by_author("Alice", limit=2, cursor=cursor)
+            seen.extend(rows)
+            if cursor is None:
+                break
+
+        # Posts share a created_at second, so ordering falls back to id
+        self.assertEqual([post.id for post, _ in seen], [post.id for post in reversed(created)])
+        self.assertEqual(dict((post.id, count) for post, count in seen)[created[0].id], 1)
+
+    def test_posts_by_author_invalid_cursor(self):
+        """Test a malformed cursor raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.repository.get_posts_by_author("Alice", cursor="not-a-cursor")
+
+    def test_author_stats_follow_writes(self):
+        """Test rollups track creates, author changes and cascading deletes."""
+        post = self._create_post("Alice")
+        comment = self.comments.create_comment(CommentCreate(content="Hi", author="Bob"), post_id=post.id)
+        self.comments.create_comment(CommentCreate(content="Me too", author="Carol"), post_id=post.id)
+        self.comments.update_comment(comment.id, CommentUpdate(author="Carol"))
+
+        alice = self.repository.get_author_stats("Alice")
+        self.assertEqual((alice.post_count, alice.comment_count), (1, 0))
+        self.assertIsNotNone(alice.last_activity_at)
+        self.assertEqual(self.repository.get_author_stats("Bob").comment_count, 0)
+        self.assertEqual(self.repository.get_author_stats("Carol").comment_count, 2)
+
+        self.posts.delete_post(post.id)
+        self.assertEqual(self.repository.get_author_stats("Alice").post_count, 0)
+        self.assertEqual(self.repository.get_author_stats("Carol").comment_count, 0)
+
+    def test_rebuild_author_stats(self):
+        """Test rebuilding rollups from the base tables."""
+        post = self._create_post("Alice")
+        self.comments.create_comment(CommentCreate(content="Hi", author="Alice"), post_id=post.id)
+
+        self.assertEqual(self.repository.rebuild_author_stats(), 1)
+        stats = self.repository.get_author_stats("Alice")
+        self.assertEqual((stats.post_count, stats.comment_count), (1, 1))
+
+
+class TestPostLookup(unittest.TestCase):
+    """Test cases for multi-get of posts against an in-memory database."""
+
+    def setUp(self):
+        """Set up an in-memory database shared by all repositories."""
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(engine)
+        patcher = patch(
+            'src.repositories.repository.SessionLocal',
+            sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.posts = PostRepository()
+        self.comments = CommentRepository()
+
+    def test_get_posts_by_ids_keeps_requested_order(self):
+        """Test posts come back in request order, deduplicated, without missing ids."""
+        first, second = (self.posts.create_post(PostCreate(title=t, content="C", author="A")) for t in "12")
+        self.comments.create_comment(CommentCreate(content="Hi", author="Bob"), post_id=first.id)
+
+        rows = self.posts.get_posts_by_ids([second.id, 999, first.id, second.id])
+
+        self.assertEqual([row.id for row in rows], [second.id, first.id])
+        self.assertEqual(rows[1].comment_count, 1)
+        self.assertIsNone(rows[1].comments)
+
+    def test_get_posts_by_ids_with_comments(self):
+        """Test comments are loaded for every found post when requested."""
+        post = self.posts.create_post(PostCreate(title="T", content="C", author="A"))
+        empty = self.posts.create_post(PostCreate(title="U", content="C", author="A"))
+        for text in ("one", "two"):
+            self.comments.create_comment(CommentCreate(content=text, author="Bob"), post_id=post.id)
+
+        rows = self.posts.get_posts_by_ids([post.id, empty.id], include_comments=True)
+
+        self.assertEqual([comment.content for comment in rows[0].comments], ["one", "two"])
+        self.assertEqual(rows[1].comments, [])
+
+
+class TestCommentThreads(unittest.TestCase):
+    """Test cases for threaded comments against an in-memory database."""
+
+    def setUp(self):
+        """Set up an in-memory database with one post."""
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(engine)
+        patcher = patch(
+            'src.repositories.repository.SessionLocal',
+            sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.comments = CommentRepository()
+        self.authors = AuthorRepository()
+        self.post = PostRepository().create_post(PostCreate(title="T", content="C", author="A"))
+
+    def _reply(self, parent=None, author="Bob"):
+        comment = CommentCreate(content="Hi", author=author, parent_id=parent.id if parent else None)
+        return self.comments.create_comment(comment, post_id=self.post.id)
+
+    def test_thread_is_one_subtree_in_order(self):
+        """Test a thread returns the comment and all its replies, depth first."""
+        root = self._reply()
+        child = self._reply(root)
+        other = self._reply()
+        grandchild = self._reply(child)
+        sibling = self._reply(root)
+
+        thread = self.comments.get_comment_thread(root.id)
+
+        self.assertEqual([row.id for row in thread], [root.id, child.id, grandchild.id, sibling.id])
+        self.assertEqual([row.depth for row in thread], [0, 1, 2, 1])
+        self.assertEqual([row.id for row in self.comments.get_comment_thread(root.id, max_depth=1)],
+                         [root.id, child.id, sibling.id])
+        self.assertEqual([row.id for row in self.comments.get_comment_tree(self.post.id, max_depth=0)],
+                         [root.id, other.id])
+
+    def test_reply_to_comment_on_other_post_is_rejected(self):
+        """Test a parent must belong to the same post."""
+        other_post = PostRepository().create_post(PostCreate(title="U", content="C", author="A"))
+        foreign = self.comments.create_comment(CommentCreate(content="Hi", author="Bob"), post_id=other_post.id)
+
+        with self.assertRaises(ValueError):
+            self._reply(foreign)
+
+    def test_delete_removes_subtree(self):
+        """Test deleting a comment removes its replies and their authors' counts."""
+        root = self._reply(author="Bob")
+        self._reply(self._reply(root, author="Carol"), author="Carol")
+        kept = self._reply(author="Carol")
+
+        self.assertTrue(self.comments.delete_comment(root.id))
+
+        self.assertEqual([row.id for row in self.comments.get_comment_tree(self.post.id)], [kept.id])
+        self.assertEqual(self.authors.get_author_stats("Bob").comment_count, 0)
+        self.assertEqual(self.authors.get_author_stats("Carol").comment_count, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
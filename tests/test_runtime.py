@@ -0,0 +1,124 @@
+"""
+Unit tests for runtime health: loop lag, pool use and slow-request traces.
+"""
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from src.core.runtime import RuntimeMonitor, runtime_monitor
+from src.main import app
+from src.models.pydantic_models import PostCreate
+from src.repositories.factory import create_repositories
+
+
+class TestLoopLag(unittest.TestCase):
+    """Test the lag sampler notices a blocked event loop."""
+
+    def test_blocking_call_fails_readiness(self):
+        """Test a sync sleep on the loop is measured as lag and crosses the threshold."""
+        monitor = RuntimeMonitor(lag_interval=0.01, lag_window=50, max_loop_lag_ms=100)
+
+        async def run():
+            monitor.start()
+            await asyncio.sleep(0.05)
+            self.assertTrue(monitor.readiness()["ready"])
+            time.sleep(0.2)  # what a sync database call inside an async route does
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+
+        asyncio.run(run())
+
+        readiness = monitor.readiness()
+        self.assertGreaterEqual(monitor.loop_lag()["max_ms"], 150)
+        self.assertFalse(readiness["ready"])
+        self.assertIn("event loop lag", readiness["failures"][0])
+
+
+class TestEngineInstrumentation(unittest.TestCase):
+    """Test pool checkouts and statement timings."""
+
+    def setUp(self):
+        self.monitor = RuntimeMonitor(max_pool_saturation=0.5)
+        self.engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=1)
+        self.addCleanup(self.engine.dispose)
+        self.monitor.instrument_engine(self.engine)
+
+    def test_pool_saturation(self):
+        """Test checked-out connections are measured against pool size plus overflow."""
+        with self.engine.connect():
+            pool = self.monitor.pool()
+            self.assertEqual((pool["checked_out"], pool["capacity"], pool["saturation"]), (1, 2, 0.5))
+            self.assertFalse(self.monitor.readiness()["ready"])
+
+        self.assertEqual(self.monitor.pool()["checked_out"], 0)
+        self.assertEqual(self.monitor.pool()["peak_checked_out"], 1)
+        self.assertTrue(self.monitor.readiness()["ready"])
+
+    def test_statements_are_charged_to_the_request(self):
+        """Test statement time goes to the current request, and is flagged when run on the loop thread."""
+        self.monitor._loop_thread = threading.get_ident()
+        trace, token = self.monitor.begin_request("GET", "/posts", "/posts")
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1").scalar()
+            connection.exec_driver_sql("SELECT 2").scalar()
+        self.monitor.end_request(trace, token, time.perf_counter())
+
+        self.assertEqual(trace.statements, 2)
+        self.assertGreater(trace.db_ms, 0)
+        self.assertEqual(trace.loop_db_ms, trace.db_ms)
+        self.assertEqual(self.monitor.stats()["loop_statements"], 2)
+
+
+class TestRuntimeRoutes(unittest.TestCase):
+    """Test /health/ready and /debug/runtime on the in-memory backend."""
+
+    def setUp(self):
+        posts, comments, authors = create_repositories("memory")
+        for name, repository in (
+            ("post_repository", posts), ("comment_repository", comments), ("author_repository", authors)
+        ):
+            patcher = patch(f"src.api.routes.{name}", repository)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+        self.post = posts.create_post(PostCreate(title="T", content="C", author="A"))
+
+    def test_ready(self):
+        """Test a healthy worker answers 200."""
+        response = self.client.get("/health/ready")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()["ready"])
+
+    def test_not_ready_when_pool_is_saturated(self):
+        """Test readiness answers 503 with the failed check once the pool is nearly exhausted."""
+        pool = {"checked_out": 10, "peak_checked_out": 10, "capacity": 10, "saturation": 1.0, "checkouts": 10}
+        with patch.object(runtime_monitor, "pool", return_value=pool):
+            response = self.client.get("/health/ready")
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("connection pool saturation", response.json()["failures"][0])
+
+    def test_slow_requests_are_traced(self):
+        """Test requests over SLOW_REQUEST_MS show up in /debug/runtime, newest first."""
+        with patch.object(runtime_monitor, "slow_request_ms", 0):
+            self.client.get(f"/posts/{self.post.id}")
+            stats = self.client.get("/debug/runtime").json()
+
+        trace = stats["recent_slow_requests"][0]
+        self.assertEqual(
+            (trace["method"], trace["path"], trace["route"], trace["status"]),
+            ("GET", f"/posts/{self.post.id}", "/posts/{post_id}", 200)
+        )
+        self.assertEqual(stats["in_flight"], 1)  # the /debug/runtime request itself
+
+
+if __name__ == '__main__':
+    unittest.main()
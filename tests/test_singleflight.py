@@ -0,0 +1,77 @@
+"""
+Unit tests for single-flight read coalescing.
+"""
+import threading
+import time
+import unittest
+
+from src.core.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test callers arriving while a call is in flight share its result."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        executions = []
+
+        def load():
+            executions.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return "post"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("post:1", load)))
+        leader.start()
+        started.wait(timeout=5)
+
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("post:1", load)))
+            for _ in range(5)
+        ]
+        for follower in followers:
+            follower.start()
+        deadline = time.monotonic() + 5
+        while flight.stats()["collapsed"] < 5:
+            if time.monotonic() > deadline:
+                release.set()
+                self.fail("followers did not join the in-flight call")
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(timeout=5)
+
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(results, ["post"] * 6)
+        self.assertEqual(flight.stats()["collapsed"], 5)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_sequential_calls_are_not_cached(self):
+        """Test a finished call is not reused by later callers."""
+        flight = SingleFlight()
+        calls = []
+
+        flight.do("key", calls.append, 1)
+        flight.do("key", calls.append, 2)
+
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(flight.stats()["executions"], 2)
+
+    def test_exception_is_propagated_and_cleared(self):
+        """Test a failing call raises and does not stay in flight."""
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            flight.do("key", fail)
+        self.assertEqual(flight.in_flight(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Unit tests for pre-serialized post snapshots.
+"""
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.routes import _encode_post
+from src.core.database import Base
+from src.core.snapshots import SnapshotStore, post_snapshots
+from src.main import app
+from src.models.pydantic_models import CommentCreate, PostCreate, PostUpdate
+from src.repositories.factory import create_repositories
+from src.repositories.repository import PostRepository
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Test cases for SnapshotStore."""
+
+    def test_read_older_than_an_invalidation_is_not_stored(self):
+        """Test a body read before the post changed is served once but never cached."""
+        store = SnapshotStore(capacity=10)
+        token = store.begin()
+        store.invalidate(1)
+
+        self.assertFalse(store.put(1, b"{}", token))
+        self.assertIsNone(store.get(1))
+        self.assertTrue(store.put(1, b"{}", store.begin()))
+        self.assertEqual(store.get(1), b"{}")
+
+    def test_expired_bodies_are_rebuilt(self):
+        """Test bodies older than the TTL are treated as missing."""
+        store = SnapshotStore(capacity=10, ttl=0)
+        store.put(1, b"{}", store.begin())
+
+        with patch("src.core.snapshots.time.time", return_value=1e12):
+            self.assertIsNone(store.get(1))
+
+    def test_persisted_bodies_are_shared(self):
+        """Test another store (another worker) loads a body from the table until it is invalidated."""
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'blog.db')}")
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(bind=engine)
+        first = SnapshotStore(capacity=10, persist=True, bind=engine)
+        second = SnapshotStore(capacity=10, persist=True, bind=engine)
+        first.get_or_build(1, lambda post_id: b'{"id":1}')
+
+        self.assertEqual(second.get_or_build(1, self.fail), b'{"id":1}')
+        self.assertEqual(second.stats()["loaded"], 1)
+
+        first.invalidate(1)
+        self.assertIsNone(SnapshotStore(capacity=10, persist=True, bind=engine).get_or_build(1, lambda _: None))
+
+
+class TestSnapshotBuild(unittest.TestCase):
+    """Test snapshot bodies are built from fresh loads on the SQLite backend."""
+
+    def setUp(self):
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(engine)
+        self.posts = PostRepository()
+        for patcher in (
+            patch('src.repositories.repository.SessionLocal', sessionmaker(bind=engine)),
+            patch("src.api.routes.post_repository", self.posts),
+            patch.object(post_snapshots, "capacity", 10),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(post_snapshots.clear)
+
+    def test_build_does_not_join_a_load_older_than_a_write(self):
+        """Test a coalesced load that read the post before an edit is not stored as its snapshot."""
+        post = self.posts.create_post(PostCreate(title="Old", content="C", author="A"))
+        loaded, release = threading.Event(), threading.Event()
+        load = self.posts._load_post
+
+        def slow_load(post_id, session_factory=None):
+            row = load(post_id, session_factory)
+            if threading.current_thread() is reader:
+                # Hold the in-flight load open, having read the post before the edit
+                loaded.set()
+                release.wait(5)
+            return row
+
+        self.posts._load_post = slow_load
+        reader = threading.Thread(target=self.posts.get_post, args=(post.id,))
+        reader.start()
+        self.assertTrue(loaded.wait(5))
+        self.posts.update_post(post.id, PostUpdate(title="New"))
+
+        built = []
+        builder = threading.Thread(target=lambda: built.append(post_snapshots.get_or_build(post.id, _encode_post)))
+        builder.start()
+        builder.join(1)
+        release.set()
+        builder.join(5)
+        reader.join(5)
+
+        self.assertEqual(json.loads(built[0])["title"], "New")
+        self.assertEqual(json.loads(post_snapshots.get(post.id))["title"], "New")
+
+
+class TestSnapshotRoute(unittest.TestCase):
+    """Test GET /posts/{post_id} served from snapshots on the in-memory backend."""
+
+    def setUp(self):
+        self.posts, self.comments, authors = create_repositories("memory")
+        for name, repository in (
+            ("post_repository", self.posts), ("comment_repository", self.comments), ("author_repository", authors)
+        ):
+            patcher = patch(f"src.api.routes.{name}", repository)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(post_snapshots, "capacity", 10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(post_snapshots.clear)
+        self.client = TestClient(app)
+        self.post = self.posts.create_post(PostCreate(title="T", content="Hello **there**", author="A"))
+
+    def _get(self, enabled=True):
+        if enabled:
+            return self.client.get(f"/posts/{self.post.id}")
+        with patch.object(post_snapshots, "capacity", 0):
+            return self.client.get(f"/posts/{self.post.id}")
+
+    def test_snapshot_matches_the_encoded_response(self):
+        """Test the stored bytes are exactly what the route returns without snapshots."""
+        self.comments.create_comment(CommentCreate(content="Hé ✓", author="B"), post_id=self.post.id)
+        expected = self._get(enabled=False)
+        hits = post_snapshots.stats()["hits"]
+
+        first, second = self._get(), self._get()
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, expected.content)
+        self.assertEqual(second.content, expected.content)
+        self.assertEqual(first.headers["content-type"], expected.headers["content-type"])
+        self.assertEqual(post_snapshots.stats()["hits"], hits + 1)
+
+    def test_changes_replace_the_snapshot(self):
+        """Test edits, comments and deletes are visible on the next read."""
+        self._get()
+        self.posts.update_post(self.post.id, PostUpdate(title="Renamed"))
+        self.assertEqual(self._get().json()["title"], "Renamed")
+
+        comment = self.comments.create_comment(CommentCreate(content="Hi", author="B"), post_id=self.post.id)
+        self.assertEqual([item["id"] for item in self._get().json()["comments"]], [comment.id])
+
+        self.comments.delete_comment(comment.id)
+        self.assertEqual(self._get().json()["comments"], [])
+
+        self.posts.delete_post(self.post.id)
+        self.assertEqual(self._get().status_code, status.HTTP_404_NOT_FOUND)
+
+
+if __name__ == '__main__':
+    unittest.main()
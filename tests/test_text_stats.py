@@ -0,0 +1,119 @@
+"""
+Unit tests for precomputed excerpts and reading stats.
+"""
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.core.database import Base
+from src.core.text_stats import PostStats, excerpt, plain_text, post_stats
+from src.main import app
+from src.models.db_models import Post
+from src.models.pydantic_models import PostCreate, PostUpdate
+from src.repositories.factory import create_repositories
+from src.repositories.repository import PostRepository
+from src.utils.backfill_post_stats import backfill_post_stats
+
+
+class TestPostStats(unittest.TestCase):
+    """Test cases for the stats computed from post content."""
+
+    def test_markdown_is_stripped(self):
+        """Test excerpts are plain text."""
+        self.assertEqual(
+            plain_text("# Title\n\nSome **bold** [link](https://example.com)\n- item"),
+            "Title Some bold link item"
+        )
+
+    def test_excerpt_breaks_on_a_word(self):
+        """Test long text is cut before the limit without splitting a word."""
+        self.assertEqual(excerpt("one two three four", 12), "one two…")
+        self.assertEqual(excerpt("short", 12), "short")
+
+    def test_reading_time_rounds_up(self):
+        """Test reading time is whole minutes, at least one for any text."""
+        self.assertEqual(post_stats("word " * 201, words_per_minute=200).reading_time_minutes, 2)
+        self.assertEqual(post_stats("Hi", words_per_minute=200), PostStats("Hi", 1, 1))
+
+    def test_content_without_words_takes_no_time(self):
+        """Test empty and markup-only content have no words and a reading time of 0."""
+        for content in ("", "**", "```\n```\n\n- \n> ", "![](https://example.com/a.png)"):
+            self.assertEqual(post_stats(content, words_per_minute=200), PostStats("", 0, 0), content)
+
+
+class TestStoredPostStats(unittest.TestCase):
+    """Test the stats columns written by PostRepository and the backfill job."""
+
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(self.engine)
+        session_factory = sessionmaker(bind=self.engine)
+        for target in ("src.repositories.repository.SessionLocal", "src.utils.backfill_post_stats.SessionLocal"):
+            patcher = patch(target, session_factory)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.repository = PostRepository()
+
+    def test_stats_follow_content_edits(self):
+        """Test stats are computed on create and recomputed when the content changes."""
+        post = self.repository.create_post(PostCreate(title="T", content="one two", author="A"))
+        self.repository.update_post(post.id, PostUpdate(content="one two three"))
+        self.repository.update_post(post.id, PostUpdate(title="Renamed"))
+
+        row = self.repository.get_post_excerpts()[0]
+
+        self.assertEqual((row.title, row.excerpt, row.word_count), ("Renamed", "one two three", 3))
+
+    def test_backfill_fills_missing_stats(self):
+        """Test the backfill only touches rows without stats and keeps updated_at."""
+        posts = [self.repository.create_post(PostCreate(title=t, content=f"{t} text", author="A")) for t in "ABC"]
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(Post)
+                .where(Post.id != posts[1].id)
+                .values(excerpt=None, word_count=None, reading_time_minutes=None, updated_at=None)
+            )
+
+        self.assertEqual(backfill_post_stats(batch_size=1), 2)
+        self.assertEqual(backfill_post_stats(), 0)
+
+        rows = self.repository.get_post_excerpts()
+        self.assertEqual([row.excerpt for row in rows], ["A text", "B text", "C text"])
+        self.assertTrue(all(row.updated_at is None for row in rows))
+
+
+class TestExcerptsRoute(unittest.TestCase):
+    """Test GET /posts/excerpts on the in-memory backend."""
+
+    def setUp(self):
+        posts, comments, authors = create_repositories("memory")
+        for name, repository in (
+            ("post_repository", posts), ("comment_repository", comments), ("author_repository", authors)
+        ):
+            patcher = patch(f"src.api.routes.{name}", repository)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+        post = posts.create_post(PostCreate(title="T", content="first draft", author="A"))
+        posts.update_post(post.id, PostUpdate(content="*Final* version, three words"))
+
+    def test_returns_excerpts_without_content(self):
+        """Test list items carry the stored stats and no content."""
+        response = self.client.get("/posts/excerpts")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        item = response.json()[0]
+        self.assertNotIn("content", item)
+        self.assertEqual(item["excerpt"], "Final version, three words")
+        self.assertEqual((item["word_count"], item["reading_time_minutes"]), (4, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
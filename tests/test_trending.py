@@ -0,0 +1,124 @@
+"""
+Unit tests for the trending posts leaderboard.
+"""
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.core.events import EventBus
+from src.core.trending import TrendingPosts, trending_posts
+from src.main import app
+from src.models.pydantic_models import CommentCreate, PostCreate
+from src.repositories.factory import create_repositories
+
+
+def _ago(seconds: float) -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=seconds)
+
+
+class TestTrendingPosts(unittest.TestCase):
+    """Test cases for TrendingPosts."""
+
+    def setUp(self):
+        self.trending = TrendingPosts(half_life=3600)
+
+    def test_recent_activity_ranks_higher(self):
+        """Test a fresh comment outweighs older ones past a few half-lives."""
+        for _ in range(3):
+            self.trending.record(1, _ago(3 * 3600))
+        self.trending.record(2, _ago(0))
+
+        ranked = self.trending.top(10)
+
+        self.assertEqual([post_id for post_id, _ in ranked], [2, 1])
+        self.assertAlmostEqual(ranked[0][1], 1.0, places=3)
+        self.assertAlmostEqual(ranked[1][1], 3 / 8, places=3)
+
+    def test_deleted_comment_is_taken_back(self):
+        """Test removing a comment's weight drops a post with no other activity."""
+        created_at = _ago(60)
+        self.trending.record(1, created_at)
+        self.trending.record(2, _ago(120))
+
+        self.trending.record(1, created_at, delta=-1)
+
+        self.assertEqual([post_id for post_id, _ in self.trending.top(10)], [2])
+        self.assertEqual(len(self.trending), 1)
+
+    def test_rebuild_matches_incremental_updates(self):
+        """Test rebuilding from stored activity gives the same ranking."""
+        activity = [(1, _ago(7200)), (2, _ago(10)), (1, _ago(5000)), (3, _ago(100))]
+        for post_id, created_at in activity:
+            self.trending.record(post_id, created_at)
+
+        rebuilt = TrendingPosts(half_life=3600)
+        self.assertEqual(rebuilt.rebuild(activity), 3)
+
+        self.assertEqual(
+            [post_id for post_id, _ in rebuilt.top(3)],
+            [post_id for post_id, _ in self.trending.top(3)]
+        )
+
+    def test_rebase_keeps_order(self):
+        """Test moving the landmark forward rescales scores without reordering them."""
+        self.trending.record(1, _ago(10))
+        self.trending.record(1, _ago(20))
+        self.trending.record(2, _ago(5))
+        before = self.trending.top(2)
+
+        self.trending._rebase(self.trending._landmark + 3600)
+
+        after = self.trending.top(2)
+        self.assertEqual([post_id for post_id, _ in after], [post_id for post_id, _ in before])
+        self.assertAlmostEqual(after[0][1], before[0][1], places=6)
+
+    def test_follows_event_bus(self):
+        """Test comment and post events update the leaderboard."""
+        bus = EventBus()
+        bus.add_listener(self.trending.on_event)
+
+        bus.publish(1, "comment.created", {"id": 1, "post_id": 1, "created_at": _ago(0)})
+        bus.publish(2, "comment.created", {"id": 2, "post_id": 2, "created_at": _ago(0)})
+        bus.publish(1, "post.deleted", {"id": 1})
+
+        self.assertEqual([post_id for post_id, _ in self.trending.top(10)], [2])
+
+
+class TestTrendingRoute(unittest.TestCase):
+    """Test GET /posts/trending on the in-memory backend."""
+
+    def setUp(self):
+        posts, comments, authors = create_repositories("memory")
+        self.posts, self.comments = posts, comments
+        for name, repository in (
+            ("post_repository", posts), ("comment_repository", comments), ("author_repository", authors)
+        ):
+            patcher = patch(f"src.api.routes.{name}", repository)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        trending_posts.rebuild([])
+        self.addCleanup(trending_posts.rebuild, [])
+        self.client = TestClient(app)
+
+    def test_trending_follows_comments(self):
+        """Test the most commented post comes first and deleted posts disappear."""
+        quiet, busy = (self.posts.create_post(PostCreate(title=t, content="C", author="A")) for t in "QB")
+        self.comments.create_comment(CommentCreate(content="Hi", author="Bob"), post_id=quiet.id)
+        for _ in range(2):
+            self.comments.create_comment(CommentCreate(content="Hi", author="Bob"), post_id=busy.id)
+
+        response = self.client.get("/posts/trending")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.json()], [busy.id, quiet.id])
+        self.assertEqual(response.json()[0]["comment_count"], 2)
+
+        self.posts.delete_post(busy.id)
+        self.assertEqual([item["id"] for item in self.client.get("/posts/trending").json()], [quiet.id])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unit tests for buffered view counters.
+"""
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.core.database import Base
+from src.core.view_counts import ViewCounter
+from src.models.pydantic_models import PostCreate
+from src.repositories.factory import create_repositories
+from src.repositories.repository import PostRepository
+
+
+class TestViewCounter(unittest.IsolatedAsyncioTestCase):
+    """Test cases for ViewCounter."""
+
+    def test_flush_writes_aggregated_deltas(self):
+        """Test views are summed per post and handed over in one batch."""
+        counter = ViewCounter()
+        batches = []
+        for post_id in (1, 2, 1, 1):
+            counter.increment(post_id)
+
+        self.assertEqual(counter.flush(batches.append), 4)
+        self.assertEqual(batches, [{1: 3, 2: 1}])
+        self.assertEqual(counter.flush(batches.append), 0)
+        self.assertEqual(len(batches), 1)
+
+    def test_failed_flush_keeps_views(self):
+        """Test deltas from a failed flush are retried by the next one."""
+        counter = ViewCounter()
+        counter.increment(1)
+
+        def broken(batch):
+            raise RuntimeError("database is locked")
+
+        with self.assertRaises(RuntimeError):
+            counter.flush(broken)
+        counter.increment(1)
+
+        batches = []
+        counter.flush(batches.append)
+        self.assertEqual(batches, [{1: 2}])
+        self.assertEqual(counter.stats()["failures"], 1)
+
+    async def test_stop_flushes_pending_views(self):
+        """Test shutting down writes views counted since the last interval."""
+        counter = ViewCounter(interval=3600)
+        batches = []
+        counter.start(batches.append)
+        counter.increment(5)
+
+        await counter.stop(batches.append)
+
+        self.assertEqual(batches, [{5: 1}])
+
+
+class TestAddPostViews(unittest.TestCase):
+    """Test cases for applying view deltas in the storage backends."""
+
+    def test_sql_batch_update_keeps_updated_at(self):
+        """Test the batched UPDATE adds views without marking posts edited."""
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(engine)
+        with patch('src.repositories.repository.SessionLocal', sessionmaker(bind=engine)):
+            repository = PostRepository()
+            first, second = (repository.create_post(PostCreate(title=t, content="C", author="A")) for t in "12")
+
+            repository.add_post_views({first.id: 3, second.id: 1, 999: 4})
+            repository.add_post_views({first.id: 2})
+
+            posts = {row.id: row for row in repository.get_post_list()}
+        self.assertEqual(posts[first.id].view_count, 5)
+        self.assertEqual(posts[second.id].view_count, 1)
+        self.assertIsNone(posts[first.id].updated_at)
+
+    def test_memory_backend(self):
+        """Test the in-memory backend applies deltas to its records."""
+        posts, _, _ = create_repositories("memory")
+        post = posts.create_post(PostCreate(title="T", content="C", author="A"))
+
+        posts.add_post_views({post.id: 2, 999: 1})
+
+        self.assertEqual(posts.get_post(post.id).view_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()